@@ -88,47 +88,7 @@ TERMS
 
 # Observation log (NDJSON with snippets)
 export BASE="$BASE"
-python3 - <<'PY'
-import glob, json, os, re, datetime
-
-base = os.environ["BASE"]
-terms_path = f"{base}/meta/terms.txt"
-out_path   = f"{base}/logs/observation_log.ndjson"
-
-terms = [t.strip() for t in open(terms_path, "r", encoding="utf-8") if t.strip()]
-files = sorted(glob.glob(f"{base}/tmp/*.txt"))
-
-def snippets(text, term, limit=3, ctx=70):
-    hits=[]
-    for m in re.finditer(re.escape(term), text, flags=re.IGNORECASE):
-        a=max(0, m.start()-ctx); b=min(len(text), m.end()+ctx)
-        hits.append(text[a:b].replace("\n"," "))
-        if len(hits)>=limit: break
-    return hits
-
-now = datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00","Z")
-os.makedirs(os.path.dirname(out_path), exist_ok=True)
-
-with open(out_path, "w", encoding="utf-8") as out:
-    for fp in files:
-        text = open(fp, "r", encoding="utf-8", errors="replace").read()
-        rec = {
-            "schema": "crovia.observation_log.v1",
-            "observed_at": now,
-            "source_file": os.path.basename(fp),
-            "terms": []
-        }
-        lower = text.lower()
-        for term in terms:
-            rec["terms"].append({
-                "term": term,
-                "found": term.lower() in lower,
-                "snippets": snippets(text, term)
-            })
-        out.write(json.dumps(rec, ensure_ascii=False) + "\n")
-
-print("[OK] files scanned:", len(files))
-PY
+python3 "$HERE/tools/cept_scan.py" "$BASE"
 
 # Build derived records
 python3 - <<'PY'
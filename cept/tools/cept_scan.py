@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Multi-term scanner producing a CEPT run's logs/observation_log.ndjson.
+
+Output is line-for-line what reproduce.sh's inline scanner writes
+(crovia.observation_log.v1), for any number of terms and sources:
+- found: the lower-cased term occurs in the lower-cased text
+- snippets: the first LIMIT non-overlapping case-insensitive matches of the
+  term, each with CTX characters of context on either side, newlines as spaces
+
+All terms are compiled once: a trie of the lower-cased terms, plus the same
+trie as a single zero-width regex that finds, at C speed, every offset
+where some term starts. Only those offsets are walked in Python, and each
+walk reports every term starting there (overlapping terms such as LAION and
+LAION-5B included). Sources are read in CHUNK-character pieces with a tail
+of (longest term - 1) so boundary-crossing matches are seen exactly once;
+only CTX characters of text, plus those of snippets still waiting for their
+right context, are retained. Reading stops early once every term has LIMIT
+snippets. Sources are scanned on a process pool.
+
+Case folding is str.lower() per character, which is what re.IGNORECASE
+does for everything but a handful of special folds (e.g. long s, Kelvin
+sign); reproduce.sh's found flag and snippets can disagree on those too.
+
+Usage:
+  python cept/tools/cept_scan.py cept/runs/2026-01-07                   # tmp/*.txt x meta/terms.txt -> logs/
+  python cept/tools/cept_scan.py RUN --terms big_terms.txt --workers 8 --out -
+"""
+import argparse, glob, json, os, re, sys
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+SCHEMA = "crovia.observation_log.v1"
+LIMIT = 3
+CTX = 70
+CHUNK = 1 << 20
+END = ""  # trie key holding the indices of terms ending at a node
+
+
+# -------------------------
+# Term matcher
+# -------------------------
+def fold(text: str) -> str:
+    """Lower-case without changing length, so offsets stay aligned with the text."""
+    low = text.lower()
+    if len(low) == len(text):
+        return low
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def _trie_regex(node) -> str:
+    alts = [re.escape(ch) + _trie_regex(sub) for ch, sub in sorted(node.items()) if ch != END]
+    if not alts:
+        return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    return "(?:" + body + ")?" if END in node else body
+
+
+class Matcher:
+    def __init__(self, terms):
+        self.terms = list(terms)
+        self.trie = {}
+        for i, t in enumerate(self.terms):
+            node = self.trie
+            for ch in fold(t):
+                node = node.setdefault(ch, {})
+            node.setdefault(END, []).append(i)
+        self.longest = max((len(t) for t in self.terms), default=1)
+        self.starts = re.compile("(?=" + _trie_regex(self.trie) + ")") if self.terms else None
+
+    def hits(self, low: str, pos: int, stop: int):
+        """(offset, term index) for every term occurrence in low starting in [pos, stop)."""
+        if self.starts is None:
+            return
+        for m in self.starts.finditer(low, pos):
+            p = m.start()
+            if p >= stop:
+                return
+            node = self.trie
+            for k in range(p, min(len(low), p + self.longest)):
+                node = node.get(low[k])
+                if node is None:
+                    break
+                for i in node.get(END, ()):
+                    yield p, i
+
+
+# -------------------------
+# Scanning
+# -------------------------
+def scan_text(chunks, matcher: Matcher, limit: int = LIMIT, ctx: int = CTX):
+    """Stream text pieces through the matcher; one {term, found, snippets} per term."""
+    n = len(matcher.terms)
+    found = [False] * n
+    taken = [0] * n
+    free = [0] * n      # a term's next match may not start before its previous one ended
+    snippets = [[] for _ in range(n)]
+    pending = []        # (term, a, b): snippet text[a:b], waiting until b has been read
+    done = 0            # terms holding `limit` snippets
+    tail = matcher.longest - 1
+    buf, low, base, scanned = "", "", 0, 0
+
+    for piece in _with_eof(chunks):
+        eof = piece is None
+        if piece:
+            buf += piece
+            low += fold(piece)
+        end = base + len(buf)
+        stop = end if eof else end - tail
+        for p, i in matcher.hits(low, scanned - base, stop - base):
+            found[i] = True
+            s = base + p
+            if taken[i] >= limit or s < free[i]:
+                continue
+            e = s + len(matcher.terms[i])
+            free[i] = e
+            taken[i] += 1
+            done += taken[i] == limit
+            pending.append((i, max(0, s - ctx), e + ctx))
+        scanned = max(scanned, stop)
+
+        keep = []
+        for i, a, b in pending:
+            if b <= end or eof:
+                snippets[i].append(buf[a - base:b - base].replace("\n", " "))
+            else:
+                keep.append((i, a, b))
+        pending = keep
+        if eof or (done == n and not pending):
+            break
+        cut = min([a for _, a, _ in pending] + [scanned - ctx])
+        if cut > base:
+            buf, low, base = buf[cut - base:], low[cut - base:], cut
+    return [{"term": t, "found": found[i], "snippets": snippets[i]} for i, t in enumerate(matcher.terms)]
+
+
+def _with_eof(chunks):
+    """The pieces, then None for end of text."""
+    yield from chunks
+    yield None
+
+
+def read_chunks(path: str, size: int = CHUNK):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        while True:
+            piece = f.read(size)
+            if not piece:
+                return
+            yield piece
+
+
+@lru_cache(maxsize=8)
+def _matcher(terms) -> Matcher:
+    return Matcher(terms)
+
+
+def scan_source(path: str, terms, observed_at: str, limit: int = LIMIT, ctx: int = CTX, chunk: int = CHUNK):
+    return {
+        "schema": SCHEMA,
+        "observed_at": observed_at,
+        "source_file": os.path.basename(path),
+        "terms": scan_text(read_chunks(path, chunk), _matcher(tuple(terms)), limit, ctx),
+    }
+
+
+def _scan_source_args(args):
+    return scan_source(*args)
+
+
+def load_terms(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return [t.strip() for t in f if t.strip()]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Scan a CEPT run's extracted texts for all terms at once")
+    ap.add_argument("run", help="Run directory (reads tmp/*.txt and meta/terms.txt)")
+    ap.add_argument("--terms", default=None, help="Terms file (default: <run>/meta/terms.txt)")
+    ap.add_argument("--sources", nargs="*", default=None, help="Text files (default: <run>/tmp/*.txt)")
+    ap.add_argument("--out", default=None, help="Output NDJSON, '-' for stdout (default: <run>/logs/observation_log.ndjson)")
+    ap.add_argument("--observed-at", default=None, help="Timestamp stamped on every record (default: now)")
+    ap.add_argument("--limit", type=int, default=LIMIT, help="Snippets per term and source")
+    ap.add_argument("--ctx", type=int, default=CTX, help="Context characters around each snippet")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Sources scanned in parallel")
+    args = ap.parse_args()
+
+    terms = load_terms(args.terms or os.path.join(args.run, "meta", "terms.txt"))
+    files = args.sources if args.sources is not None else sorted(glob.glob(os.path.join(args.run, "tmp", "*.txt")))
+    now = args.observed_at or datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+    jobs = [(fp, terms, now, args.limit, args.ctx) for fp in files]
+    if args.workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(jobs))) as ex:
+            records = ex.map(_scan_source_args, jobs, chunksize=max(1, len(jobs) // (args.workers * 4)))
+            lines = [json.dumps(r, ensure_ascii=False) + "\n" for r in records]
+    else:
+        lines = [json.dumps(_scan_source_args(j), ensure_ascii=False) + "\n" for j in jobs]
+
+    if args.out == "-":
+        sys.stdout.writelines(lines)
+    else:
+        out_path = args.out or os.path.join(args.run, "logs", "observation_log.ndjson")
+        os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+    print(f"[OK] files scanned: {len(files)} ({len(terms)} terms)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""Offline verifier for sealed CEPT runs and CRC-1 capsules.
+
+Per run directory:
+- manifest: every `<sha256>  <path>` line of proofs/MANIFEST.sha256 is re-hashed
+  (paths relative to the run dir), files in parallel threads, large files via
+  mmap. CRC-1's MANIFEST.json lists artefacts without digests: presence only.
+- hashchains: each `chunk_idx<TAB>n_lines<TAB>sha256` file is replayed over its
+  source NDJSON in one streaming pass; the first divergent chunk is reported
+  with its line range and byte offset.
+Several runs are verified on a process pool; one JSON result per run.
+
+Chain pairs come from meta/run_index.json (CEPT) or MANIFEST.json (CRC-1):
+  hashchain_log     <- observation_log
+  hashchain_records <- records_canon
+  hashchain         <- receipts
+
+Chain scheme: the writer (cept/vendor/hashchain_writer.py) is not part of this
+tree and its digest rule is not known: none of the obvious sha256 chainings
+reproduces the shipped chains. SCHEMES is therefore empty and every chain is
+reported as "unverified": "unknown scheme" (with its chunk count) without
+failing the run; manifest mismatches and missing sources still do. Once the
+writer's rule is known, register it in SCHEMES as
+  step(prev_hex, chunk_lines) -> hex digest   (prev_hex of chunk 0 = GENESIS)
+and pass its name to verify_run(); replay then reports the first divergent
+chunk with its line range and byte offset.
+
+Usage:
+  python cept/tools/cept_verify.py cept/runs/2026-01-07 CRC-1/demo-2025-11
+  python cept/tools/cept_verify.py --all --out verify_results.ndjson
+"""
+import argparse, hashlib, json, mmap, os, sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MMAP_MIN = 1 << 20
+READ_BUF = 1 << 20
+GENESIS = "0" * 64
+
+CEPT_CHAINS = {"hashchain_log": "observation_log", "hashchain_records": "records_canon"}
+CEPT_DEFAULT_ARTIFACTS = {
+    "observation_log": "logs/observation_log.ndjson",
+    "records_canon": "records/evidence_records.ndjson",
+    "hashchain_log": "proofs/hashchain_observation_log.txt",
+    "hashchain_records": "proofs/hashchain_evidence_records.txt",
+}
+
+
+# -------------------------
+# Chain schemes
+# -------------------------
+# name -> step(prev_hex, lines) -> hex digest. Empty until the writer's rule is
+# known; a guessed rule would reject every valid chain.
+SCHEMES = {}
+
+
+# -------------------------
+# Manifest
+# -------------------------
+def sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_MIN:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        else:
+            for chunk in iter(lambda: f.read(READ_BUF), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def parse_sha256sum(path: str):
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip():
+                continue
+            digest, _, name = line.partition("  ")
+            if not name:  # binary-mode marker: "<hex> *<path>"
+                digest, _, name = line.partition(" *")
+            entries.append((digest.strip().lower(), name))
+    return entries
+
+
+def verify_manifest(run_dir: str, manifest: str, threads: int):
+    entries = parse_sha256sum(manifest)
+
+    def check(entry):
+        digest, name = entry
+        path = name if os.path.isabs(name) else os.path.join(run_dir, name)
+        if not os.path.isfile(path):
+            return name, digest, None
+        return name, digest, sha256_file(path)
+
+    res = {"file": os.path.relpath(manifest, run_dir), "entries": len(entries), "verified": 0,
+           "mismatch": [], "missing": []}
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as ex:
+        for name, expected, actual in ex.map(check, entries):
+            if actual is None:
+                res["missing"].append(name)
+            elif actual != expected:
+                res["mismatch"].append({"path": name, "expected": expected, "actual": actual})
+            else:
+                res["verified"] += 1
+    res["ok"] = not res["mismatch"] and not res["missing"]
+    return res
+
+
+def verify_presence(run_dir: str, manifest: str):
+    with open(manifest, "r", encoding="utf-8") as f:
+        artifacts = json.load(f).get("artifacts", {})
+    missing = [p for p in artifacts.values() if not os.path.isfile(os.path.join(run_dir, p))]
+    return {"file": os.path.relpath(manifest, run_dir), "entries": len(artifacts),
+            "verified": len(artifacts) - len(missing), "mismatch": [], "missing": missing,
+            "ok": not missing, "digests": False}
+
+
+# -------------------------
+# Hashchain replay
+# -------------------------
+def read_chain(path: str):
+    rows = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            idx, n, digest = line.rstrip("\n").split("\t")
+            rows.append((int(idx), int(n), digest.strip().lower()))
+    return rows
+
+
+def replay_chain(chain_path: str, source_path: str, scheme: str):
+    """Stream source once; stop at the first chunk whose digest differs."""
+    step = SCHEMES[scheme]
+    rows = read_chain(chain_path)
+    res = {"chain": chain_path, "source": source_path, "scheme": scheme, "chunks": len(rows),
+           "verified": 0, "first_divergence": None}
+
+    prev, line_no, offset = GENESIS, 0, 0
+    with open(source_path, "rb", buffering=READ_BUF) as src:
+        for pos, (idx, n, expected) in enumerate(rows):
+            start_line, start_offset = line_no + 1, offset
+            lines = []
+            for _ in range(n):
+                line = src.readline()
+                if not line:
+                    break
+                lines.append(line)
+                offset += len(line)
+            line_no += len(lines)
+            actual = step(prev, lines)
+            reason = None
+            if idx != pos:
+                reason = f"chunk index {idx} out of sequence (expected {pos})"
+            elif len(lines) < n:
+                reason = f"source ended after {len(lines)} of {n} lines"
+            elif actual != expected:
+                reason = "digest mismatch"
+            if reason:
+                res["first_divergence"] = {
+                    "chunk": idx, "reason": reason, "line_start": start_line, "line_end": line_no,
+                    "byte_offset": start_offset, "expected": expected, "actual": actual,
+                }
+                break
+            res["verified"] += 1
+            prev = expected
+        else:
+            trailing = src.read(1)
+            if trailing:
+                res["first_divergence"] = {
+                    "chunk": len(rows), "reason": "source has lines not covered by the chain",
+                    "line_start": line_no + 1, "line_end": None, "byte_offset": offset,
+                    "expected": None, "actual": None,
+                }
+    res["ok"] = res["first_divergence"] is None
+    return res
+
+
+# -------------------------
+# Runs
+# -------------------------
+def chain_pairs(run_dir: str):
+    """(chain, source) paths, relative to run_dir, plus the manifest kind/path."""
+    crc_manifest = os.path.join(run_dir, "MANIFEST.json")
+    if os.path.isfile(crc_manifest):
+        with open(crc_manifest, "r", encoding="utf-8") as f:
+            artifacts = json.load(f).get("artifacts", {})
+        pairs = [(artifacts["hashchain"], artifacts["receipts"])] if "hashchain" in artifacts and "receipts" in artifacts else []
+        return pairs, ("presence", crc_manifest)
+
+    artifacts = dict(CEPT_DEFAULT_ARTIFACTS)
+    run_index = os.path.join(run_dir, "meta", "run_index.json")
+    if os.path.isfile(run_index):
+        with open(run_index, "r", encoding="utf-8") as f:
+            artifacts.update(json.load(f).get("artifacts", {}))
+    pairs = [(artifacts[c], artifacts[s]) for c, s in CEPT_CHAINS.items()
+             if os.path.isfile(os.path.join(run_dir, artifacts[c]))]
+    manifest = os.path.join(run_dir, artifacts.get("manifest_sha256", "proofs/MANIFEST.sha256"))
+    return pairs, ("sha256", manifest)
+
+
+def verify_run(run_dir: str, scheme=None, threads: int = 8):
+    pairs, (kind, manifest) = chain_pairs(run_dir)
+    result = {
+        "schema": "crovia.cept_verify_result.v1",
+        "run": run_dir,
+        "verified_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+    }
+    if not os.path.isfile(manifest):
+        result["manifest"] = {"file": os.path.relpath(manifest, run_dir), "ok": False, "error": "manifest not found"}
+    elif kind == "sha256":
+        result["manifest"] = verify_manifest(run_dir, manifest, threads)
+    else:
+        result["manifest"] = verify_presence(run_dir, manifest)
+
+    result["hashchains"] = []
+    for chain, source in pairs:
+        c, s = os.path.join(run_dir, chain), os.path.join(run_dir, source)
+        if not os.path.isfile(s):
+            result["hashchains"].append({"chain": chain, "source": source, "ok": False, "error": "source not found"})
+            continue
+        if scheme is None:
+            result["hashchains"].append({"chain": chain, "source": source, "chunks": len(read_chain(c)),
+                                         "ok": None, "unverified": "unknown scheme"})
+            continue
+        r = replay_chain(c, s, scheme)
+        r["chain"], r["source"] = chain, source
+        result["hashchains"].append(r)
+
+    # unverified chains (ok None) neither pass nor fail the run
+    result["ok"] = result["manifest"]["ok"] and all(r["ok"] is not False for r in result["hashchains"])
+    return result
+
+
+def discover_runs(root: str):
+    runs = []
+    cept_runs = os.path.join(root, "cept", "runs")
+    if os.path.isdir(cept_runs):
+        runs += [os.path.join(cept_runs, d) for d in sorted(os.listdir(cept_runs))]
+    crc = os.path.join(root, "CRC-1")
+    if os.path.isdir(crc):
+        runs += [os.path.join(crc, d) for d in sorted(os.listdir(crc))
+                 if os.path.isfile(os.path.join(crc, d, "MANIFEST.json"))]
+    return [r for r in runs if os.path.isdir(r)]
+
+
+def _verify_run_args(args):
+    return verify_run(*args)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Verify CEPT run / CRC-1 manifests and hashchains offline")
+    ap.add_argument("runs", nargs="*", help="Run directories")
+    ap.add_argument("--all", action="store_true", help="Every run under cept/runs/ and CRC-1/")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Runs verified in parallel")
+    ap.add_argument("--threads", type=int, default=8, help="Files hashed in parallel per run")
+    ap.add_argument("--out", default=None, help="Write results as NDJSON here (default: stdout)")
+    args = ap.parse_args()
+
+    runs = list(args.runs) + (discover_runs(REPO_ROOT) if args.all else [])
+    if not runs:
+        ap.error("no runs given (pass directories or --all)")
+
+    jobs = [(r, None, args.threads) for r in runs]
+    if args.workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(jobs))) as ex:
+            results = list(ex.map(_verify_run_args, jobs))
+    else:
+        results = [_verify_run_args(j) for j in jobs]
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for r in results:
+            out.write(json.dumps(r, ensure_ascii=False) + "\n")
+    finally:
+        if args.out:
+            out.close()
+
+    for r in results:
+        m = r["manifest"]
+        chains = ", ".join(
+            f"{os.path.basename(c['chain'])}: " + ("OK" if c["ok"] else f"unverified ({c['unverified']})" if c["ok"] is None else
+                (c.get("error") or "chunk {chunk} lines {line_start}-{line_end} @byte {byte_offset}: {reason}".format(**c["first_divergence"])))
+            for c in r["hashchains"]
+        ) or "no hashchains"
+        print(f"[{'OK' if r['ok'] else 'FAIL'}] {r['run']}: manifest {m.get('verified', 0)}/{m.get('entries', 0)}; {chains}",
+              file=sys.stderr)
+    sys.exit(0 if all(r["ok"] for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
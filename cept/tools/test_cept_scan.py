@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Minimal test for the CEPT multi-term scanner."""
+import glob, json, os, random, re, sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cept_scan import Matcher, load_terms, scan_source, scan_text
+
+RUN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "runs", "2026-01-07")
+
+
+def reference(text, terms, limit=3, ctx=70):
+    """reproduce.sh's original per-term scanner."""
+    lower, out = text.lower(), []
+    for term in terms:
+        hits = []
+        for m in re.finditer(re.escape(term), text, flags=re.IGNORECASE):
+            a = max(0, m.start() - ctx); b = min(len(text), m.end() + ctx)
+            hits.append(text[a:b].replace("\n", " "))
+            if len(hits) >= limit:
+                break
+        out.append({"term": term, "found": term.lower() in lower, "snippets": hits})
+    return out
+
+
+def test_shipped_run_reproduces():
+    with open(os.path.join(RUN, "logs", "observation_log.ndjson"), encoding="utf-8") as f:
+        published = [json.loads(l) for l in f if l.strip()]
+    terms = load_terms(os.path.join(RUN, "meta", "terms.txt"))
+    files = sorted(glob.glob(os.path.join(RUN, "tmp", "*.txt")))
+    got = [scan_source(fp, terms, published[0]["observed_at"], chunk=64) for fp in files]
+    assert got == published
+    print("[OK] shipped run")
+
+
+def test_chunk_boundaries_match_reference():
+    rng = random.Random(7)
+    terms = ["aa", "aab", "Ab", "b a", "aaaa", "a\nb", "ba", "LAION", "LAION-5B"]
+    matcher = Matcher(terms)
+    for _ in range(500):
+        text = "".join(rng.choice("aAbB \nxL") for _ in range(rng.randint(0, 300)))
+        limit, ctx, size = rng.randint(1, 4), rng.randint(0, 20), rng.randint(1, 40)
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert scan_text(chunks, matcher, limit, ctx) == reference(text, terms, limit, ctx), text
+    print("[OK] chunk boundaries")
+
+
+if __name__ == "__main__":
+    test_shipped_run_reproduces()
+    test_chunk_boundaries_match_reference()
+    print("\n[OK] All tests passed")
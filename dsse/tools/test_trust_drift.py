@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Minimal test for trust_drift bulk sign / verify."""
+import json, os, subprocess, sys, tempfile
+from pathlib import Path
+
+SCRIPT = Path(__file__).parent / "trust_drift.py"
+LEDGER = Path(__file__).parents[2] / "proofs" / "drift" / "dsse_snapshot_drift.ndjson"
+ENV = {**os.environ, "CROVIA_HMAC_KEY": "demo-key-do-not-use-in-prod"}
+
+def run(*args):
+    return subprocess.run([sys.executable, str(SCRIPT), *args], env=ENV, capture_output=True, text=True)
+
+def test_verify_published_ledger():
+    r = run("verify", str(LEDGER), "--workers", "2", "--batch", "1")
+    assert r.returncode == 0, r.stdout + r.stderr
+    print("[OK] verify published ledger")
+
+def test_sign_then_verify_reports_tampered_line():
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "drift.ndjson"
+        with open(path, "w") as f:
+            for i in range(5):
+                f.write(json.dumps({"schema": "trust_drift.v1", "delta": i / 10}) + "\n")
+
+        assert run("sign", str(path), "--workers", "2", "--batch", "2").returncode == 0
+        assert run("verify", str(path)).returncode == 0
+
+        lines = path.read_text().splitlines()
+        rec = json.loads(lines[3])
+        rec["delta"] = 9.9
+        lines[3] = json.dumps(rec)
+        path.write_text("\n".join(lines) + "\n")
+
+        r = run("verify", str(path), "--workers", "2", "--batch", "2")
+        assert r.returncode == 1
+        assert "line 4: signature mismatch" in r.stdout, r.stdout
+    print("[OK] tampered line reported")
+
+def test_sign_rejects_invalid_line_cleanly():
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "drift.ndjson"
+        original = json.dumps({"schema": "trust_drift.v1", "delta": 0.1}) + "\n{not json\n"
+        path.write_text(original)
+
+        r = run("sign", str(path), "--workers", "2", "--batch", "1")
+        assert r.returncode == 1 and "line 2: invalid JSON" in r.stdout, r.stdout + r.stderr
+        assert path.read_text() == original and os.listdir(d) == ["drift.ndjson"]
+    print("[OK] invalid line rejected")
+
+if __name__ == "__main__":
+    test_verify_published_ledger()
+    test_sign_then_verify_reports_tampered_line()
+    test_sign_rejects_invalid_line_cleanly()
+    print("\n[OK] All tests passed")
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
-import argparse, json, os, hashlib
+import argparse, json, os, sys, hashlib, hmac
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 
 # -------------------------
@@ -59,11 +61,172 @@ def extract_ids(bundle: dict):
     model_id = meta.get("model_id") or meta.get("model")
     return str(dataset_id), (str(model_id) if model_id else None)
 
+# -------------------------
+# Signing (HMAC-SHA256)
+# -------------------------
+def canonical_payload(rec: dict) -> bytes:
+    """Canonical bytes that are signed: every field except `signature`."""
+    body = {k: v for k, v in rec.items() if k != "signature"}
+    return json.dumps(body, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+def sign_record(rec: dict, key: bytes) -> str:
+    return hmac.new(key, canonical_payload(rec), hashlib.sha256).hexdigest()
+
+def load_key(env_name: str) -> bytes:
+    key = os.environ.get(env_name)
+    if not key:
+        raise SystemExit(f"ERROR: set {env_name}")
+    return key.encode()
+
+# -------------------------
+# Bulk ledger ops (worker pool)
+# -------------------------
+# Lines are streamed in batches of (lineno, text); each batch is handled by a
+# worker process that holds the key from its initializer. Results come back in
+# file order, with at most 2 * workers batches in flight.
+_WORKER_KEY = b""
+
+def _init_worker(key: bytes):
+    global _WORKER_KEY
+    _WORKER_KEY = key
+
+def _verify_batch(batch):
+    """Return (checked, problems) where problems = [(lineno, reason)]."""
+    problems = []
+    for lineno, line in batch:
+        try:
+            rec = json.loads(line)
+        except ValueError as e:
+            problems.append((lineno, f"invalid JSON: {e}"))
+            continue
+        sig = rec.get("signature") if isinstance(rec, dict) else None
+        if not sig:
+            problems.append((lineno, "missing signature"))
+        elif not hmac.compare_digest(str(sig), sign_record(rec, _WORKER_KEY)):
+            problems.append((lineno, "signature mismatch"))
+    return len(batch), problems
+
+def _sign_batch(batch, force=False):
+    """Return (signed_count, output_lines, problems) where problems = [(lineno, reason)]."""
+    signed, out, problems = 0, [], []
+    for lineno, line in batch:
+        try:
+            rec = json.loads(line)
+        except json.JSONDecodeError as e:
+            problems.append((lineno, f"invalid JSON: {e}"))
+            continue
+        if not isinstance(rec, dict):
+            problems.append((lineno, "not a JSON object"))
+            continue
+        if force or not rec.get("signature"):
+            rec["signature"] = sign_record(rec, _WORKER_KEY)
+            signed += 1
+            line = json.dumps(rec, ensure_ascii=False)
+        out.append(line)
+    return signed, out, problems
+
+def _sign_batch_force(batch):
+    return _sign_batch(batch, force=True)
+
+def iter_batches(path: str, size: int):
+    batch = []
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            batch.append((lineno, line))
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+def run_batches(path: str, fn, key: bytes, workers: int, batch_size: int):
+    """Apply fn to every batch of path, yielding results in file order."""
+    if workers <= 1:
+        _init_worker(key)
+        for batch in iter_batches(path, batch_size):
+            yield fn(batch)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(key,)) as ex:
+        pending = deque()
+        for batch in iter_batches(path, batch_size):
+            pending.append(ex.submit(fn, batch))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def cmd_verify(argv):
+    ap = argparse.ArgumentParser(prog="trust_drift.py verify", description="Verify trust_drift.v1 NDJSON signatures")
+    ap.add_argument("path", help="Signed drift NDJSON")
+    ap.add_argument("--env", default="CROVIA_HMAC_KEY", help="Env var holding the HMAC key")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--batch", type=int, default=2048, help="Lines per worker batch")
+    args = ap.parse_args(argv)
+
+    key = load_key(args.env)
+    checked = bad = 0
+    for n, problems in run_batches(args.path, _verify_batch, key, args.workers, args.batch):
+        checked += n
+        for lineno, reason in problems:
+            bad += 1
+            print(f"[VERIFY] line {lineno}: {reason}")
+
+    print(f"[VERIFY] {args.path}: {checked} records, {checked - bad} OK, {bad} FAIL")
+    return 1 if bad else 0
+
+def cmd_sign(argv):
+    ap = argparse.ArgumentParser(prog="trust_drift.py sign", description="Sign unsigned trust_drift.v1 NDJSON records")
+    ap.add_argument("path", help="Drift NDJSON")
+    ap.add_argument("--out", default=None, help="Output NDJSON (default: rewrite in place)")
+    ap.add_argument("--force", action="store_true", help="Re-sign records that already carry a signature")
+    ap.add_argument("--env", default="CROVIA_HMAC_KEY", help="Env var holding the HMAC key")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--batch", type=int, default=2048, help="Lines per worker batch")
+    args = ap.parse_args(argv)
+
+    key = load_key(args.env)
+    out_path = args.out or args.path
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = out_path + ".tmp"
+
+    fn = _sign_batch_force if args.force else _sign_batch
+    total = signed = bad = 0
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for n, lines, problems in run_batches(args.path, fn, key, args.workers, args.batch):
+                signed += n
+                total += len(lines)
+                if lines:
+                    f.write("\n".join(lines) + "\n")
+                for lineno, reason in problems:
+                    bad += 1
+                    print(f"[SIGN] line {lineno}: {reason}")
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    if bad:
+        os.unlink(tmp_path)
+        print(f"[SIGN] {args.path}: {bad} unreadable records, nothing written")
+        return 1
+    os.replace(tmp_path, out_path)
+
+    print(f"[SIGN] {out_path}: {total} records, {signed} signed")
+    return 0
+
 # -------------------------
 # Main
 # -------------------------
 def main():
-    ap = argparse.ArgumentParser(description="CROVIA trust_drift.v1 generator")
+    if len(sys.argv) > 1 and sys.argv[1] in ("sign", "verify"):
+        cmd = cmd_sign if sys.argv[1] == "sign" else cmd_verify
+        raise SystemExit(cmd(sys.argv[2:]))
+
+    ap = argparse.ArgumentParser(
+        description="CROVIA trust_drift.v1 generator (bulk ops: `sign` / `verify` subcommands)"
+    )
     ap.add_argument("--a", required=True, help="Trust bundle A (JSON)")
     ap.add_argument("--b", required=True, help="Trust bundle B (JSON)")
     ap.add_argument("--from-period", required=True, help="YYYY-MM")
@@ -117,12 +280,7 @@ def main():
     }
 
     if args.sign:
-        key = os.environ.get("CROVIA_HMAC_KEY")
-        if not key:
-            raise SystemExit("ERROR: set CROVIA_HMAC_KEY")
-        payload = json.dumps(rec, separators=(",", ":"), sort_keys=True).encode("utf-8")
-        import hmac
-        rec["signature"] = hmac.new(key.encode(), payload, hashlib.sha256).hexdigest()
+        rec["signature"] = sign_record(rec, load_key("CROVIA_HMAC_KEY"))
 
     os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
     with open(args.out, "a", encoding="utf-8") as f:
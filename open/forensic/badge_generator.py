@@ -7,8 +7,21 @@ Generates dynamic SVG badges for AI model trust scores.
 Embeddable anywhere - the "shields.io" for AI Trust.
 
 Usage:
+    python badge_generator.py        # Built-in example models only
     python badge_generator.py --model "meta-llama/Llama-3-8B"
-    python badge_generator.py --all  # Generate for all analyzed models
+    python badge_generator.py --all  # Generate for all ranked models
+    python badge_generator.py --all --workers 16
+    python badge_generator.py --all --force
+
+--all renders every model in snapshots/global_ranking.json (falls back to the
+built-in examples when the ranking is missing). Templates are compiled once,
+batches are rendered and written on a thread pool, each file is written via
+rename, and badges/index.json is streamed out in ranking order.
+
+Unchanged models are skipped: each model gets a content key over
+(model_id, score, violations, TEMPLATE_VERSION), and badges/manifest.json keeps
+the keys of the previous run. Only models whose key changed (or whose files
+are missing) get their SVGs and card rewritten; --force rewrites everything.
 
 Output:
     badges/meta-llama__Llama-3-8B.svg
@@ -19,18 +32,25 @@ License: Apache-2.0
 
 import json
 import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List
+from string import Formatter
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Tuple
 
 # Paths
 ROOT = Path(__file__).parent.parent.parent
 EVIDENCE = ROOT / "EVIDENCE.json"
 RANKING = ROOT / "v0.1" / "global_ranking.jsonl"
+RANKING_JSON = ROOT / "snapshots" / "global_ranking.json"
 CARDS_DIR = ROOT / "cards"
 BADGES_DIR = ROOT / "badges"
 CANON = ROOT / "canon" / "necessities.v1.yaml"
 
+BATCH_SIZE = 128
+ORACLE_VERSION = "2.0.0"
+
 # Badge colors
 COLORS = {
     "GOLD": "#F59E0B",
@@ -79,6 +99,28 @@ SVG_COMPACT = '''<svg xmlns="http://www.w3.org/2000/svg" width="120" height="20"
 </svg>'''
 
 
+def compile_template(template: str):
+    """Split a str.format template once; the returned renderer only joins."""
+    parts = [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+
+    def render(**values) -> str:
+        return "".join(
+            literal + (str(values[field]) if field is not None else "")
+            for literal, field in parts
+        )
+    return render
+
+
+_RENDER_FULL = compile_template(SVG_TEMPLATE)
+_RENDER_COMPACT = compile_template(SVG_COMPACT)
+
+# Changes whenever a template or the card format changes, so every output is
+# regenerated once after an edit.
+TEMPLATE_VERSION = hashlib.sha256(
+    (SVG_TEMPLATE + SVG_COMPACT + ORACLE_VERSION).encode()
+).hexdigest()[:16]
+
+
 def load_evidence() -> Dict[str, Any]:
     """Load main evidence file."""
     if EVIDENCE.exists():
@@ -133,7 +175,7 @@ def generate_badge_svg(
     badge_name, badge_color = get_badge(score)
     
     if compact:
-        return SVG_COMPACT.format(
+        return _RENDER_COMPACT(
             score=score,
             badge_color=badge_color
         )
@@ -146,7 +188,7 @@ def generate_badge_svg(
     extra = len(viol_str) * 5
     width = base_width + extra
     
-    return SVG_TEMPLATE.format(
+    return _RENDER_FULL(
         width=width,
         width_inner=width - 2,
         score=score,
@@ -158,9 +200,10 @@ def generate_badge_svg(
     )
 
 
-def generate_oracle_card(model_id: str, violations: List[str]) -> Dict[str, Any]:
-    """Generate Oracle Card JSON for a model."""
-    score = compute_shadow_score(violations)
+def generate_oracle_card(model_id: str, violations: List[str], score: Optional[int] = None) -> Dict[str, Any]:
+    """Generate Oracle Card JSON for a model (score defaults to the shadow score)."""
+    if score is None:
+        score = compute_shadow_score(violations)
     badge_name, badge_color = get_badge(score)
     
     # Severity
@@ -186,32 +229,201 @@ def generate_oracle_card(model_id: str, violations: List[str]) -> Dict[str, Any]
         "violation_count": len(violations),
         "generated_at": datetime.now(timezone.utc).isoformat(),
         "evidence_hash": hashlib.sha256(f"{model_id}:{score}".encode()).hexdigest()[:16],
-        "oracle_version": "2.0.0"
+        "oracle_version": ORACLE_VERSION
     }
 
 
-def save_badge(model_id: str, svg: str, compact: bool = False):
+def atomic_write(filepath: Path, data: str):
+    """Write via a temp file + rename so readers never see a partial file."""
+    tmp = filepath.with_name(filepath.name + ".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(tmp, filepath)
+
+
+def file_stem(model_id: str) -> str:
+    return model_id.replace("/", "__")
+
+
+def badge_path(model_id: str, compact: bool = False, out_dir: Optional[Path] = None) -> Path:
+    filename = file_stem(model_id) + ("_compact" if compact else "")
+    return (out_dir or BADGES_DIR) / f"{filename}.svg"
+
+
+def card_path(model_id: str, out_dir: Optional[Path] = None) -> Path:
+    return (out_dir or CARDS_DIR) / (file_stem(model_id) + ".json")
+
+
+def save_badge(model_id: str, svg: str, compact: bool = False, out_dir: Optional[Path] = None):
     """Save badge SVG to file."""
-    BADGES_DIR.mkdir(exist_ok=True)
-    filename = model_id.replace("/", "__")
-    if compact:
-        filename += "_compact"
-    filepath = BADGES_DIR / f"{filename}.svg"
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(svg)
+    filepath = badge_path(model_id, compact, out_dir)
+    filepath.parent.mkdir(exist_ok=True)
+    atomic_write(filepath, svg)
     return filepath
 
 
-def save_oracle_card(model_id: str, card: Dict[str, Any]):
+def save_oracle_card(model_id: str, card: Dict[str, Any], out_dir: Optional[Path] = None):
     """Save Oracle Card JSON."""
-    CARDS_DIR.mkdir(exist_ok=True)
-    filename = model_id.replace("/", "__") + ".json"
-    filepath = CARDS_DIR / filename
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(card, f, indent=2, ensure_ascii=False)
+    filepath = card_path(model_id, out_dir)
+    filepath.parent.mkdir(exist_ok=True)
+    atomic_write(filepath, json.dumps(card, indent=2, ensure_ascii=False))
     return filepath
 
 
+def content_key(model_id: str, score: int, violations: List[str]) -> str:
+    """Key over everything that ends up in a model's badges and card."""
+    payload = json.dumps([model_id, score, violations, TEMPLATE_VERSION], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_manifest(path: Path) -> Dict[str, str]:
+    """model_id -> content key from the previous run (empty if none, or if it
+    was written under a different TEMPLATE_VERSION)."""
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("template_version") != TEMPLATE_VERSION:
+        return {}
+    return manifest.get("entries", {})
+
+
+def save_manifest(path: Path, entries: Dict[str, str]):
+    """Entries keep ranking order, so a reordered ranking still rewrites the index."""
+    atomic_write(path, json.dumps({
+        "schema": "crovia_badges_manifest.v1",
+        "template_version": TEMPLATE_VERSION,
+        "entries": entries,
+    }, indent=0))
+
+
+def render_model(
+    model_id: str,
+    violations: List[str],
+    score: Optional[int] = None,
+    badges_dir: Optional[Path] = None,
+    cards_dir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Card + full and compact badge for one model. Returns its index entry."""
+    card = generate_oracle_card(model_id, violations, score)
+    card_file = save_oracle_card(model_id, card, cards_dir)
+
+    svg_full = generate_badge_svg(model_id, card["shadow_score"], violations)
+    svg_compact = generate_badge_svg(model_id, card["shadow_score"], violations, compact=True)
+    badge_file = save_badge(model_id, svg_full, out_dir=badges_dir)
+    save_badge(model_id, svg_compact, compact=True, out_dir=badges_dir)
+
+    return {
+        "model_id": model_id,
+        "score": card["shadow_score"],
+        "badge": card["badge"],
+        "card_path": str(card_file),
+        "badge_path": str(badge_file)
+    }
+
+
+def load_ranking_models(path: Path = RANKING_JSON) -> List[Tuple[str, List[str], int]]:
+    """(model_id, violations, score) for every model in global_ranking.json."""
+    with open(path, 'r', encoding='utf-8') as f:
+        ranking = json.load(f)
+    return [
+        (m["model_id"], list(m.get("top_gaps") or []), int(round(m.get("score", 0))))
+        for m in ranking.get("model_ranking", [])
+        if m.get("model_id")
+    ]
+
+
+def write_index(entries: Iterable[Dict[str, Any]], path: Path, keep_old=None) -> int:
+    """Stream the badge index to disk (count goes last). Returns the count.
+
+    keep_old: optional callable checked after streaming; if it returns True
+    and an index exists, the old one is kept (no timestamp-only churn).
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    count = 0
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write('{\n  "schema": "crovia_badges_index.v1",\n')
+        f.write(f'  "generated_at": {json.dumps(datetime.now(timezone.utc).isoformat())},\n')
+        f.write('  "badges": [')
+        for entry in entries:
+            f.write((",\n    " if count else "\n    ") + json.dumps(entry, ensure_ascii=False))
+            count += 1
+        f.write(("\n  " if count else "") + f'],\n  "count": {count}\n}}\n')
+    if keep_old is not None and path.exists() and keep_old():
+        os.remove(tmp)
+    else:
+        os.replace(tmp, path)
+    return count
+
+
+def generate_all(
+    models: List[Tuple[str, List[str], Optional[int]]],
+    workers: int = 8,
+    badges_dir: Optional[Path] = None,
+    cards_dir: Optional[Path] = None,
+    force: bool = False,
+) -> Dict[str, int]:
+    """Render changed models on a thread pool; index entries keep input order.
+
+    Returns {"count": models indexed, "written": models re-rendered}.
+    """
+    badges_dir = badges_dir or BADGES_DIR
+    cards_dir = cards_dir or CARDS_DIR
+    badges_dir.mkdir(parents=True, exist_ok=True)
+    cards_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest_path = badges_dir / "manifest.json"
+    previous = {} if force else load_manifest(manifest_path)
+    current: Dict[str, str] = {}
+
+    def render_batch(batch):
+        out = []
+        for model_id, violations, score in batch:
+            if score is None:
+                score = compute_shadow_score(violations)
+            key = content_key(model_id, score, violations)
+            paths = (card_path(model_id, cards_dir), badge_path(model_id, False, badges_dir),
+                     badge_path(model_id, True, badges_dir))
+            if previous.get(model_id) == key and all(p.exists() for p in paths):
+                entry = {
+                    "model_id": model_id,
+                    "score": score,
+                    "badge": get_badge(score)[0],
+                    "card_path": str(paths[0]),
+                    "badge_path": str(paths[1])
+                }
+                out.append((key, False, entry))
+            else:
+                out.append((key, True, render_model(model_id, violations, score, badges_dir, cards_dir)))
+        return out
+
+    written = 0
+
+    def entries() -> Iterator[Dict[str, Any]]:
+        nonlocal written
+        for batch in ex.map(render_batch, batches):
+            for key, rendered, entry in batch:
+                current[entry["model_id"]] = key
+                written += rendered
+                yield entry
+
+    batches = [models[i:i + BATCH_SIZE] for i in range(0, len(models), BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        count = write_index(entries(), badges_dir / "index.json",
+                            keep_old=lambda: not written and list(current.items()) == list(previous.items()))
+    if list(current.items()) != list(previous.items()) or force:
+        save_manifest(manifest_path, current)
+    return {"count": count, "written": written}
+
+
+def generate_all_from_ranking(path: Path = RANKING_JSON, workers: int = 8, force: bool = False) -> Dict[str, int]:
+    """Generate badges and cards for every model in global_ranking.json."""
+    stats = generate_all(load_ranking_models(path), workers, force=force)
+    print(f"\n✅ {stats['count']} models from {path.name}: {stats['written']} rewritten, "
+          f"{stats['count'] - stats['written']} unchanged")
+    return stats
+
+
 def generate_all_from_evidence():
     """Generate badges and cards for all models in evidence."""
     evidence = load_evidence()
@@ -227,42 +439,10 @@ def generate_all_from_evidence():
         ("bigscience/bloom", ["NEC#1", "NEC#2", "NEC#7"]),
     ]
     
-    generated = []
-    for model_id, violations in example_models:
-        # Generate card
-        card = generate_oracle_card(model_id, violations)
-        card_path = save_oracle_card(model_id, card)
-        
-        # Generate badges
-        svg_full = generate_badge_svg(model_id, card["shadow_score"], violations)
-        svg_compact = generate_badge_svg(model_id, card["shadow_score"], violations, compact=True)
-        
-        badge_path = save_badge(model_id, svg_full)
-        save_badge(model_id, svg_compact, compact=True)
-        
-        generated.append({
-            "model_id": model_id,
-            "score": card["shadow_score"],
-            "badge": card["badge"],
-            "card_path": str(card_path),
-            "badge_path": str(badge_path)
-        })
-        
-        print(f"✓ {model_id}: {card['shadow_score']}/100 {card['badge']}")
+    stats = generate_all([(m, v, None) for m, v in example_models], workers=1)
     
-    # Generate index
-    index = {
-        "schema": "crovia_badges_index.v1",
-        "generated_at": datetime.now(timezone.utc).isoformat(),
-        "count": len(generated),
-        "badges": generated
-    }
-    
-    with open(BADGES_DIR / "index.json", 'w', encoding='utf-8') as f:
-        json.dump(index, f, indent=2)
-    
-    print(f"\n✅ Generated {len(generated)} badges and cards")
-    return generated
+    print(f"\n✅ Generated {stats['count']} badges and cards ({stats['written']} rewritten)")
+    return stats
 
 
 if __name__ == "__main__":
@@ -272,8 +452,17 @@ if __name__ == "__main__":
     print("CROVIA BADGE GENERATOR v1.0.0")
     print("=" * 50)
     
-    if "--all" in sys.argv or len(sys.argv) == 1:
+    workers = 8
+    if "--workers" in sys.argv:
+        workers = int(sys.argv[sys.argv.index("--workers") + 1])
+    
+    if len(sys.argv) == 1:
         generate_all_from_evidence()
+    elif "--all" in sys.argv:
+        if RANKING_JSON.exists():
+            generate_all_from_ranking(RANKING_JSON, workers, force="--force" in sys.argv)
+        else:
+            generate_all_from_evidence()
     elif "--model" in sys.argv:
         idx = sys.argv.index("--model")
         if idx + 1 < len(sys.argv):
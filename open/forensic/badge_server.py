@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Crovia badge server: renders badges and oracle cards on demand.
+
+Routes (model ids keep their slash):
+  GET /badge/<org>/<model>.svg                 full badge
+  GET /badge/<org>/<model>.svg?style=compact   compact badge
+  GET /card/<org>/<model>.json                 oracle card
+  GET /healthz
+
+Data comes from snapshots/global_ranking.json (score + top_gaps), the same
+input as `badge_generator.py --all`, looked up per request through the
+memory-mapped ranking index (ranking_index.py). The file is re-stat'ed at most
+every --reload-secs; when it changes the index is rebuilt and the cache dropped.
+Rendered responses sit in an LRU cache with a TTL. ETags are the badge
+content keys, so If-None-Match revalidation survives cache expiry and
+restarts. Stdlib only, no network access needed.
+
+Usage:
+  python open/forensic/badge_server.py --port 8787
+  curl -s localhost:8787/badge/meta-llama/Llama-3.3-70B-Instruct.svg
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from badge_generator import RANKING_JSON, content_key, generate_badge_svg, generate_oracle_card
+from ranking_index import RankingIndex
+
+SVG_TYPE = "image/svg+xml; charset=utf-8"
+JSON_TYPE = "application/json; charset=utf-8"
+
+
+class TTLCache:
+    """Thread-safe LRU with a per-entry time to live."""
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[0] < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return item[1]
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RankingSource:
+    """Ranking index that follows the ranking file as it changes."""
+
+    def __init__(self, path: Path, reload_secs: float = 5.0, on_reload=None, index_path: Optional[Path] = None):
+        self.path = Path(path)
+        self.reload_secs = reload_secs
+        self.on_reload = on_reload
+        self.index_path = index_path
+        # (file signature, RankingIndex or None), swapped as one tuple
+        self.state: Tuple[Any, Optional[RankingIndex]] = (None, None)
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+        self.maybe_reload(force=True)
+
+    def maybe_reload(self, force: bool = False) -> bool:
+        now = time.monotonic()
+        if not force and now - self.checked_at < self.reload_secs:
+            return False
+        with self._lock:
+            self.checked_at = now
+            try:
+                st = self.path.stat()
+            except FileNotFoundError:
+                return False
+            sig = (st.st_mtime_ns, st.st_size)
+            if sig == self.state[0]:
+                return False
+            try:
+                index = RankingIndex.for_ranking(self.path, self.index_path)
+            except ValueError:
+                return False  # caught mid-copy; keep serving the old ranking
+            # the previous index is left to GC: in-flight requests may still read it
+            self.state = (sig, index)
+        if self.on_reload:
+            self.on_reload()
+        return True
+
+    def snapshot(self):
+        self.maybe_reload()
+        return self.state
+
+
+class BadgeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, ranking: Path, ttl: float = 300.0, cache_size: int = 4096, reload_secs: float = 5.0,
+                 index_path: Optional[Path] = None):
+        self.cache = TTLCache(cache_size, ttl)
+        self.ranking = RankingSource(ranking, reload_secs, on_reload=self.cache.clear, index_path=index_path)
+        super().__init__(addr, BadgeHandler)
+
+    def render(self, kind: str, model_id: str) -> Optional[Tuple[bytes, str, str]]:
+        """(body, content_type, etag) for kind in full/compact/card, None if unknown."""
+        sig, index = self.ranking.snapshot()
+        # the signature in the key keeps a render racing a reload from
+        # caching stale output under the new ranking
+        hit = self.cache.get((sig, kind, model_id))
+        if hit is not None:
+            return hit
+        found = index.lookup(model_id) if index is not None else None
+        if found is None:
+            return None
+        violations, score = found["violations"], int(round(found["score"]))
+        key = content_key(model_id, score, violations)
+        if kind == "card":
+            card = generate_oracle_card(model_id, violations, score)
+            # generated_at differs per render, so the card ETag is weak
+            out = (json.dumps(card, indent=2, ensure_ascii=False).encode("utf-8"), JSON_TYPE, f'W/"{key[:32]}"')
+        else:
+            svg = generate_badge_svg(model_id, score, violations, compact=(kind == "compact"))
+            out = (svg.encode("utf-8"), SVG_TYPE, f'"{kind[0]}{key[:32]}"')
+        self.cache.put((sig, kind, model_id), out)
+        return out
+
+
+class BadgeHandler(BaseHTTPRequestHandler):
+    server: BadgeServer
+
+    def do_GET(self):
+        u = urlsplit(self.path)
+        path = unquote(u.path)
+        if path == "/healthz":
+            body = json.dumps({"ok": True, "models": len(self.server.ranking.state[1] or ())}).encode()
+            return self._send(200, body, JSON_TYPE)
+
+        if path.startswith("/badge/") and path.endswith(".svg"):
+            compact = parse_qs(u.query).get("style", [""])[0] == "compact"
+            kind, model_id = ("compact" if compact else "full"), path[len("/badge/"):-len(".svg")]
+        elif path.startswith("/card/") and path.endswith(".json"):
+            kind, model_id = "card", path[len("/card/"):-len(".json")]
+        else:
+            return self._send(404, b'{"error": "not found"}', JSON_TYPE)
+
+        out = self.server.render(kind, model_id)
+        if out is None:
+            return self._send(404, json.dumps({"error": "unknown model", "model_id": model_id}).encode(), JSON_TYPE)
+        body, ctype, etag = out
+        if etag in (t.strip() for t in self.headers.get("If-None-Match", "").split(",")):
+            return self._send(304, b"", ctype, etag)
+        self._send(200, body, ctype, etag)
+
+    def _send(self, status: int, body: bytes, ctype: str, etag: Optional[str] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Cache-Control", f"public, max-age={int(self.server.cache.ttl)}")
+        if etag:
+            self.send_header("ETag", etag)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        if os.environ.get("CROVIA_BADGE_SERVER_LOG"):
+            super().log_message(*args)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Serve Crovia badges and oracle cards on demand")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8787)
+    ap.add_argument("--ranking", default=str(RANKING_JSON))
+    ap.add_argument("--ttl", type=float, default=300.0, help="Seconds a rendered response stays cached")
+    ap.add_argument("--cache-size", type=int, default=4096, help="Max cached responses")
+    ap.add_argument("--reload-secs", type=float, default=5.0, help="How often to check the ranking for changes")
+    args = ap.parse_args()
+
+    srv = BadgeServer((args.host, args.port), Path(args.ranking), args.ttl, args.cache_size, args.reload_secs)
+    print(f"[CROVIA] badge server on http://{args.host}:{srv.server_address[1]} "
+          f"({len(srv.ranking.state[1] or ())} models)")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+cep_verify.py — bulk verification of CEP capsules against their artifacts.
+
+Both capsule layouts in cep-capsules/ are understood:
+
+  crovia_cep_capsule.v1   evidence.{receipts, payouts, hashchain}.{path, sha256}
+  CEP.v1                  crovia_evidence.{trust_bundle, receipts, payouts}.sha256
+                          (no paths: artifacts are found by content)
+
+Artifacts are looked up under one or more --root directories. A reference
+with a path is checked at <root>/<path>; a reference without one (or whose
+path is absent) passes if any file under the roots has the declared digest.
+All capsules are loaded first and the referenced files deduplicated, so a
+payouts file shared by every capsule is hashed once; hashing runs on a
+thread pool, large files via mmap.
+
+State (.cache/cep_verify_state.json) keeps each file's (size, mtime_ns,
+sha256) and each capsule's last result. With --incremental, files whose
+size and mtime are unchanged are not re-hashed, and only capsules whose own
+file changed, or that reference a digest/path touched by a changed artifact,
+are re-evaluated; the rest report their cached verdict.
+
+Usage:
+  python open/forensic/cep_verify.py --root ../crovia-core
+  python open/forensic/cep_verify.py --root ../crovia-core --incremental --json cep_verify.ndjson
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CAPSULE_DIR = REPO_ROOT / "cep-capsules"
+STATE = REPO_ROOT / ".cache" / "cep_verify_state.json"
+
+ROLES = ("trust_bundle", "receipts", "payouts", "hashchain")
+SKIP_DIRS = {".git", ".cache", "__pycache__", "node_modules"}
+MMAP_MIN = 1 << 20
+READ_BUF = 1 << 20
+
+
+def sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_MIN:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        else:
+            for chunk in iter(lambda: f.read(READ_BUF), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def file_sig(path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+# -------------------------
+# Capsules
+# -------------------------
+def load_capsule(path: Path) -> Dict[str, Any]:
+    """{"capsule", "file", "refs": [{"role", "path", "sha256"}]} for either layout."""
+    with open(path, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+    if "crovia_evidence" in doc:
+        section, name = doc["crovia_evidence"], path.stem
+    else:
+        section, name = doc.get("evidence", {}), doc.get("fingerprint") or path.stem
+    refs = []
+    for role in ROLES:
+        ref = section.get(role)
+        if isinstance(ref, dict) and ref.get("sha256"):
+            refs.append({"role": role, "path": ref.get("path") or None, "sha256": ref["sha256"].lower()})
+    return {"capsule": name, "file": str(path), "refs": refs}
+
+
+def discover_capsules(capsule_dir: Path) -> List[Path]:
+    return sorted(Path(capsule_dir).glob("*.json"))
+
+
+# -------------------------
+# Artifacts
+# -------------------------
+def walk_files(roots: List[Path]) -> List[str]:
+    out = []
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            out += [os.path.join(dirpath, n) for n in filenames]
+    return out
+
+
+def resolve(ref_path: str, roots: List[Path]) -> Optional[str]:
+    for root in roots:
+        p = os.path.join(root, ref_path)
+        if os.path.isfile(p):
+            return os.path.realpath(p)
+    return None
+
+
+def hash_files(paths, cache: Dict[str, list], threads: int, incremental: bool):
+    """{path: [size, mtime_ns, sha256]} for paths; only stale entries are hashed."""
+    digests: Dict[str, list] = {}
+    todo = []
+    for p in paths:
+        sig = file_sig(p)
+        if sig is None:
+            continue
+        prev = cache.get(p)
+        if incremental and prev and tuple(prev[:2]) == sig:
+            digests[p] = prev
+        else:
+            todo.append((p, sig))
+
+    def work(item):
+        p, sig = item
+        return p, [sig[0], sig[1], sha256_file(p)]
+
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as ex:
+        for p, entry in ex.map(work, todo):
+            digests[p] = entry
+    return digests, len(todo)
+
+
+# -------------------------
+# Verification
+# -------------------------
+def check_capsule(cap: Dict[str, Any], roots: List[Path], digests: Dict[str, list],
+                  by_digest: Dict[str, List[str]]) -> Dict[str, Any]:
+    checks = []
+    for ref in cap["refs"]:
+        c = {"role": ref["role"], "path": ref["path"], "expected": ref["sha256"]}
+        local = resolve(ref["path"], roots) if ref["path"] else None
+        if local is not None and local in digests:
+            actual = digests[local][2]
+            c.update(file=local, actual=actual, status="OK" if actual == ref["sha256"] else "MISMATCH")
+        elif by_digest.get(ref["sha256"]):
+            c.update(file=by_digest[ref["sha256"]][0], actual=ref["sha256"], status="OK")
+        else:
+            c.update(file=None, actual=None, status="MISSING")
+        checks.append(c)
+    return {
+        "schema": "crovia.cep_verify_result.v1",
+        "capsule": cap["capsule"],
+        "file": cap["file"],
+        "checks": checks,
+        "ok": bool(checks) and all(c["status"] == "OK" for c in checks),
+        "verified_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+    }
+
+
+def load_state(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(path: Path, state: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def verify(capsule_files: List[Path], roots: List[Path], state_path: Path = STATE,
+           threads: int = 8, incremental: bool = False) -> Dict[str, Any]:
+    """Verify every capsule; returns {"results", "stats"} and updates the state file."""
+    roots = [Path(r).resolve() for r in roots]
+    state = load_state(state_path)
+    if state.get("roots") != [str(r) for r in roots]:
+        state = {}
+    incremental = incremental and bool(state)
+    prev_files: Dict[str, list] = state.get("files", {})
+    prev_caps: Dict[str, Any] = state.get("capsules", {})
+
+    capsules = [load_capsule(Path(p)) for p in capsule_files]
+
+    # dedupe: every referenced path once, plus the roots' contents when some
+    # reference has to be matched by digest alone
+    wanted = {resolve(r["path"], roots) for c in capsules for r in c["refs"] if r["path"]}
+    wanted.discard(None)
+    if any(not r["path"] or resolve(r["path"], roots) is None for c in capsules for r in c["refs"]):
+        wanted.update(os.path.realpath(p) for p in walk_files(roots))
+    digests, hashed = hash_files(sorted(wanted), prev_files, threads, incremental)
+
+    by_digest: Dict[str, List[str]] = {}
+    for p, (_, _, d) in sorted(digests.items()):
+        by_digest.setdefault(d, []).append(p)
+
+    # anything whose digest appeared, vanished or moved invalidates capsules citing it
+    touched_digests, touched_paths = set(), set()
+    for p in set(prev_files) | set(digests):
+        old, new = prev_files.get(p), digests.get(p)
+        if old != new:
+            touched_paths.add(p)
+            touched_digests.update(e[2] for e in (old, new) if e)
+
+    results, rechecked = [], 0
+    for cap in capsules:
+        sig = file_sig(cap["file"])
+        prev = prev_caps.get(cap["file"])
+        stale = (
+            not incremental or prev is None or tuple(prev["sig"]) != sig
+            or any(r["sha256"] in touched_digests for r in cap["refs"])
+            or any(c.get("file") in touched_paths for c in prev["result"]["checks"])
+        )
+        if stale:
+            res = check_capsule(cap, roots, digests, by_digest)
+            res["cached"] = False
+            rechecked += 1
+        else:
+            res = dict(prev["result"], cached=True)
+        results.append(res)
+
+    save_state(state_path, {
+        "schema": "crovia.cep_verify_state.v1",
+        "roots": [str(r) for r in roots],
+        "files": digests,
+        "capsules": {r["file"]: {"sig": list(file_sig(r["file"]) or (0, 0)),
+                                 "result": {k: v for k, v in r.items() if k != "cached"}} for r in results},
+    })
+    unique = {r["sha256"] for c in capsules for r in c["refs"]}
+    return {
+        "results": results,
+        "stats": {"capsules": len(capsules), "rechecked": rechecked, "unique_artifacts": len(unique),
+                  "files_seen": len(digests), "files_hashed": hashed,
+                  "passed": sum(r["ok"] for r in results)},
+    }
+
+
+def format_table(results: List[Dict[str, Any]]) -> str:
+    width = max([len("CAPSULE")] + [len(r["capsule"]) for r in results])
+    lines = ["  ".join(["CAPSULE".ljust(width)] + [role.upper().ljust(12) for role in ROLES] + ["RESULT"])]
+    for r in results:
+        status = {c["role"]: c["status"] for c in r["checks"]}
+        lines.append("  ".join(
+            [r["capsule"].ljust(width)] + [status.get(role, "-").ljust(12) for role in ROLES]
+            + [("PASS" if r["ok"] else "FAIL") + (" (cached)" if r.get("cached") else "")]
+        ))
+    return "\n".join(lines)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Verify CEP capsules against the artifacts they reference")
+    ap.add_argument("capsules", nargs="*", help="Capsule files (default: every cep-capsules/*.json)")
+    ap.add_argument("--root", action="append", default=None,
+                    help="Directory artifacts are resolved under (repeatable; default: repo root)")
+    ap.add_argument("--threads", type=int, default=8, help="Files hashed in parallel")
+    ap.add_argument("--incremental", action="store_true",
+                    help="Reuse digests of unchanged files and verdicts of unaffected capsules")
+    ap.add_argument("--state", default=str(STATE))
+    ap.add_argument("--json", default=None, help="Also write per-capsule results as NDJSON here")
+    args = ap.parse_args()
+
+    capsule_files = [Path(p) for p in args.capsules] or discover_capsules(CAPSULE_DIR)
+    capsule_files = [p.resolve() for p in capsule_files]
+    roots = [Path(r) for r in (args.root or [str(REPO_ROOT)])]
+    out = verify(capsule_files, roots, Path(args.state), args.threads, args.incremental)
+
+    print(format_table(out["results"]))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for r in out["results"]:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    s = out["stats"]
+    print(f"[CROVIA] cep verify: {s['passed']}/{s['capsules']} capsules pass; {s['rechecked']} rechecked, "
+          f"{s['unique_artifacts']} unique artifacts, {s['files_hashed']}/{s['files_seen']} files hashed",
+          file=sys.stderr)
+    return 0 if s["passed"] == s["capsules"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+ddf_drift.py — hash-first drift detection over DDF snapshots.
+
+Reproduces the open/drift/ddf_drift_events_30d.jsonl pipeline as a library:
+every snapshot's ddf_hash is compared against an in-memory
+target_id -> (ddf_hash, fields) map, one dict lookup per target. Only when the
+hash moved are the diffable fields extracted and compared, yielding a
+crovia.open.ddf_drift_event.v3 row shaped like the published ones:
+
+  tags            set diff: before_count, after_count, added, removed (null if empty)
+  downloads       before, after, delta
+  license         before, after
+  readme_access   before, after (upper-case, as in the events' coverage block)
+
+Snapshots carry only tags_sample, so tag diffs are over the sample when
+tags_count exceeds it (a "tags" list is preferred when present). A first
+sighting seeds the map without an event. A snapshot lacking hashes.ddf_hash
+is fingerprinted locally (sha256 of its canonical extracted/downloads/access);
+that fingerprint is stable here but not the producer's.
+
+detect(workers=N) sends the changed targets' field extraction and diffing
+to a process pool once a batch has PARALLEL_MIN of them. With the built-in
+FIELDS, pickling a snapshot costs more than diffing it (7k fully-changed
+snapshots: ~0.17s inline, ~0.9s on 4 workers), so the CLI defaults to
+inline; the pool is for costlier differs registered in FIELDS.
+
+CLI:
+  python open/forensic/ddf_drift.py detect open/drift/ddf_snapshots_latest.jsonl         # seeds state
+  python open/forensic/ddf_drift.py detect new_snapshots.jsonl --out drift_events.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+STATE = REPO_ROOT / ".cache" / "ddf_drift_state.json"
+
+EVENT_SCHEMA = "crovia.open.ddf_drift_event.v3"
+EVENT_NOTE = "Drift event: public disclosure fingerprint changed (no interpretation)."
+PARALLEL_MIN = 2048
+
+
+# -------------------------
+# Fields
+# -------------------------
+def _tags(s: Dict[str, Any]):
+    ex = s.get("extracted") or {}
+    tags = ex.get("tags") if ex.get("tags") is not None else ex.get("tags_sample")
+    return sorted(set(tags or []))
+
+
+def _downloads(s: Dict[str, Any]):
+    return (s.get("popularity") or {}).get("downloads")
+
+
+def _license(s: Dict[str, Any]):
+    return (s.get("extracted") or {}).get("license")
+
+
+def _readme_access(s: Dict[str, Any]):
+    v = (s.get("extracted") or {}).get("readme_access")
+    return v.upper() if isinstance(v, str) else v
+
+
+def _diff_tags(before, after, prev_state, snapshot):
+    b, a = set(before or ()), set(after or ())
+    if a == b:
+        return None
+    prev_count = prev_state.get("tags_count")
+    new_count = (snapshot.get("extracted") or {}).get("tags_count")
+    return {
+        "before_count": prev_count if prev_count is not None else len(b),
+        "after_count": new_count if new_count is not None else len(a),
+        "added": sorted(a - b) or None,
+        "removed": sorted(b - a) or None,
+    }
+
+
+def _diff_count(before, after, *_):
+    if before == after:
+        return None
+    delta = after - before if isinstance(before, int) and isinstance(after, int) else None
+    return {"before": before, "after": after, "delta": delta}
+
+
+def _diff_value(before, after, *_):
+    return None if before == after else {"before": before, "after": after}
+
+
+# name -> (extract(snapshot), diff(before, after, prev_fields, snapshot) -> change or None)
+FIELDS: Dict[str, Tuple[Callable, Callable]] = {
+    "tags": (_tags, _diff_tags),
+    "downloads": (_downloads, _diff_count),
+    "license": (_license, _diff_value),
+    "readme_access": (_readme_access, _diff_value),
+}
+
+
+def extract_fields(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    fields = {name: extract(snapshot) for name, (extract, _) in FIELDS.items()}
+    fields["tags_count"] = (snapshot.get("extracted") or {}).get("tags_count")
+    return fields
+
+
+def fingerprint(snapshot: Dict[str, Any]) -> str:
+    doc = {"extracted": snapshot.get("extracted"), "downloads": _downloads(snapshot), "access": snapshot.get("access")}
+    return hashlib.sha256(json.dumps(doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+                          .encode("utf-8")).hexdigest()
+
+
+def ddf_hash(snapshot: Dict[str, Any]) -> str:
+    return (snapshot.get("hashes") or {}).get("ddf_hash") or fingerprint(snapshot)
+
+
+# -------------------------
+# Events
+# -------------------------
+def build_event(snapshot: Dict[str, Any], prev_hash: str, new_hash: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+    sources = snapshot.get("sources") or {}
+    api_status = (sources.get("hf_api") or {}).get("http_status")
+    readme_status = (sources.get("hf_readme") or {}).get("http_status")
+    access = _readme_access(snapshot)
+    hashes = snapshot.get("hashes") or {}
+    return {
+        "schema": EVENT_SCHEMA,
+        "target_id": snapshot.get("target_id"),
+        "tipo_target": snapshot.get("tipo_target"),
+        "observed_at": snapshot.get("observed_at"),
+        "prev_ddf_hash": prev_hash,
+        "new_ddf_hash": new_hash,
+        "changes": changes,
+        "hashes": {"card_hash": hashes.get("card_hash"), "readme_hash": hashes.get("readme_hash")},
+        "coverage": {"readme_access": access},
+        "quality": {"data_quality_ok": api_status == 200 and access != "FORBIDDEN",
+                    "api_status": api_status, "readme_status": readme_status},
+        "popularity": snapshot.get("popularity"),
+        "sources": sources,
+        "note": EVENT_NOTE,
+    }
+
+
+def _diff_job(job):
+    """(prev_entry or None, snapshot, new_hash) -> (fields, event or None). Runs in pool workers."""
+    prev, snapshot, new_hash = job
+    fields = extract_fields(snapshot)
+    if prev is None:
+        return fields, None
+    prev_hash, prev_fields = prev
+    changes = {}
+    for name, (_, diff) in FIELDS.items():
+        change = diff(prev_fields.get(name), fields[name], prev_fields, snapshot)
+        if change is not None:
+            changes[name] = change
+    return fields, build_event(snapshot, prev_hash, new_hash, changes)
+
+
+class DriftDetector:
+    """target_id -> (ddf_hash, fields); feed it snapshots, get drift events back."""
+
+    def __init__(self, latest: Optional[Dict[str, Tuple[str, Dict[str, Any]]]] = None):
+        self.latest: Dict[str, Tuple[str, Dict[str, Any]]] = latest or {}
+
+    def observe(self, snapshot: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self.detect([snapshot], workers=1)[0] if snapshot.get("target_id") else None
+
+    def detect(self, snapshots: Iterable[Dict[str, Any]], workers: int = 1) -> List[Optional[Dict[str, Any]]]:
+        """One entry per snapshot: its drift event, or None (unchanged, first sighting or no target_id)."""
+        snapshots = list(snapshots)
+        out: List[Optional[Dict[str, Any]]] = [None] * len(snapshots)
+        # a target seen twice in one batch must diff against its own earlier row:
+        # split the batch into rounds where every target occurs at most once
+        rounds: List[List[int]] = []
+        seen: Dict[str, int] = {}
+        for i, s in enumerate(snapshots):
+            tid = s.get("target_id")
+            if not tid:
+                continue
+            r = seen.get(tid, -1) + 1
+            seen[tid] = r
+            if r == len(rounds):
+                rounds.append([])
+            rounds[r].append(i)
+
+        pool = None
+        try:
+            for idx in rounds:
+                jobs, slots = [], []
+                for i in idx:
+                    s = snapshots[i]
+                    h = ddf_hash(s)
+                    prev = self.latest.get(s["target_id"])
+                    if prev is not None and prev[0] == h:
+                        continue
+                    jobs.append((prev, s, h))
+                    slots.append(i)
+                if workers > 1 and len(jobs) >= PARALLEL_MIN:
+                    pool = pool or ProcessPoolExecutor(max_workers=workers)
+                    results = pool.map(_diff_job, jobs, chunksize=max(64, len(jobs) // (workers * 4)))
+                else:
+                    results = map(_diff_job, jobs)
+                for i, (prev, s, h), (fields, event) in zip(slots, jobs, results):
+                    self.latest[s["target_id"]] = (h, fields)
+                    out[i] = event
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return out
+
+    # ---------
+    # persistence
+    # ---------
+
+    @classmethod
+    def load(cls, path: Path = STATE) -> "DriftDetector":
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        return cls({tid: (h, fields) for tid, (h, fields) in data.get("targets", {}).items()})
+
+    def save(self, path: Path = STATE) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"schema": "crovia.ddf_drift_state.v1",
+                       "targets": {tid: [h, fields] for tid, (h, fields) in self.latest.items()}},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+
+def iter_jsonl(path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Hash-first drift detection over DDF snapshots")
+    ap.add_argument("--state", default=str(STATE))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    d = sub.add_parser("detect", help="Compare a snapshot batch against the stored state")
+    d.add_argument("snapshots", help="DDF snapshot JSONL")
+    d.add_argument("--out", default=None, help="Append drift events here (default: stdout)")
+    d.add_argument("--workers", type=int, default=1, help="Processes for field diffing (see module doc)")
+    d.add_argument("--dry-run", action="store_true", help="Do not update the state file")
+    args = ap.parse_args()
+
+    state = Path(args.state)
+    det = DriftDetector.load(state)
+    known = len(det.latest)
+    events = [e for e in det.detect(iter_jsonl(Path(args.snapshots)), workers=args.workers) if e]
+
+    out = open(args.out, "a", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for e in events:
+            out.write(json.dumps(e, ensure_ascii=False) + "\n")
+    finally:
+        if args.out:
+            out.close()
+    if not args.dry_run:
+        det.save(state)
+    print(f"[CROVIA] ddf drift: {len(events)} events, {len(det.latest) - known} new targets, "
+          f"{len(det.latest)} tracked", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+ddf_store.py — local columnar store for DDF snapshots and drift events.
+
+open/drift/ddf_snapshots_latest.jsonl and ddf_drift_events_30d.jsonl are
+ingested into day partitions of a compact binary column format (stdlib
+only; pyarrow is not a dependency of this repo):
+
+  .cache/ddf_store/<kind>/day=YYYY-MM-DD/part-NNNNNN.ddfc
+  .cache/ddf_store/<kind>/latest.json        target_id -> [observed_at, part, row]
+
+kind is "snapshots" or "events". A part file is
+
+  "CRVDDFC1" | column blocks (zlib each) | footer JSON | u32 footer length | "CRVDDFC1"
+
+with one block per column:
+
+  dict   tipo_target, schema            u16 codes into a footer dictionary
+  str    target_id, observed_at         JSON string array
+  hash   sha256 hex fields              33 bytes per row: null flag + raw digest
+  rows   full original row              u32 offsets + compact JSON, parsed per hit
+
+The footer carries per-part stats (observed_at min/max, tipo_target values,
+a bloom filter per hash column), so scan() prunes on three levels: day
+directories by the observed_at range, whole parts by footer stats, then rows
+by decoding only the predicate columns. Only matching rows are JSON-parsed.
+
+append() is the hourly-sync path: rows are grouped by day into new parts and
+rows not newer than a target's latest observation are skipped, so re-ingesting
+a rolling export is idempotent. compact() merges a day's parts into one.
+
+CLI:
+  python open/forensic/ddf_store.py ingest                   # both open/drift files
+  python open/forensic/ddf_store.py latest AaronZ345/GTSinger
+  python open/forensic/ddf_store.py query --kind events --tipo model --since 2026-04-20 --hash new_ddf_hash=52748f...
+  python open/forensic/ddf_store.py compact
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DRIFT_DIR = REPO_ROOT / "open" / "drift"
+STORE = REPO_ROOT / ".cache" / "ddf_store"
+SOURCES = {
+    "snapshots": DRIFT_DIR / "ddf_snapshots_latest.jsonl",
+    "events": DRIFT_DIR / "ddf_drift_events_30d.jsonl",
+}
+
+MAGIC = b"CRVDDFC1"
+FOOTER_LEN = struct.Struct("<I")
+HASH_WIDTH = 33
+BLOOM_BITS_PER_ROW = 10
+BLOOM_K = 3
+
+# column name -> (dotted path in the row, encoding)
+COLUMNS = {
+    "snapshots": {
+        "target_id": ("target_id", "str"),
+        "tipo_target": ("tipo_target", "dict"),
+        "observed_at": ("observed_at", "str"),
+        "schema": ("schema", "dict"),
+        "card_hash": ("hashes.card_hash", "hash"),
+        "readme_hash": ("hashes.readme_hash", "hash"),
+        "ddf_hash": ("hashes.ddf_hash", "hash"),
+    },
+    "events": {
+        "target_id": ("target_id", "str"),
+        "tipo_target": ("tipo_target", "dict"),
+        "observed_at": ("observed_at", "str"),
+        "schema": ("schema", "dict"),
+        "prev_ddf_hash": ("prev_ddf_hash", "hash"),
+        "new_ddf_hash": ("new_ddf_hash", "hash"),
+        "card_hash": ("hashes.card_hash", "hash"),
+        "readme_hash": ("hashes.readme_hash", "hash"),
+    },
+}
+
+
+def _get(row: Dict[str, Any], dotted: str):
+    for part in dotted.split("."):
+        if not isinstance(row, dict):
+            return None
+        row = row.get(part)
+    return row
+
+
+# -------------------------
+# Bloom filter (sha256 values are already uniform: slice them)
+# -------------------------
+def _bloom_positions(hexdigest: str, m: int):
+    return [int(hexdigest[i * 8:(i + 1) * 8], 16) % m for i in range(BLOOM_K)]
+
+
+def bloom_build(values: Iterable[Optional[str]], rows: int) -> bytes:
+    m = max(64, rows * BLOOM_BITS_PER_ROW)
+    bits = bytearray((m + 7) // 8)
+    for v in values:
+        if v:
+            for p in _bloom_positions(v, len(bits) * 8):
+                bits[p >> 3] |= 1 << (p & 7)
+    return bytes(bits)
+
+
+def bloom_may_contain(bits: bytes, value: str) -> bool:
+    return all(bits[p >> 3] & (1 << (p & 7)) for p in _bloom_positions(value, len(bits) * 8))
+
+
+# -------------------------
+# Column codecs
+# -------------------------
+def _encode(enc: str, values: List[Any], meta: Dict[str, Any]) -> bytes:
+    if enc == "dict":
+        vocab: List[Any] = []
+        lookup: Dict[Any, int] = {}
+        codes = array("H")
+        for v in values:
+            if v not in lookup:
+                lookup[v] = len(vocab)
+                vocab.append(v)
+            codes.append(lookup[v])
+        meta["dict"] = vocab
+        return codes.tobytes()
+    if enc == "hash":
+        out = bytearray()
+        for v in values:
+            out += b"\x00" + bytes(32) if v is None else b"\x01" + bytes.fromhex(v)
+        return bytes(out)
+    if enc == "str":
+        return json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    raise ValueError(f"unknown encoding: {enc}")
+
+
+def _decode(enc: str, raw: bytes, meta: Dict[str, Any]) -> List[Any]:
+    if enc == "dict":
+        codes = array("H")
+        codes.frombytes(raw)
+        vocab = meta["dict"]
+        return [vocab[c] for c in codes]
+    if enc == "hash":
+        return [raw[i + 1:i + HASH_WIDTH].hex() if raw[i] else None for i in range(0, len(raw), HASH_WIDTH)]
+    if enc == "str":
+        return json.loads(raw.decode("utf-8"))
+    raise ValueError(f"unknown encoding: {enc}")
+
+
+def _is_sha256(v) -> bool:
+    if v is None:
+        return True
+    if not isinstance(v, str) or len(v) != 64:
+        return False
+    try:
+        bytes.fromhex(v)
+    except ValueError:
+        return False
+    return True
+
+
+# -------------------------
+# Part files
+# -------------------------
+def write_part(path: Path, kind: str, rows: List[Dict[str, Any]]) -> None:
+    blocks: List[bytes] = []
+    columns: Dict[str, Any] = {}
+    stats: Dict[str, Any] = {"bloom": {}}
+    offset = len(MAGIC)
+
+    def add(name: str, enc: str, payload: bytes, meta: Dict[str, Any]) -> None:
+        nonlocal offset
+        data = zlib.compress(payload, 6)
+        columns[name] = dict(meta, enc=enc, offset=offset, length=len(data))
+        blocks.append(data)
+        offset += len(data)
+
+    for name, (dotted, enc) in COLUMNS[kind].items():
+        values = [_get(r, dotted) for r in rows]
+        if enc == "hash" and not all(_is_sha256(v) for v in values):
+            enc = "str"
+        meta: Dict[str, Any] = {}
+        add(name, enc, _encode(enc, values, meta), meta)
+        if name == "observed_at":
+            present = [v for v in values if v]
+            stats["observed_at"] = [min(present), max(present)] if present else None
+        elif name == "tipo_target":
+            stats["tipo_target"] = sorted({v for v in values if v is not None})
+        elif COLUMNS[kind][name][1] == "hash":
+            stats["bloom"][name] = base64.b64encode(bloom_build(values if enc == "hash" else [], len(rows))).decode()
+
+    offsets = array("I", [0])
+    body = bytearray()
+    for r in rows:
+        body += json.dumps(r, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        offsets.append(len(body))
+    add("_rows", "rows", offsets.tobytes() + bytes(body), {})
+
+    footer = json.dumps({"kind": kind, "rows": len(rows), "columns": columns, "stats": stats},
+                        separators=(",", ":")).encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        for b in blocks:
+            f.write(b)
+        f.write(footer)
+        f.write(FOOTER_LEN.pack(len(footer)))
+        f.write(MAGIC)
+    os.replace(tmp, path)
+
+
+class Part:
+    """Lazy reader: the footer on open, each column block on first use."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            f.seek(-(FOOTER_LEN.size + len(MAGIC)), os.SEEK_END)
+            tail = f.read()
+            if tail[FOOTER_LEN.size:] != MAGIC:
+                raise ValueError(f"not a ddf part: {self.path}")
+            (n,) = FOOTER_LEN.unpack(tail[:FOOTER_LEN.size])
+            f.seek(-(FOOTER_LEN.size + len(MAGIC) + n), os.SEEK_END)
+            self.footer = json.loads(f.read(n))
+        self.rows = self.footer["rows"]
+        self._cols: Dict[str, Any] = {}
+
+    def _block(self, name: str) -> bytes:
+        c = self.footer["columns"][name]
+        with open(self.path, "rb") as f:
+            f.seek(c["offset"])
+            return zlib.decompress(f.read(c["length"]))
+
+    def column(self, name: str) -> List[Any]:
+        if name not in self._cols:
+            c = self.footer["columns"][name]
+            self._cols[name] = _decode(c["enc"], self._block(name), c)
+        return self._cols[name]
+
+    def row(self, i: int) -> Dict[str, Any]:
+        return self.rows_at([i])[0]
+
+    def rows_at(self, idx: List[int]) -> List[Dict[str, Any]]:
+        if "_rows" not in self._cols:
+            raw = self._block("_rows")
+            offsets = array("I")
+            offsets.frombytes(raw[:(self.rows + 1) * 4])
+            self._cols["_rows"] = (offsets, memoryview(raw)[(self.rows + 1) * 4:])
+        offsets, body = self._cols["_rows"]
+        return [json.loads(bytes(body[offsets[i]:offsets[i + 1]])) for i in idx]
+
+    def may_match(self, tipo: Optional[set], since: Optional[str], until: Optional[str],
+                  hashes: Dict[str, str]) -> bool:
+        st = self.footer["stats"]
+        rng = st.get("observed_at")
+        if (since or until) and not rng:
+            return False
+        if since and rng[1] < since:
+            return False
+        if until and rng[0] >= until:
+            return False
+        if tipo is not None and not tipo.intersection(st.get("tipo_target", [])):
+            return False
+        for name, value in hashes.items():
+            bits = st["bloom"].get(name)
+            if bits is None:
+                return False
+            if self.footer["columns"][name]["enc"] == "hash" and \
+                    not bloom_may_contain(base64.b64decode(bits), value):
+                return False
+        return True
+
+
+# -------------------------
+# Store
+# -------------------------
+def _day(observed_at: str) -> str:
+    return (observed_at or "unknown")[:10]
+
+
+def _read_jsonl(path: Path) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class DDFStore:
+    def __init__(self, root: Path = STORE):
+        self.root = Path(root)
+        self._latest: Dict[str, Dict[str, list]] = {}
+
+    # ---------
+    # layout
+    # ---------
+
+    def _kind_dir(self, kind: str) -> Path:
+        if kind not in COLUMNS:
+            raise ValueError(f"unknown kind: {kind} (expected one of {sorted(COLUMNS)})")
+        return self.root / kind
+
+    def days(self, kind: str) -> List[str]:
+        d = self._kind_dir(kind)
+        return sorted(p.name[4:] for p in d.glob("day=*") if p.is_dir()) if d.exists() else []
+
+    def parts(self, kind: str, day: str) -> List[Path]:
+        return sorted((self._kind_dir(kind) / f"day={day}").glob("part-*.ddfc"))
+
+    def latest_index(self, kind: str) -> Dict[str, list]:
+        if kind not in self._latest:
+            p = self._kind_dir(kind) / "latest.json"
+            self._latest[kind] = json.loads(p.read_text(encoding="utf-8")) if p.exists() else {}
+        return self._latest[kind]
+
+    def _save_latest(self, kind: str) -> None:
+        p = self._kind_dir(kind) / "latest.json"
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(p.name + ".tmp")
+        tmp.write_text(json.dumps(self.latest_index(kind), ensure_ascii=False, separators=(",", ":")),
+                       encoding="utf-8")
+        os.replace(tmp, p)
+
+    # ---------
+    # write
+    # ---------
+
+    def append(self, kind: str, rows: Iterable[Dict[str, Any]]) -> int:
+        """Append rows newer than each target's latest observation; returns rows written."""
+        latest = self.latest_index(kind)
+        by_day: Dict[str, List[Dict[str, Any]]] = {}
+        seen: Dict[str, str] = {}
+        for r in sorted(rows, key=lambda r: r.get("observed_at") or ""):
+            tid, ts = r.get("target_id"), r.get("observed_at") or ""
+            if not tid:
+                continue
+            floor = seen.get(tid) or (latest[tid][0] if tid in latest else "")
+            if ts and ts <= floor:
+                continue
+            seen[tid] = ts
+            by_day.setdefault(_day(ts), []).append(r)
+
+        written = 0
+        for day, day_rows in sorted(by_day.items()):
+            existing = self.parts(kind, day)
+            n = int(existing[-1].stem.split("-")[1]) + 1 if existing else 0
+            path = self._kind_dir(kind) / f"day={day}" / f"part-{n:06d}.ddfc"
+            write_part(path, kind, day_rows)
+            rel = str(path.relative_to(self.root))
+            for i, r in enumerate(day_rows):
+                latest[r["target_id"]] = [r.get("observed_at") or "", rel, i]
+            written += len(day_rows)
+        if written:
+            self._save_latest(kind)
+        return written
+
+    def ingest(self, kind: str, path: Path) -> int:
+        return self.append(kind, _read_jsonl(path))
+
+    def compact(self, kind: str, day: str) -> bool:
+        """Merge a day's parts into one; True if anything was merged."""
+        parts = self.parts(kind, day)
+        if len(parts) < 2:
+            return False
+        rows, moved = [], {}
+        for p in parts:
+            part = Part(p)
+            rel = str(p.relative_to(self.root))
+            for i, r in enumerate(part.rows_at(list(range(part.rows)))):
+                moved[(rel, i)] = len(rows)
+                rows.append(r)
+        n = int(parts[-1].stem.split("-")[1]) + 1
+        merged = self._kind_dir(kind) / f"day={day}" / f"part-{n:06d}.ddfc"
+        write_part(merged, kind, rows)
+        merged_rel = str(merged.relative_to(self.root))
+        for tid, (ts, rel, i) in list(self.latest_index(kind).items()):
+            if (rel, i) in moved:
+                self.latest_index(kind)[tid] = [ts, merged_rel, moved[(rel, i)]]
+        self._save_latest(kind)
+        for p in parts:
+            p.unlink()
+        return True
+
+    # ---------
+    # read
+    # ---------
+
+    def latest(self, target_id: str, kind: str = "snapshots") -> Optional[Dict[str, Any]]:
+        entry = self.latest_index(kind).get(target_id)
+        if entry is None:
+            return None
+        return Part(self.root / entry[1]).row(entry[2])
+
+    def scan(self, kind: str, tipo_target=None, since: Optional[str] = None, until: Optional[str] = None,
+             **hashes: str) -> Iterator[Dict[str, Any]]:
+        """Rows with tipo_target in tipo_target (str or set), since <= observed_at < until
+        and every given hash column equal to its value."""
+        unknown = [h for h in hashes if COLUMNS[kind].get(h, ("", ""))[1] != "hash"]
+        if unknown:
+            raise ValueError(f"not a hash column of {kind}: {', '.join(unknown)}")
+        tipo = {tipo_target} if isinstance(tipo_target, str) else (set(tipo_target) if tipo_target else None)
+        hashes = {k: v.lower() for k, v in hashes.items()}
+        for day in self.days(kind):
+            if (since and day < since[:10]) or (until and day > until[:10]):
+                continue
+            for p in self.parts(kind, day):
+                part = Part(p)
+                if not part.may_match(tipo, since, until, hashes):
+                    continue
+                idx = range(part.rows)
+                if tipo is not None:
+                    col = part.column("tipo_target")
+                    idx = [i for i in idx if col[i] in tipo]
+                if since or until:
+                    col = part.column("observed_at")
+                    idx = [i for i in idx if (not since or col[i] >= since) and (not until or col[i] < until)]
+                for name, value in hashes.items():
+                    col = part.column(name)
+                    idx = [i for i in idx if col[i] == value]
+                yield from part.rows_at(list(idx))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Columnar store for DDF snapshots and drift events")
+    ap.add_argument("--store", default=str(STORE))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    i = sub.add_parser("ingest", help="Append JSONL rows (default: both open/drift exports)")
+    i.add_argument("--kind", choices=sorted(COLUMNS), default=None)
+    i.add_argument("path", nargs="?", default=None)
+    l = sub.add_parser("latest", help="Print a target's latest row")
+    l.add_argument("target_id")
+    l.add_argument("--kind", choices=sorted(COLUMNS), default="snapshots")
+    q = sub.add_parser("query", help="Print matching rows as JSONL")
+    q.add_argument("--kind", choices=sorted(COLUMNS), default="snapshots")
+    q.add_argument("--tipo", action="append", default=None, help="tipo_target (repeatable)")
+    q.add_argument("--since", default=None, help="observed_at >= (ISO prefix)")
+    q.add_argument("--until", default=None, help="observed_at < (ISO prefix)")
+    q.add_argument("--hash", action="append", default=[], metavar="FIELD=SHA256")
+    c = sub.add_parser("compact", help="Merge each day's parts into one")
+    c.add_argument("--kind", choices=sorted(COLUMNS), default=None)
+    args = ap.parse_args()
+
+    store = DDFStore(Path(args.store))
+    if args.cmd == "ingest":
+        if args.path and not args.kind:
+            ap.error("--kind is required with an explicit path")
+        jobs = [(args.kind, Path(args.path))] if args.path else \
+            [(k, p) for k, p in SOURCES.items() if not args.kind or k == args.kind]
+        for kind, path in jobs:
+            n = store.ingest(kind, path)
+            print(f"[CROVIA] ddf store: +{n} {kind} rows from {path}")
+    elif args.cmd == "latest":
+        row = store.latest(args.target_id, args.kind)
+        if row is None:
+            print(f"[CROVIA] no {args.kind} row for {args.target_id}", file=sys.stderr)
+            return 1
+        print(json.dumps(row, indent=2, ensure_ascii=False))
+    elif args.cmd == "query":
+        hashes = dict(h.split("=", 1) for h in args.hash)
+        for row in store.scan(args.kind, args.tipo, args.since, args.until, **hashes):
+            print(json.dumps(row, ensure_ascii=False))
+    else:
+        for kind in [args.kind] if args.kind else sorted(COLUMNS):
+            merged = [d for d in store.days(kind) if store.compact(kind, d)]
+            print(f"[CROVIA] ddf store: compacted {len(merged)} {kind} day(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+disclosure_index.py — weekly disclosure index: cached partials, range merges, one-pass rebuild.
+
+Every open/reports/disclosure_index_<week>.json is reduced once to a compact
+partial of raw counts (targets, models, datasets, training_present, ...),
+cached in .cache/disclosure_partials.json under the file's (size, mtime_ns).
+Trend views over a week range then cost O(weeks): add up the partials and
+derive percentages from the summed counts (target-week weighted, so weeks
+with wider coverage weigh more). Rounding matches the published indexes:
+one decimal for percentages, two for averages.
+
+Summed counts are target-weeks, not targets, so the merged range reports them
+under their own keys (target_weeks, ...) with no period_days. Range drift
+comes from the weekly events_7d, whose windows do not overlap between
+consecutive weeks; the 30-day counts overlap four-fold and distinct changed
+targets cannot be summed, so neither is merged.
+
+The current week is rebuilt from raw observations in one streaming pass
+over DDF snapshots (open/drift/ddf_snapshots_latest.jsonl) and one over
+drift events (open/drift/ddf_drift_events_30d.jsonl). The pass collects all
+counters plus bounded heaps for the top lists; an index section is never
+recomputed separately.
+
+  index_fingerprint = sha256 of the index without it (sorted keys, compact JSON)
+
+Usage:
+  python open/forensic/disclosure_index.py trend 2026-W06:2026-W20
+  python open/forensic/disclosure_index.py build --now 2026-05-11T08:11:46Z
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import sys
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+REPORTS = REPO_ROOT / "open" / "reports"
+SNAPSHOTS = REPO_ROOT / "open" / "drift" / "ddf_snapshots_latest.jsonl"
+EVENTS = REPO_ROOT / "open" / "drift" / "ddf_drift_events_30d.jsonl"
+CACHE = REPO_ROOT / ".cache" / "disclosure_partials.json"
+
+SCHEMA = "crovia.open.disclosure_index.v1"
+NOTE = "This is observational data only. No inference, judgment, or accusation."
+POPULARITY_NOTE = ("Factual observation: intersection of download count and training section status. "
+                   "No inference about compliance or quality.")
+PERIOD_DAYS = 30
+HIGH_DOWNLOADS = 10_000
+TOP_DOWNLOADS = 15
+TOP_MOVERS = 10
+RECENT = 20
+TOP_ORGS = 25
+
+COUNTS = ("targets", "models", "datasets", "training_present", "declared_datasets", "license_declared",
+          "readme_ok", "readme_not_found", "readme_forbidden", "with_downloads", "gated",
+          "drift_events_30d", "drift_events_7d", "changed_targets_30d")
+
+
+# -------------------------
+# Partials
+# -------------------------
+def partial_from_index(doc: Dict[str, Any]) -> Dict[str, int]:
+    cov, dis = doc["coverage"], doc["disclosure_observations"]
+    drift, pop = doc["drift_observations"], doc["popularity_observations"]
+    return {
+        "targets": cov["targets_monitored"],
+        "models": cov["models"],
+        "datasets": cov["datasets"],
+        "training_present": dis["training_section"]["present"],
+        "declared_datasets": dis["declared_datasets"]["with_declaration"],
+        "license_declared": dis["license"]["declared"],
+        "readme_ok": dis["readme_access"]["ok"],
+        "readme_not_found": dis["readme_access"]["not_found"],
+        "readme_forbidden": dis["readme_access"]["forbidden"],
+        "with_downloads": pop["targets_with_download_data"],
+        "gated": pop["gated_targets"],
+        "drift_events_30d": drift["events_30d"],
+        "drift_events_7d": drift["events_7d"],
+        "changed_targets_30d": drift["targets_with_change_30d"],
+    }
+
+
+def merge(partials: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    total = dict.fromkeys(COUNTS, 0)
+    for p in partials:
+        for k in COUNTS:
+            total[k] += p.get(k) or 0
+    return total
+
+
+def _pct(n: int, d: int) -> float:
+    return round(100 * n / d, 1) if d else 0.0
+
+
+def sections(c: Dict[str, int]) -> Dict[str, Any]:
+    """Published count/percentage sections from a partial (or a merge of partials)."""
+    n = c["targets"]
+    return {
+        "coverage": {"targets_monitored": n, "models": c["models"], "datasets": c["datasets"],
+                     "period_days": PERIOD_DAYS},
+        "disclosure_observations": {
+            "training_section": {"present": c["training_present"], "absent": n - c["training_present"],
+                                 "present_pct": _pct(c["training_present"], n)},
+            "declared_datasets": {"with_declaration": c["declared_datasets"],
+                                  "without_declaration": n - c["declared_datasets"],
+                                  "with_declaration_pct": _pct(c["declared_datasets"], n)},
+            "license": {"declared": c["license_declared"], "not_declared": n - c["license_declared"],
+                        "declared_pct": _pct(c["license_declared"], n)},
+            "readme_access": {"ok": c["readme_ok"], "not_found": c["readme_not_found"],
+                              "forbidden": c["readme_forbidden"], "ok_pct": _pct(c["readme_ok"], n)},
+        },
+        "drift_observations": {
+            "events_30d": c["drift_events_30d"], "events_7d": c["drift_events_7d"],
+            "targets_with_change_30d": c["changed_targets_30d"],
+            "avg_changes_per_changed_target": round(c["drift_events_30d"] / c["changed_targets_30d"], 2)
+            if c["changed_targets_30d"] else 0.0,
+        },
+        "popularity": {"targets_with_download_data": c["with_downloads"], "gated_targets": c["gated"],
+                       "gated_pct": _pct(c["gated"], n)},
+    }
+
+
+def range_sections(c: Dict[str, int], n_weeks: int) -> Dict[str, Any]:
+    """Sections for a merge of weekly partials: additive counts only."""
+    sec = sections(c)
+    n = c["targets"]
+    return {
+        "coverage": {"target_weeks": n, "model_weeks": c["models"], "dataset_weeks": c["datasets"]},
+        "disclosure_observations": sec["disclosure_observations"],
+        "drift_observations": {
+            "events": c["drift_events_7d"],
+            "avg_events_per_week": round(c["drift_events_7d"] / n_weeks, 2) if n_weeks else 0.0,
+        },
+        "popularity": {"target_weeks_with_download_data": c["with_downloads"], "gated_target_weeks": c["gated"],
+                       "gated_pct": _pct(c["gated"], n)},
+    }
+
+
+class PartialCache:
+    """week_id -> partial, refreshed only for index files whose (size, mtime_ns) moved."""
+
+    def __init__(self, path: Path = CACHE, reports: Path = REPORTS):
+        self.path = Path(path)
+        self.reports = Path(reports)
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.weeks: Dict[str, Dict[str, Any]] = json.load(f).get("weeks", {})
+        except FileNotFoundError:
+            self.weeks = {}
+        self.dirty = False
+
+    def get(self, week: str) -> Optional[Dict[str, int]]:
+        src = self.reports / f"disclosure_index_{week}.json"
+        try:
+            st = src.stat()
+        except FileNotFoundError:
+            return None
+        sig = [st.st_size, st.st_mtime_ns]
+        entry = self.weeks.get(week)
+        if entry is None or entry["src"] != sig:
+            with open(src, "r", encoding="utf-8") as f:
+                entry = self.weeks[week] = {"src": sig, "partial": partial_from_index(json.load(f))}
+            self.dirty = True
+        return entry["partial"]
+
+    def available(self) -> List[str]:
+        return sorted(p.name[len("disclosure_index_"):-len(".json")]
+                      for p in self.reports.glob("disclosure_index_*-W*.json"))
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"schema": "crovia.disclosure_partials.v1", "weeks": self.weeks}, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def trend(cache: PartialCache, lo: str, hi: str) -> Dict[str, Any]:
+    """Per-week sections plus the merged range; week ids compare as strings (zero-padded)."""
+    weeks = [w for w in cache.available() if lo <= w <= hi]
+    partials = {w: cache.get(w) for w in weeks}
+    return {"weeks": {w: sections(p) for w, p in partials.items()},
+            "range": {"from": lo, "to": hi, "n_weeks": len(weeks),
+                      **range_sections(merge(partials.values()), len(weeks))}}
+
+
+# -------------------------
+# One-pass rebuild
+# -------------------------
+def _iter_jsonl(path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _ts(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _declared_count(v) -> int:
+    if isinstance(v, list):
+        return len(v)
+    return 1 if v else 0
+
+
+def scan(snapshots: Iterable[Dict[str, Any]], events: Iterable[Dict[str, Any]], now: datetime):
+    """One pass over each input: (partial counts, top lists)."""
+    c = dict.fromkeys(COUNTS, 0)
+    orgs: Dict[str, List[int]] = {}
+    top_dl: List[tuple] = []
+    absent_dl: List[tuple] = []
+    for seq, s in enumerate(snapshots):
+        ex = s.get("extracted") or {}
+        tid = s.get("target_id") or ""
+        c["targets"] += 1
+        kind = s.get("tipo_target")
+        c["models"] += kind == "model"
+        c["datasets"] += kind == "dataset"
+        training = bool(ex.get("has_training_section"))
+        declared = _declared_count(ex.get("declared_datasets"))
+        licensed = bool(ex.get("license"))
+        access = (ex.get("readme_access") or "").lower()
+        c["training_present"] += training
+        c["declared_datasets"] += declared > 0
+        c["license_declared"] += licensed
+        c["readme_ok"] += access == "ok"
+        c["readme_not_found"] += access == "not_found"
+        c["readme_forbidden"] += access == "forbidden"
+        c["gated"] += bool((s.get("access") or {}).get("gated"))
+
+        o = orgs.setdefault(tid.split("/")[0], [0, 0, 0, 0])
+        o[0] += 1
+        o[1] += training
+        o[2] += declared > 0
+        o[3] += licensed
+
+        downloads = (s.get("popularity") or {}).get("downloads")
+        if downloads is None:
+            continue
+        c["with_downloads"] += 1
+        item = (downloads, -seq, {"target_id": tid, "tipo_target": kind, "downloads": downloads,
+                                  "training_section_presence": "PRESENT" if training else "ABSENT",
+                                  "declared_datasets_count": declared})
+        (heapq.heappush if len(top_dl) < TOP_DOWNLOADS else heapq.heappushpop)(top_dl, item)
+        if not training and downloads > HIGH_DOWNLOADS:
+            item = (downloads, -seq, {"target_id": tid, "tipo_target": kind, "downloads": downloads,
+                                      "readme_access": access.upper() or None})
+            (heapq.heappush if len(absent_dl) < TOP_DOWNLOADS else heapq.heappushpop)(absent_dl, item)
+
+    since_30, since_7 = now - timedelta(days=PERIOD_DAYS), now - timedelta(days=7)
+    movers: Counter = Counter()
+    recent: List[tuple] = []
+    for seq, e in enumerate(events):
+        t = _ts(e["observed_at"])
+        if t <= since_30 or t > now:
+            continue
+        c["drift_events_30d"] += 1
+        movers[e["target_id"]] += 1
+        if t > since_7:
+            c["drift_events_7d"] += 1
+            item = (t, -seq, {k: e.get(k) for k in ("target_id", "tipo_target", "observed_at",
+                                                    "prev_ddf_hash", "new_ddf_hash")})
+            (heapq.heappush if len(recent) < RECENT else heapq.heappushpop)(recent, item)
+    c["changed_targets_30d"] = len(movers)
+
+    ranked = lambda heap: [x[2] for x in sorted(heap, key=lambda x: (x[0], x[1]), reverse=True)]
+    tops = {
+        "top_movers_30d": [{"target_id": t, "change_count": n} for t, n in movers.most_common(TOP_MOVERS)],
+        "recent_changes_7d": ranked(recent),
+        "top_by_downloads": ranked(top_dl),
+        "high_download_training_absent": ranked(absent_dl),
+        "by_organization": [
+            {"organization": org, "targets_monitored": n, "training_section_present": tr,
+             "declared_datasets_present": dd, "license_present": li}
+            for org, (n, tr, dd, li) in sorted(orgs.items(), key=lambda kv: -kv[1][0])[:TOP_ORGS]
+        ],
+    }
+    return c, tops
+
+
+def fingerprint(doc: Dict[str, Any]) -> str:
+    body = {k: v for k, v in doc.items() if k != "index_fingerprint"}
+    return hashlib.sha256(json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+                          .encode("utf-8")).hexdigest()
+
+
+def render(counts: Dict[str, int], tops: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    y, w, _ = now.isocalendar()
+    sec = sections(counts)
+    doc = {
+        "schema": SCHEMA,
+        "generated_at": now.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        "week_id": f"{y}-W{w:02d}",
+        "note": NOTE,
+        "coverage": sec["coverage"],
+        "disclosure_observations": sec["disclosure_observations"],
+        "drift_observations": sec["drift_observations"],
+        "top_movers_30d": tops["top_movers_30d"],
+        "recent_changes_7d": tops["recent_changes_7d"],
+        "popularity_observations": {**sec["popularity"],
+                                    "top_by_downloads": tops["top_by_downloads"],
+                                    "high_download_training_absent": tops["high_download_training_absent"],
+                                    "note": POPULARITY_NOTE},
+        "by_organization": tops["by_organization"],
+    }
+    doc["index_fingerprint"] = fingerprint(doc)
+    return doc
+
+
+def _write_json(path: Path, doc: Dict[str, Any]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Disclosure index: weekly partials and one-pass rebuild")
+    ap.add_argument("--reports", default=str(REPORTS))
+    ap.add_argument("--cache", default=str(CACHE))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    t = sub.add_parser("trend", help="Per-week and merged sections over FROM:TO")
+    t.add_argument("range", help="e.g. 2026-W06:2026-W20")
+    b = sub.add_parser("build", help="Rebuild the current week's index from raw observations")
+    b.add_argument("--snapshots", default=str(SNAPSHOTS))
+    b.add_argument("--events", default=str(EVENTS))
+    b.add_argument("--now", default=None, help="Index instant (ISO-8601, default: current time)")
+    args = ap.parse_args()
+
+    cache = PartialCache(Path(args.cache), Path(args.reports))
+    if args.cmd == "trend":
+        lo, _, hi = args.range.partition(":")
+        out = trend(cache, lo, hi or lo)
+        cache.save()
+        print(json.dumps(out, indent=2))
+        print(f"[CROVIA] disclosure trend: {out['range']['n_weeks']} weeks", file=sys.stderr)
+        return 0
+
+    now = _ts(args.now) if args.now else datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    counts, tops = scan(_iter_jsonl(Path(args.snapshots)), _iter_jsonl(Path(args.events)), now)
+    doc = render(counts, tops, now)
+    reports = Path(args.reports)
+    reports.mkdir(parents=True, exist_ok=True)
+    _write_json(reports / f"disclosure_index_{doc['week_id']}.json", doc)
+    _write_json(reports / "disclosure_index_latest.json", doc)
+    cache.get(doc["week_id"])
+    cache.save()
+    print(f"[CROVIA] disclosure index {doc['week_id']}: {counts['targets']} targets, "
+          f"{counts['drift_events_30d']} drift events (30d)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,50 +1,158 @@
 #!/usr/bin/env python3
+"""Harvest HF models + datasets into the canon watchlist.
+
+Streams the HF listing API newest-modified first, one page at a time:
+- each page is deduped and written to the watchlist as one batch (WatchlistStore)
+- the next-page cursor (Link: rel="next") is persisted after every page, so an
+  interrupted or --max-pages bounded pass resumes where it stopped
+- a completed pass records the newest lastModified seen; the next pass stops as
+  soon as it reaches entries not modified since then
+
+Usage:
+  python open/forensic/harvest_hf_targets.py                    # models + datasets
+  python open/forensic/harvest_hf_targets.py --kinds dataset --max-pages 5
+  python open/forensic/harvest_hf_targets.py --base-url http://127.0.0.1:8000   # local fake listing
+"""
+
+from __future__ import annotations
+
+import argparse
 import json
-from pathlib import Path
+import os
 from datetime import datetime, timezone
-from huggingface_hub import HfApi
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from hf_client import HF_BASE_URL, HFClient
+from watchlist_store import WatchlistStore
 
 WATCHLIST = Path("open/canon/targets_watchlist.jsonl")
-WATCHLIST.parent.mkdir(parents=True, exist_ok=True)
-
-api = HfApi()
-
-# How many to fetch (tunable)
-LIMIT = 120
-
-# Pull public datasets from HF (broad, neutral)
-datasets = api.list_datasets(limit=LIMIT)
-
-# Load existing hints to avoid duplicates
-existing = set()
-if WATCHLIST.exists():
-    with WATCHLIST.open("r", encoding="utf-8") as f:
-        for line in f:
-            try:
-                o = json.loads(line)
-                existing.add(o.get("project_hint"))
-            except Exception:
-                pass
-
-now = datetime.now(timezone.utc).isoformat()
-added = 0
-
-with WATCHLIST.open("a", encoding="utf-8") as f:
-    for d in datasets:
-        did = getattr(d, "id", None)
-        if not did:
-            continue
-        hint = f"hf:dataset:{did}"
-        if hint in existing:
-            continue
-        row = {
-            "source": "hf",
-            "ref": "datasets/list",
-            "project_hint": hint,
-            "note": "public dataset"
-        }
-        f.write(json.dumps(row, ensure_ascii=False) + "\n")
-        existing.add(hint)
-        added += 1
-
-print(f"[CROVIA] hf targets appended: {added}")
+CURSOR = Path(".cache/harvest_hf_cursor.json")
+
+PAGE_SIZE = 1000
+KIND_PATHS = {"model": "models", "dataset": "datasets"}
+
+
+def load_cursor(path: Path) -> Dict[str, Dict[str, Any]]:
+    if path.exists():
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_cursor(path: Path, cursor: Dict[str, Dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(cursor, f, indent=2)
+    os.replace(tmp, path)
+
+
+def first_page_url(client: HFClient, kind: str, page_size: int) -> str:
+    return (
+        f"{client.base_url}/api/{KIND_PATHS[kind]}"
+        f"?sort=lastModified&direction=-1&limit={page_size}&expand=lastModified"
+    )
+
+
+def fetch_page(client: HFClient, url: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    r, _ = client.get(url)
+    r.raise_for_status()
+    return r.json(), (r.links.get("next") or {}).get("url")
+
+
+def watchlist_row(kind: str, item_id: str) -> Dict[str, Any]:
+    return {
+        "source": "hf",
+        "ref": f"{KIND_PATHS[kind]}/list",
+        "project_hint": f"hf:{kind}:{item_id}",
+        "note": f"public {kind}",
+    }
+
+
+def harvest_kind(
+    client: HFClient,
+    store: WatchlistStore,
+    kind: str,
+    state: Dict[str, Any],
+    save,
+    page_size: int = PAGE_SIZE,
+    max_pages: int = 0,
+) -> int:
+    """Run (or continue) one listing pass for kind. Returns rows added.
+
+    state keys:
+      since        newest lastModified of the last completed pass
+      pass_newest  newest lastModified seen by the unfinished pass
+      next_url     page the unfinished pass resumes from
+    """
+    since = state.get("since")
+    url = state.get("next_url") or first_page_url(client, kind, page_size)
+    added = pages = 0
+
+    while url:
+        items, next_url = fetch_page(client, url)
+        rows = []
+        reached_since = False
+        for it in items:
+            lm = it.get("lastModified")
+            if since and lm and lm <= since:
+                reached_since = True
+                break
+            if lm and lm > (state.get("pass_newest") or ""):
+                state["pass_newest"] = lm
+            if it.get("id"):
+                rows.append(watchlist_row(kind, it["id"]))
+
+        added += len(store.add_targets(rows))
+        pages += 1
+        url = None if reached_since else next_url
+        state["next_url"] = url
+        save()
+        if url and max_pages and pages >= max_pages:
+            break
+
+    if not url:
+        state["since"] = state.pop("pass_newest", None) or since
+        state["next_url"] = None
+        state["completed_at"] = datetime.now(timezone.utc).isoformat()
+        save()
+    print(f"[CROVIA] hf {kind}s: pages={pages} added={added} complete={not url}")
+    return added
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Harvest HF models/datasets into the canon watchlist")
+    ap.add_argument("--kinds", nargs="+", choices=sorted(KIND_PATHS), default=["model", "dataset"])
+    ap.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    ap.add_argument("--max-pages", type=int, default=0, help="Pages per kind this run (0 = until done)")
+    ap.add_argument("--base-url", default=HF_BASE_URL, help="Listing endpoint (local fake for tests)")
+    ap.add_argument("--watchlist", default=str(WATCHLIST))
+    ap.add_argument("--cursor", default=str(CURSOR))
+    ap.add_argument("--db", default=None, help="Watchlist index (default: watchlist_store.DB)")
+    args = ap.parse_args()
+
+    cursor_path = Path(args.cursor)
+    cursor = load_cursor(cursor_path)
+    client = HFClient(args.base_url)
+
+    store_kwargs = {"watchlist": Path(args.watchlist)}
+    if args.db:
+        store_kwargs["db"] = Path(args.db)
+
+    total = 0
+    with WatchlistStore(**store_kwargs) as store:
+        for kind in args.kinds:
+            state = cursor.setdefault(kind, {})
+            total += harvest_kind(
+                client, store, kind, state,
+                save=lambda: save_cursor(cursor_path, cursor),
+                page_size=args.page_size, max_pages=args.max_pages,
+            )
+
+    print(f"[CROVIA] hf targets appended: {total}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Pooled HuggingFace API client for the forensic probes.
+
+- One shared requests.Session (keep-alive connection pool)
+- Per-host rate limit (requests/second)
+- Retry with exponential backoff on 429 / 5xx (Retry-After honoured)
+- Bounded-concurrency fetch stage that yields results in input order
+- Optional on-disk conditional-request cache (ETag / Last-Modified + content
+  hash), so unchanged cards cost a 304 and callers can reuse earlier results
+
+`base_url` can point at a local HTTP stand-in instead of huggingface.co
+(it only has to serve /api/models/<id> and /api/datasets/<id>).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HF_BASE_URL = "https://huggingface.co"
+HF_TIMEOUT_SECS = 15
+HF_HEADERS = {
+    "User-Agent": "CroviaOracleProbe/1.0 (evidence-first; contact: croviatrust.com)",
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_BACKOFF_SECS = 60.0
+
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least 1/rate seconds apart."""
+
+    def __init__(self, rate_per_sec: float):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._next: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class HTTPCache:
+    """On-disk response cache keyed by URL.
+
+    One JSON file per URL: validators (etag, last_modified), content_sha256,
+    the response body and an `extra` dict callers may attach derived results
+    to (dropped whenever the content changes).
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, url: str) -> Path:
+        h = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.root / h[:2] / f"{h}.json"
+
+    def load(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self._path(url).open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, url: str, entry: Dict[str, Any]) -> None:
+        path = self._path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def store(
+        self,
+        url: str,
+        body: str,
+        content_sha256: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self._write(url, {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_sha256": content_sha256,
+            "stored_at": utc_now_iso(),
+            "body": body,
+            "extra": extra or {},
+        })
+
+    def attach(self, url: str, key: str, value: Any) -> None:
+        """Attach a derived result to the cached entry for url (if any)."""
+        entry = self.load(url)
+        if entry is None:
+            return
+        entry.setdefault("extra", {})[key] = value
+        self._write(url, entry)
+
+    def extra(self, url: str, key: str) -> Any:
+        entry = self.load(url)
+        return (entry or {}).get("extra", {}).get(key)
+
+
+class HFClient:
+    """Thread-safe HF API fetcher over a pooled session."""
+
+    def __init__(
+        self,
+        base_url: str = HF_BASE_URL,
+        *,
+        timeout: float = HF_TIMEOUT_SECS,
+        rate_per_host: float = 8.0,
+        max_retries: int = 4,
+        backoff: float = 0.5,
+        pool_size: int = 16,
+        session: Optional[requests.Session] = None,
+        cache: Optional[HTTPCache] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.limiter = HostRateLimiter(rate_per_host)
+        self.cache = cache
+
+        self.session = session or requests.Session()
+        self.session.headers.update(HF_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def api_url(self, kind: str, target_id: str) -> str:
+        if kind == "model":
+            return f"{self.base_url}/api/models/{target_id}"
+        if kind == "dataset":
+            return f"{self.base_url}/api/datasets/{target_id}"
+        raise ValueError(f"Unsupported kind: {kind}")
+
+    def _retry_delay(self, attempt: int, resp: Optional[requests.Response]) -> float:
+        if resp is not None:
+            ra = resp.headers.get("Retry-After")
+            if ra and ra.strip().isdigit():
+                return min(float(ra), MAX_BACKOFF_SECS)
+        return min(self.backoff * (2 ** attempt), MAX_BACKOFF_SECS)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[requests.Response, int]:
+        """GET with rate limiting and retries. Returns (response, attempts)."""
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            self.limiter.wait(host)
+            try:
+                r = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._retry_delay(attempt, None))
+                attempt += 1
+                continue
+            if r.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                time.sleep(self._retry_delay(attempt, r))
+                attempt += 1
+                continue
+            return r, attempt + 1
+
+    def fetch(self, kind: str, target_id: str) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Fetch HF API JSON.
+
+        With a cache, meta["cache"] is one of:
+          miss          - first fetch of this URL
+          changed       - 200 with a different content hash
+          unchanged     - 200 with the same content hash (no validators honoured)
+          not_modified  - 304, body served from the cache
+
+        Returns:
+          (json_or_none, meta)
+        """
+        url = self.api_url(kind, target_id)
+        meta: Dict[str, Any] = {"url": url}
+
+        try:
+            entry = self.cache.load(url) if self.cache else None
+            headers = {}
+            if entry and entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry and entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+            r, attempts = self.get(url, headers=headers or None)
+            meta["http_status"] = r.status_code
+            meta["fetched_at"] = utc_now_iso()
+            if attempts > 1:
+                meta["attempts"] = attempts
+
+            if r.status_code == 304 and entry:
+                meta["cache"] = "not_modified"
+                meta["content_sha256"] = entry["content_sha256"]
+                return json.loads(entry["body"]), meta
+            if r.status_code != 200:
+                meta["error"] = f"HTTP {r.status_code}"
+                return None, meta
+
+            digest = hashlib.sha256(r.content).hexdigest()
+            meta["content_sha256"] = digest
+            if self.cache:
+                if entry is None:
+                    meta["cache"] = "miss"
+                elif entry.get("content_sha256") == digest:
+                    meta["cache"] = "unchanged"
+                else:
+                    meta["cache"] = "changed"
+                extra = entry.get("extra") if meta["cache"] == "unchanged" else None
+                self.cache.store(
+                    url, r.text, digest,
+                    r.headers.get("ETag"), r.headers.get("Last-Modified"), extra,
+                )
+            return r.json(), meta
+        except Exception as e:
+            meta["error"] = f"{type(e).__name__}: {e}"
+            return None, meta
+
+    def fetch_many(
+        self, items: Iterable[Tuple[str, str]], workers: int = 8
+    ) -> Iterator[Tuple[str, str, Optional[Dict[str, Any]], Dict[str, Any]]]:
+        """Fetch (kind, target_id) pairs concurrently.
+
+        Yields (kind, target_id, json_or_none, meta) in the order of `items`,
+        with at most 2 * workers requests queued ahead of the consumer.
+        """
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+            pending = deque()
+            for kind, tid in items:
+                pending.append((kind, tid, ex.submit(self.fetch, kind, tid)))
+                if len(pending) >= 2 * max(1, workers):
+                    k, t, fut = pending.popleft()
+                    yield (k, t, *fut.result())
+            while pending:
+                k, t, fut = pending.popleft()
+                yield (k, t, *fut.result())
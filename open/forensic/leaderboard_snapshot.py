@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+leaderboard_snapshot.py — weekly continuity leaderboard from the observation ledger.
+
+Writes leaderboard/<YYYY-Www>/{top_silent.csv, vendors.csv, snapshot.json,
+README.md} in the published format, from one streaming pass over a JSONL
+ledger (axiom_ledger.jsonl: one observation per line with target_id, a
+timestamp and an optional axiom type):
+
+  first_seen     earliest absence (AX.ABS, or untyped) observation of a target
+  last_seen      latest observation of any type
+  silence_days   whole days from first_seen to the snapshot instant
+  real target    an "<org>/<name>" id
+
+Week W is taken at its Monday 02:13 UTC (the publishing slot); only ledger
+lines up to that instant count. Per-target state is the only O(targets)
+memory. Medians and means come from an integer histogram of silence days
+(exact, O(distinct days)); the top list is a bounded heap ordered by
+silence, then ledger order; vendors.csv rolls up the top list per
+vendor (org) with the same histogram median (upper median, as published).
+
+Past weeks are never edited: an existing week folder is left alone unless
+--force. Backfilling several weeks runs one process per week.
+
+Usage:
+  python open/forensic/leaderboard_snapshot.py axiom_ledger.jsonl                 # current week
+  python open/forensic/leaderboard_snapshot.py axiom_ledger.jsonl --week 2026-W31
+  python open/forensic/leaderboard_snapshot.py axiom_ledger.jsonl --backfill 2026-W19:2026-W34 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import heapq
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+LEADERBOARD = REPO_ROOT / "leaderboard"
+
+TOP_K = 100
+PUBLISH_AT = time(2, 13, tzinfo=timezone.utc)
+TARGET_FIELDS = ("target_id", "target")
+TS_FIELDS = ("ts", "observed_at", "timestamp", "created_at")
+TYPE_FIELDS = ("axiom_type", "type", "kind")
+ARCHIVE = "https://croviatrust.com/registry/data/leaderboard/"
+LIVE = "https://croviatrust.com/registry/"
+
+
+# -------------------------
+# Time / ids
+# -------------------------
+def week_instant(label: str) -> datetime:
+    year, week = label.split("-W")
+    return datetime.combine(date.fromisocalendar(int(year), int(week), 1), PUBLISH_AT)
+
+
+def week_label(dt: datetime) -> str:
+    y, w, _ = dt.isocalendar()
+    return f"{y}-W{w:02d}"
+
+
+def week_range(spec: str) -> List[str]:
+    lo, _, hi = spec.partition(":")
+    start, end = week_instant(lo), week_instant(hi or lo)
+    out, t = [], start
+    while t <= end:
+        out.append(week_label(t))
+        t += timedelta(days=7)
+    return out
+
+
+def parse_ts(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def iso_z(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def is_real(target_id: str) -> bool:
+    org, sep, name = target_id.partition("/")
+    return bool(sep and org and name and "/" not in name)
+
+
+def _first(row: Dict[str, Any], fields) -> Any:
+    for f in fields:
+        if row.get(f) is not None:
+            return row[f]
+    return None
+
+
+# -------------------------
+# Streaming statistics
+# -------------------------
+class Histogram:
+    """Exact quantiles over small non-negative integers."""
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.n = 0
+        self.total = 0
+
+    def add(self, v: int) -> None:
+        self.counts[v] = self.counts.get(v, 0) + 1
+        self.n += 1
+        self.total += v
+
+    def quantile_index(self, k: int) -> int:
+        """The k-th smallest value (0-based)."""
+        seen = 0
+        for v in sorted(self.counts):
+            seen += self.counts[v]
+            if seen > k:
+                return v
+        raise IndexError(k)
+
+    def median(self) -> Optional[int]:
+        return self.quantile_index(self.n // 2) if self.n else None
+
+    def mean(self) -> Optional[int]:
+        return self.total // self.n if self.n else None
+
+    def max(self) -> Optional[int]:
+        return max(self.counts) if self.counts else None
+
+
+def scan_ledger(path: Path, as_of: datetime):
+    """One pass: target -> [seq, first_seen, last_seen] for lines at or before as_of."""
+    targets: Dict[str, List[Any]] = {}
+    lines = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            tid, ts = _first(row, TARGET_FIELDS), _first(row, TS_FIELDS)
+            if not tid or not ts:
+                continue
+            t = parse_ts(ts)
+            if t > as_of:
+                continue
+            lines += 1
+            kind = _first(row, TYPE_FIELDS)
+            absence = kind is None or "ABS" in str(kind).upper()
+            st = targets.get(tid)
+            if st is None:
+                st = targets[tid] = [len(targets), None, t]
+            if absence and (st[1] is None or t < st[1]):
+                st[1] = t
+            if t > st[2]:
+                st[2] = t
+    return targets, lines
+
+
+def build(targets: Dict[str, List[Any]], as_of: datetime, k: int = TOP_K):
+    hist = Histogram()
+    heap: List[Tuple[int, int, str]] = []   # (silence, -seq, target): heap[0] is the weakest kept
+    for tid, (seq, first, _) in targets.items():
+        if first is None or not is_real(tid):
+            continue
+        silence = int((as_of - first).total_seconds() // 86400)
+        hist.add(silence)
+        item = (silence, -seq, tid)
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+    top = []
+    for rank, (silence, _, tid) in enumerate(sorted(heap, reverse=True), 1):
+        _, first, last = targets[tid]
+        top.append({"rank": rank, "target_id": tid, "silence_days": silence,
+                    "first_seen": iso_z(first), "last_seen": iso_z(last)})
+    return hist, top
+
+
+def vendor_rows(top: List[Dict[str, Any]]) -> List[List[Any]]:
+    vendors: Dict[str, Histogram] = {}
+    for r in top:
+        vendors.setdefault(r["target_id"].split("/")[0], Histogram()).add(int(r["silence_days"]))
+    order = {v: i for i, v in enumerate(vendors)}
+    ranked = sorted(vendors.items(), key=lambda kv: (-kv[1].max(), -kv[1].n, order[kv[0]]))
+    return [[v, h.n, h.median(), h.max()] for v, h in ranked]
+
+
+def to_csv(header: List[str], rows: Iterable[List[Any]]) -> bytes:
+    buf = io.StringIO()
+    w = csv.writer(buf)   # \r\n line endings, as published
+    w.writerow(header)
+    w.writerows(rows)
+    return buf.getvalue().encode("utf-8")
+
+
+# -------------------------
+# Artifacts
+# -------------------------
+README_TEMPLATE = """# Crovia AI Continuity Leaderboard — {label}
+
+A frozen weekly snapshot of the longest-silent AI models on the public registry.
+
+This dataset is **append-only** and **week-stamped**: every Monday at 02:00 UTC a new
+folder appears with the state of the world at that moment. Past weeks are never edited.
+
+## What is "silence"?
+
+A model is *silent* when no new public observation has been recorded since its first
+documented absence on the [Crovia registry](https://croviatrust.com/registry/).
+Each row in `top_silent.csv` corresponds to a signed AX.ABS axiom in the public ledger.
+
+## This week's headline
+
+- **Real targets tracked:** {n:,}
+- **Cumulative target-time observed:** {total:,} target-days
+- **Median silence per target:** {median} days
+- **Longest-silent target:** `{top_id}` — {top_days} days, since {top_since}
+
+## Files
+
+- `top_silent.csv` — ranked top-100 silent models (rank, target_id, silence_days, first_seen, last_seen)
+- `vendors.csv` — per-vendor rollup
+- `snapshot.json` — machine manifest with SHA-256 of each CSV
+
+## How to verify
+
+Every entry corresponds to one AX.ABS axiom in `axiom_ledger.jsonl`, which is signed and
+optionally anchored to OpenTimestamps. To verify a single line:
+
+```python
+from huggingface_hub import hf_hub_download
+import csv
+fp = hf_hub_download("crovia/continuity-leaderboard", "{label}/top_silent.csv", repo_type="dataset")
+for row in csv.DictReader(open(fp)):
+    print(row["target_id"], row["silence_days"])
+```
+
+Or directly:
+
+```bash
+curl https://croviatrust.com/registry/data/leaderboard/{label}/snapshot.json | jq
+```
+
+## Live data
+
+This snapshot is a frozen view. For real-time data:
+
+- **Live registry:** https://croviatrust.com/registry/
+- **Per-model dossier:** https://croviatrust.com/m/&lt;org&gt;/&lt;model&gt;/
+- **Embed widget:** https://croviatrust.com/embed/
+
+## License
+
+Data: **CC-BY-4.0**. Attribute as: "Crovia continuity leaderboard, week {label}".
+
+---
+
+*Generated automatically. No human curation. Methodology: https://croviatrust.com/registry/api/*
+"""
+
+
+def render_week(targets: Dict[str, List[Any]], lines: int, label: str, k: int = TOP_K) -> Dict[str, bytes]:
+    as_of = week_instant(label)
+    hist, top = build(targets, as_of, k)
+    top_csv = to_csv(["rank", "target_id", "silence_days", "first_seen_iso", "last_seen_iso"],
+                     ([r["rank"], r["target_id"], r["silence_days"], r["first_seen"], r["last_seen"]] for r in top))
+    vendors_csv = to_csv(["vendor", "n_silent_models_in_top100", "median_silence_days", "max_silence_days"],
+                         vendor_rows(top))
+    lead = top[0] if top else None
+    year, week, _ = as_of.isocalendar()
+    snapshot = {
+        "schema": "crovia.leaderboard.v1",
+        "label": label,
+        "generated_at": as_of.isoformat(),
+        "iso_year": year,
+        "iso_week": week,
+        "n_real_targets": hist.n,
+        "total_silence_days": hist.total,
+        "median_silence_days": hist.median(),
+        "mean_silence_days": hist.mean(),
+        "top_silent": {"target_id": lead["target_id"], "first_seen": lead["first_seen"],
+                       "last_seen": lead["last_seen"], "silence_days": lead["silence_days"]} if lead else None,
+        "envelope_total": None,
+        "ledger_lines_at_snapshot": lines,
+        "files": ["top_silent.csv", "vendors.csv", "snapshot.json", "README.md"],
+        "archive_url": f"{ARCHIVE}{label}/",
+        "live_registry": LIVE,
+        "license": "CC-BY-4.0",
+        "sha256": {"top_silent.csv": hashlib.sha256(top_csv).hexdigest(),
+                   "vendors.csv": hashlib.sha256(vendors_csv).hexdigest()},
+    }
+    readme = README_TEMPLATE.format(
+        label=label, n=hist.n, total=hist.total, median=hist.median(),
+        top_id=lead["target_id"] if lead else "-", top_days=lead["silence_days"] if lead else 0,
+        top_since=lead["first_seen"][:10] if lead else "-",
+    )
+    return {"top_silent.csv": top_csv, "vendors.csv": vendors_csv,
+            "snapshot.json": json.dumps(snapshot, indent=2).encode("utf-8"),
+            "README.md": readme.encode("utf-8")}
+
+
+def generate_week(ledger: Path, label: str, out_root: Path = LEADERBOARD, force: bool = False,
+                  k: int = TOP_K) -> Tuple[str, str]:
+    """(label, status) where status is "written" or "exists"."""
+    out = Path(out_root) / label
+    if out.exists() and not force:
+        return label, "exists"
+    targets, lines = scan_ledger(Path(ledger), week_instant(label))
+    files = render_week(targets, lines, label, k)
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.mkdir(parents=True, exist_ok=True)
+    for name, data in files.items():
+        (tmp / name).write_bytes(data)
+    if out.exists():
+        for name in files:
+            os.replace(tmp / name, out / name)
+        tmp.rmdir()
+    else:
+        os.replace(tmp, out)
+    return label, "written"
+
+
+def _generate_args(args):
+    return generate_week(*args)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Weekly continuity leaderboard snapshot")
+    ap.add_argument("ledger", help="Observation ledger JSONL (axiom_ledger.jsonl)")
+    ap.add_argument("--week", default=None, help="YYYY-Www (default: the current ISO week)")
+    ap.add_argument("--backfill", default=None, metavar="FROM:TO", help="Every week in a range, e.g. 2026-W19:2026-W34")
+    ap.add_argument("--out", default=str(LEADERBOARD))
+    ap.add_argument("--top", type=int, default=TOP_K)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--force", action="store_true", help="Rewrite weeks that already exist")
+    args = ap.parse_args()
+
+    labels = week_range(args.backfill) if args.backfill else [args.week or week_label(datetime.now(timezone.utc))]
+    jobs = [(Path(args.ledger), label, Path(args.out), args.force, args.top) for label in labels]
+    if args.workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(jobs))) as ex:
+            results = list(ex.map(_generate_args, jobs))
+    else:
+        results = [_generate_args(j) for j in jobs]
+
+    for label, status in results:
+        print(f"[CROVIA] leaderboard {label}: {status}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
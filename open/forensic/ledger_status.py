@@ -1,45 +1,162 @@
 #!/usr/bin/env python3
+"""
+ledger_status.py — public ledger status (targets observed, recent events).
+
+Incremental: a small state file keeps, per input, the byte offset already
+consumed, a fingerprint of those bytes, and derived counters, so each run only
+parses lines appended since the previous run:
+- absence receipts -> event times bucketed per UTC hour (pruned after 30 days)
+- presence signals -> set of distinct project_keys
+
+The fingerprint hashes the first and the last FINGERPRINT_BYTES of the
+consumed range, so checking it costs the same however large the file grows.
+It is content-only: a file re-copied with the same bytes plus new lines
+(sync_from_server.sh cp -f) stays incremental. A shrunk file, or one whose
+head or last consumed bytes changed (e.g. a rolling export that dropped old
+rows), is rescanned; for absence receipts only events at or after the
+rewritten file's first event are replaced, so older ones survive the rolling
+7d export. An edit strictly inside the consumed range is not detected.
+
+Windows exposed: 1h / 24h / 7d / 30d. Each hour bucket keeps its events'
+microsecond offsets, sorted, so whole hours are counted by length and the
+hour holding the window edge by bisection: a window counts exactly the
+events with now - observed_at < span, as the original full scan did.
+"""
+import hashlib
 import json
+import os
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
 PRESENCE = Path("open/signal/presence_latest.jsonl")
 ABSENCE = Path("open/forensic/absence_receipts_7d.jsonl")
 OUT = Path("open/signal/ledger_status_latest.json")
+STATE = Path(".cache/ledger_status_state.json")
+
+FINGERPRINT_BYTES = 4096
+RETAIN = timedelta(days=30)
+WINDOWS = {"1h": timedelta(hours=1), "24h": timedelta(hours=24), "7d": timedelta(days=7), "30d": timedelta(days=30)}
+
+
+def _fingerprint(f, offset: int) -> str:
+    """sha256 over the head and tail of the first offset bytes of f."""
+    n = min(FINGERPRINT_BYTES, offset)
+    f.seek(0)
+    head = f.read(n)
+    f.seek(offset - n)
+    return hashlib.sha256(head + f.read(n)).hexdigest()
+
+
+def read_new(path: Path, st: dict):
+    """Yield rows appended to path since st["offset"]; sets st["rescan"] on rewrite."""
+    st["rescan"] = False
+    if not path.exists():
+        return
+    offset = st.get("offset", 0)
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size < offset or _fingerprint(f, offset) != st.get("fingerprint"):
+            offset = 0
+            st["rescan"] = True
+        f.seek(offset)
+
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            offset += len(raw)
+            yield json.loads(raw)
+
+        st["offset"] = offset
+        st["fingerprint"] = _fingerprint(f, offset)
+
+
+def split_ts(ts) -> tuple:
+    """(UTC hour key, microseconds into that hour)."""
+    dt = ts if isinstance(ts, datetime) else datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    dt = dt.astimezone(timezone.utc)
+    return dt.strftime("%Y-%m-%dT%H"), (dt.minute * 60 + dt.second) * 10**6 + dt.microsecond
+
+
+def update_absence(st: dict, now: datetime, path: Path = ABSENCE) -> None:
+    buckets = st.setdefault("buckets", {})
+    fresh = {}
+    for o in read_new(path, st):
+        h, us = split_ts(o["observed_at"])
+        fresh.setdefault(h, []).append(us)
+
+    if st.pop("rescan") and fresh:
+        first_h, first_us = min((h, min(v)) for h, v in fresh.items())
+        buckets = {h: v for h, v in buckets.items() if h <= first_h}
+        if first_h in buckets:
+            buckets[first_h] = buckets[first_h][:bisect_left(buckets[first_h], first_us)]
+    for h, v in fresh.items():
+        buckets[h] = sorted(buckets.get(h, []) + v)
+
+    cutoff = (now - RETAIN).strftime("%Y-%m-%dT%H")
+    st["buckets"] = {h: v for h, v in buckets.items() if h >= cutoff and v}
+
+
+def update_presence(st: dict, path: Path = PRESENCE) -> None:
+    keys = set(st.get("keys", []))
+    rows = list(read_new(path, st))
+    if st.pop("rescan"):
+        keys = set()
+    keys.update(o["project_key"] for o in rows)
+    st["keys"] = sorted(keys)
+
+
+def window_counts(buckets: dict, now: datetime) -> dict:
+    """Events with now - observed_at < span, per window."""
+    out = {}
+    for name, span in WINDOWS.items():
+        edge_h, edge_us = split_ts(now - span)
+        n = 0
+        for h, v in buckets.items():
+            if h > edge_h:
+                n += len(v)
+            elif h == edge_h:
+                n += len(v) - bisect_right(v, edge_us)
+        out[name] = n
+    return out
+
+
+def main():
+    now = datetime.now(timezone.utc)
+
+    state = {}
+    if STATE.exists():
+        with STATE.open("r", encoding="utf-8") as f:
+            state = json.load(f)
+
+    update_absence(state.setdefault("absence", {}), now)
+    update_presence(state.setdefault("presence", {}))
+
+    windows = window_counts(state["absence"]["buckets"], now)
+    coverage = len(state["presence"]["keys"])
+    level = "LOW" if coverage < 25 else "MEDIUM" if coverage < 100 else "HIGH"
+
+    status = {
+        "schema": "crovia.open.ledger_status.v1",
+        "ts": now.isoformat(),
+        "targets_observed": coverage,
+        "events_24h": windows["24h"],
+        "events": windows,
+        "coverage_level": level,
+        "note": "Silence is now observed under high coverage conditions."
+    }
+
+    OUT.parent.mkdir(parents=True, exist_ok=True)
+    with OUT.open("w", encoding="utf-8") as f:
+        json.dump(status, f, indent=2)
+
+    STATE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE.with_name(STATE.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(state, f)
+    tmp.replace(STATE)
+
+    print("[CROVIA] ledger status updated")
+
 
-now = datetime.now(timezone.utc)
-
-targets = set()
-events_24h = 0
-
-if PRESENCE.exists():
-    with PRESENCE.open("r", encoding="utf-8") as f:
-        for line in f:
-            o = json.loads(line)
-            targets.add(o["project_key"])
-
-if ABSENCE.exists():
-    with ABSENCE.open("r", encoding="utf-8") as f:
-        for line in f:
-            o = json.loads(line)
-            ts = datetime.fromisoformat(o["observed_at"].replace("Z","+00:00"))
-            if now - ts < timedelta(hours=24):
-                events_24h += 1
-
-coverage = len(targets)
-level = "LOW" if coverage < 25 else "MEDIUM" if coverage < 100 else "HIGH"
-
-status = {
-    "schema": "crovia.open.ledger_status.v1",
-    "ts": now.isoformat(),
-    "targets_observed": coverage,
-    "events_24h": events_24h,
-    "coverage_level": level,
-    "note": "Silence is now observed under high coverage conditions."
-}
-
-OUT.parent.mkdir(parents=True, exist_ok=True)
-with OUT.open("w", encoding="utf-8") as f:
-    json.dump(status, f, indent=2)
-
-print("[CROVIA] ledger status updated")
+if __name__ == "__main__":
+    main()
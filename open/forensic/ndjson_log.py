@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""Append-only NDJSON log with rotation into gzip segments.
+
+Layout for a log at dir/name.jsonl:
+  dir/name.jsonl                 active segment (plain NDJSON, appended)
+  dir/name.000001.jsonl.gz       rotated segments, one gzip member per block
+  dir/name.segments.jsonl        segment index, one line per rotated segment:
+      {"segment", "first_ts", "last_ts", "lines", "bytes", "sha256",
+       "blocks": [{"offset", "first_ts", "line"}]}
+
+Each block is an independent gzip member starting at "offset" (compressed
+bytes), so a reader can seek straight to the block covering a timestamp and
+decompress from there instead of scanning every older line.
+
+Rotation happens before a write when the active segment is over max_bytes or
+its first record is from an earlier UTC day (rotate_daily). The active file is
+first renamed to name.jsonl.rotating, so an interrupted rotation is finished
+on the next open. Single writer per log.
+
+Usage:
+  python open/forensic/ndjson_log.py rotate spider/raw/presence/github_presence_raw.jsonl
+  python open/forensic/ndjson_log.py read LOG --since 2026-01-01 --until 2026-01-02
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+BLOCK_LINES = 1024
+BUFFER_BYTES = 1 << 16
+
+
+def _record_ts(line: bytes, ts_field: str) -> Optional[str]:
+    try:
+        ts = json.loads(line).get(ts_field)
+    except ValueError:
+        return None
+    return ts if isinstance(ts, str) else None
+
+
+def _first_ts(path: Path, ts_field: str) -> Optional[str]:
+    with path.open("rb") as f:
+        for line in f:
+            ts = _record_ts(line, ts_field)
+            if ts:
+                return ts
+    return None
+
+
+class NDJSONLog:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_bytes: int = 0,
+        rotate_daily: bool = False,
+        fsync_every: int = 0,
+        ts_field: str = "ts",
+        block_lines: int = BLOCK_LINES,
+        buffer_bytes: int = BUFFER_BYTES,
+        ensure_ascii: bool = False,
+    ):
+        """max_bytes / rotate_daily: 0 / False disable that rotation trigger.
+        fsync_every: records between fsyncs (0 = only on close)."""
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.fsync_every = fsync_every
+        self.ts_field = ts_field
+        self.block_lines = block_lines
+        self.buffer_bytes = buffer_bytes
+        self.ensure_ascii = ensure_ascii
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.rotating_path.exists():
+            self._finish_rotation()
+        self._open()
+
+    # ---------
+    # paths
+    # ---------
+
+    @property
+    def stem(self) -> str:
+        return self.path.name[:-len(".jsonl")] if self.path.name.endswith(".jsonl") else self.path.name
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_name(f"{self.stem}.segments.jsonl")
+
+    @property
+    def rotating_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".rotating")
+
+    def segment_path(self, seq: int) -> Path:
+        return self.path.with_name(f"{self.stem}.{seq:06d}.jsonl.gz")
+
+    # ---------
+    # writing
+    # ---------
+
+    def _open(self) -> None:
+        self.f = self.path.open("ab", buffering=self.buffer_bytes)
+        self.size = self.f.tell()
+        self.day = None
+        if self.size and self.rotate_daily:
+            ts = _first_ts(self.path, self.ts_field)
+            self.day = ts[:10] if ts else None
+        self.unsynced = 0
+
+    def write(self, rec: Dict[str, Any]) -> None:
+        line = (json.dumps(rec, ensure_ascii=self.ensure_ascii) + "\n").encode("utf-8")
+        ts = rec.get(self.ts_field)
+        day = ts[:10] if isinstance(ts, str) else None
+
+        if self.size and (
+            (self.max_bytes and self.size + len(line) > self.max_bytes)
+            or (self.rotate_daily and day and self.day and day != self.day)
+        ):
+            self.rotate()
+        if not self.size:
+            self.day = day
+
+        self.f.write(line)
+        self.size += len(line)
+        self.unsynced += 1
+        if self.fsync_every and self.unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        self.unsynced = 0
+
+    def close(self) -> None:
+        if not self.f.closed:
+            self.sync()
+            self.f.close()
+
+    def __enter__(self) -> "NDJSONLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---------
+    # rotation
+    # ---------
+
+    def rotate(self) -> Optional[Dict[str, Any]]:
+        """Seal the active segment. Returns its index entry (None if empty)."""
+        self.close()
+        entry = None
+        if self.path.exists() and self.path.stat().st_size:
+            os.replace(self.path, self.rotating_path)
+            entry = self._finish_rotation()
+        self._open()
+        return entry
+
+    def _finish_rotation(self) -> Optional[Dict[str, Any]]:
+        src = self.rotating_path
+        index = read_index(self.index_path)
+        digest = hashlib.sha256()
+        with src.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        sha = digest.hexdigest()
+
+        # crash after the index append but before the unlink: already sealed
+        if index and index[-1].get("sha256") == sha:
+            src.unlink()
+            return None
+
+        seg = self.segment_path(len(index) + 1)
+        tmp = seg.with_name(seg.name + ".tmp")
+        entry: Dict[str, Any] = {"segment": seg.name, "first_ts": None, "last_ts": None,
+                                 "lines": 0, "bytes": 0, "sha256": sha, "blocks": []}
+        with src.open("rb") as f, tmp.open("wb") as out:
+            block: List[bytes] = []
+            for line in f:
+                if not block:
+                    entry["blocks"].append({"offset": out.tell(), "first_ts": None, "line": entry["lines"]})
+                ts = _record_ts(line, self.ts_field)
+                if ts:
+                    entry["blocks"][-1]["first_ts"] = entry["blocks"][-1]["first_ts"] or ts
+                    entry["first_ts"] = entry["first_ts"] or ts
+                    entry["last_ts"] = ts
+                block.append(line)
+                entry["lines"] += 1
+                entry["bytes"] += len(line)
+                if len(block) >= self.block_lines:
+                    out.write(_gzip_member(b"".join(block)))
+                    block = []
+            if block:
+                out.write(_gzip_member(b"".join(block)))
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, seg)
+
+        with self.index_path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        src.unlink()
+        return entry
+
+
+def _gzip_member(data: bytes) -> bytes:
+    c = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return c.compress(data) + c.flush()
+
+
+# ---------
+# reading
+# ---------
+
+def read_index(path: Path) -> List[Dict[str, Any]]:
+    if not path.exists():
+        return []
+    with path.open("r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.endswith("\n")]
+
+
+def _iter_members(f, offset: int) -> Iterator[bytes]:
+    """Decompressed lines from consecutive gzip members starting at offset."""
+    f.seek(offset)
+    d = zlib.decompressobj(31)
+    pending = b""
+    while True:
+        chunk = d.unused_data or f.read(1 << 16)
+        if not chunk:
+            break
+        if d.eof:
+            d = zlib.decompressobj(31)
+        pending += d.decompress(chunk)
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line + b"\n"
+
+
+def read_range(path: Path, since: Optional[str] = None, until: Optional[str] = None,
+               ts_field: str = "ts") -> Iterator[Dict[str, Any]]:
+    """Records with since <= ts <= until, oldest segment first, ending with the
+    active segment. Assumes ts is non-decreasing ISO-8601 (compared lexically)."""
+    path = Path(path)
+    log_stem = path.name[:-len(".jsonl")] if path.name.endswith(".jsonl") else path.name
+
+    def keep(rec):
+        ts = rec.get(ts_field)
+        if not isinstance(ts, str):
+            return since is None and until is None
+        return (since is None or ts >= since) and (until is None or ts <= until)
+
+    for entry in read_index(path.with_name(f"{log_stem}.segments.jsonl")):
+        if since and entry["last_ts"] and entry["last_ts"] < since:
+            continue
+        if until and entry["first_ts"] and entry["first_ts"] > until:
+            break
+        offset = 0
+        for b in entry["blocks"]:
+            if since and b["first_ts"] and b["first_ts"] < since:
+                offset = b["offset"]
+        with path.with_name(entry["segment"]).open("rb") as f:
+            for line in _iter_members(f, offset):
+                rec = json.loads(line)
+                if until and isinstance(rec.get(ts_field), str) and rec[ts_field] > until:
+                    return
+                if keep(rec):
+                    yield rec
+
+    if path.exists():
+        with path.open("rb") as f:
+            for line in f:
+                if line.endswith(b"\n"):
+                    rec = json.loads(line)
+                    if keep(rec):
+                        yield rec
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Rotate or read an NDJSON log")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("rotate", help="Seal the active segment now")
+    r.add_argument("path")
+    q = sub.add_parser("read", help="Print records in a ts range")
+    q.add_argument("path")
+    q.add_argument("--since", default=None)
+    q.add_argument("--until", default=None)
+    q.add_argument("--ts-field", default="ts")
+    args = ap.parse_args()
+
+    if args.cmd == "rotate":
+        with NDJSONLog(Path(args.path)) as log:
+            entry = log.rotate()
+        print(f"[CROVIA] rotated: {entry['segment'] if entry else 'nothing to rotate'}")
+        return 0
+
+    for rec in read_range(Path(args.path), args.since, args.until, args.ts_field):
+        sys.stdout.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
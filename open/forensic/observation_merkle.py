@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+observation_merkle.py — Merkle tree + inclusion proofs for registry observations.
+
+snapshots/merkle_proof.json publishes only a root, described as
+"sha256(sorted observation_id:receipt_hash)". This module fixes that
+description as a tree:
+
+  leaf   = sha256("<observation_id>:<receipt_hash>")   (utf-8)
+  order  = observation_id ascending (all-digit ids compare numerically)
+  parent = sha256(left || right)                       (raw 32-byte digests)
+  odd    = the last node of a level with no sibling is promoted unchanged
+
+Nodes are persisted per (level, index) in SQLite (WAL, like watchlist_store),
+so appending ids that sort after the current last id rewrites only the
+right edge of each level (O(m + log n) nodes for m new leaves). Ids that sort
+inside the existing range force a full re-sort and rebuild.
+
+A proof carries leaf_index, tree_size and the sibling hashes bottom-up; the
+verifier derives left/right and promotions from (index, size), so it needs
+neither the tree nor any other observation. `verify` checks against --root,
+or else the root recorded in the proof. The published root is a flat digest,
+not a tree root, so it is only printed for reference and never decides VALID.
+
+CLI:
+  python open/forensic/observation_merkle.py add observations.jsonl   # {"observation_id", "receipt_hash"} rows
+  python open/forensic/observation_merkle.py root
+  python open/forensic/observation_merkle.py prove <observation_id> > proof.json
+  python open/forensic/observation_merkle.py verify proof.json [--root HEX]   # default: the proof's root
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DB = REPO_ROOT / ".cache" / "observation_merkle.sqlite"
+PUBLISHED = REPO_ROOT / "snapshots" / "merkle_proof.json"
+
+
+def leaf_hash(observation_id: str, receipt_hash: str) -> bytes:
+    return hashlib.sha256(f"{observation_id}:{receipt_hash}".encode("utf-8")).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(left + right).digest()
+
+
+def sort_key(observation_id: str):
+    return (0, int(observation_id), "") if observation_id.isdigit() else (1, 0, observation_id)
+
+
+def verify_proof(proof: Dict[str, Any], root: Optional[str] = None) -> bool:
+    """True if proof's leaf is at leaf_index of a tree_size tree with root
+    (default: the root recorded in the proof)."""
+    i, n = int(proof["leaf_index"]), int(proof["tree_size"])
+    if not 0 <= i < n:
+        return False
+    h = leaf_hash(str(proof["observation_id"]), proof["receipt_hash"])
+    siblings = iter(bytes.fromhex(s) for s in proof["path"])
+    try:
+        while n > 1:
+            if i % 2:
+                h = node_hash(next(siblings), h)
+            elif i + 1 < n:
+                h = node_hash(h, next(siblings))
+            i, n = i // 2, (n + 1) // 2
+    except StopIteration:
+        return False
+    if next(siblings, None) is not None:
+        return False
+    return h.hex() == (root or proof["root"])
+
+
+class MerkleStore:
+    def __init__(self, db: Path = DB):
+        self.db = Path(db)
+        self.db.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db), timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS leaves (
+                observation_id TEXT PRIMARY KEY,
+                idx INTEGER NOT NULL UNIQUE,
+                receipt_hash TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS nodes (
+                level INTEGER NOT NULL,
+                idx INTEGER NOT NULL,
+                hash BLOB NOT NULL,
+                PRIMARY KEY (level, idx)
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "MerkleStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @contextmanager
+    def _write(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # ---------
+    # tree
+    # ---------
+
+    def size(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM nodes WHERE level = 0").fetchone()[0]
+
+    def root(self) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT hash FROM nodes WHERE level = (SELECT MAX(level) FROM nodes) AND idx = 0"
+        ).fetchone()
+        return row[0].hex() if row else None
+
+    def _last_id(self) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT observation_id FROM leaves WHERE idx = (SELECT MAX(idx) FROM leaves)"
+        ).fetchone()
+        return row[0] if row else None
+
+    def _rehash_from(self, start: int) -> None:
+        """Recompute every node to the right of leaf `start`, level by level."""
+        level, lo, n = 0, start, self.size()
+        while n > 1:
+            rows = self.conn.execute(
+                "SELECT hash FROM nodes WHERE level = ? AND idx >= ? ORDER BY idx", (level, lo - lo % 2)
+            ).fetchall()
+            parents = []
+            for j in range(0, len(rows), 2):
+                parents.append(node_hash(rows[j][0], rows[j + 1][0]) if j + 1 < len(rows) else rows[j][0])
+            p_lo = lo // 2
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO nodes(level, idx, hash) VALUES (?, ?, ?)",
+                ((level + 1, p_lo + k, h) for k, h in enumerate(parents)),
+            )
+            level, lo, n = level + 1, p_lo, (n + 1) // 2
+        self.conn.execute("DELETE FROM nodes WHERE level > ?", (level,))
+
+    def add(self, pairs: Iterable[Tuple[str, str]]) -> int:
+        """Add (observation_id, receipt_hash) pairs; returns leaves added.
+
+        Re-adding an id with the same receipt hash is a no-op; a different
+        receipt hash for a known id raises ValueError.
+        """
+        with self._write():
+            new: Dict[str, str] = {}
+            for oid, rh in pairs:
+                oid = str(oid)
+                row = self.conn.execute(
+                    "SELECT receipt_hash FROM leaves WHERE observation_id = ?", (oid,)
+                ).fetchone()
+                known = row[0] if row else new.get(oid)
+                if known is not None and known != rh:
+                    raise ValueError(f"conflicting receipt_hash for observation {oid}")
+                if known is None:
+                    new[oid] = rh
+            if not new:
+                return 0
+
+            ordered = sorted(new, key=sort_key)
+            last = self._last_id()
+            if last is None or sort_key(ordered[0]) > sort_key(last):
+                start = self.size()
+                self._insert_leaves(((oid, new[oid]) for oid in ordered), start)
+            else:
+                # lands inside the sorted range: re-sort everything
+                rows = self.conn.execute("SELECT observation_id, receipt_hash FROM leaves").fetchall()
+                rows += list(new.items())
+                rows.sort(key=lambda r: sort_key(r[0]))
+                self.conn.execute("DELETE FROM leaves")
+                self.conn.execute("DELETE FROM nodes")
+                start = 0
+                self._insert_leaves(rows, start)
+            self._rehash_from(start)
+            return len(new)
+
+    def _insert_leaves(self, rows: Iterable[Tuple[str, str]], start: int) -> None:
+        rows = list(rows)
+        self.conn.executemany(
+            "INSERT INTO leaves(observation_id, idx, receipt_hash) VALUES (?, ?, ?)",
+            ((oid, start + k, rh) for k, (oid, rh) in enumerate(rows)),
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO nodes(level, idx, hash) VALUES (0, ?, ?)",
+            ((start + k, leaf_hash(oid, rh)) for k, (oid, rh) in enumerate(rows)),
+        )
+
+    def prove(self, observation_id: str) -> Optional[Dict[str, Any]]:
+        """Inclusion proof for one observation, or None if unknown."""
+        row = self.conn.execute(
+            "SELECT idx, receipt_hash FROM leaves WHERE observation_id = ?", (str(observation_id),)
+        ).fetchone()
+        if row is None:
+            return None
+        index, receipt_hash = row
+        size = self.size()
+        path: List[str] = []
+        level, i, n = 0, index, size
+        while n > 1:
+            sib = i ^ 1
+            if sib < n:
+                h = self.conn.execute(
+                    "SELECT hash FROM nodes WHERE level = ? AND idx = ?", (level, sib)
+                ).fetchone()[0]
+                path.append(h.hex())
+            level, i, n = level + 1, i // 2, (n + 1) // 2
+        return {
+            "schema": "crovia.merkle_inclusion_proof.v1",
+            "observation_id": str(observation_id),
+            "receipt_hash": receipt_hash,
+            "leaf_index": index,
+            "tree_size": size,
+            "path": path,
+            "root": self.root(),
+        }
+
+
+def iter_pairs(path: Path) -> Iterator[Tuple[str, str]]:
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                o = json.loads(line)
+                yield str(o["observation_id"]), o["receipt_hash"]
+
+
+def published_root() -> Optional[str]:
+    if not PUBLISHED.exists():
+        return None
+    with PUBLISHED.open("r", encoding="utf-8") as f:
+        return json.load(f).get("merkle_root")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Observation Merkle tree + inclusion proofs")
+    ap.add_argument("--db", default=str(DB))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    a = sub.add_parser("add", help="Add observations from JSONL (observation_id, receipt_hash)")
+    a.add_argument("path")
+    sub.add_parser("root", help="Print size + root (and the published root)")
+    p = sub.add_parser("prove", help="Print the inclusion proof for one observation")
+    p.add_argument("observation_id")
+    v = sub.add_parser("verify", help="Verify a proof file (no store needed)")
+    v.add_argument("proof")
+    v.add_argument("--root", default=None, help="Expected root (default: the root recorded in the proof)")
+    args = ap.parse_args()
+
+    if args.cmd == "verify":
+        with open(args.proof, "r", encoding="utf-8") as f:
+            proof = json.load(f)
+        root = args.root or proof["root"]
+        ok = verify_proof(proof, root)
+        print(f"[CROVIA] {'VALID' if ok else 'INVALID'}: observation {proof['observation_id']} against root {root}")
+        pub = published_root()
+        if pub and pub != root:
+            # flat sha256 over the sorted pairs, not a tree root: informational only
+            print(f"[CROVIA] note: published root {pub} ({PUBLISHED.name}) is a flat digest, not compared")
+        return 0 if ok else 1
+
+    with MerkleStore(Path(args.db)) as store:
+        if args.cmd == "add":
+            added = store.add(iter_pairs(Path(args.path)))
+            print(f"[CROVIA] merkle: +{added} leaves, size={store.size()} root={store.root()}")
+        elif args.cmd == "root":
+            root, pub = store.root(), published_root()
+            print(json.dumps({"tree_size": store.size(), "merkle_root": root,
+                              "published_root": pub, "matches_published": root == pub}, indent=2))
+        else:
+            proof = store.prove(args.observation_id)
+            if proof is None:
+                print(f"[CROVIA] unknown observation: {args.observation_id}", file=sys.stderr)
+                return 1
+            print(json.dumps(proof, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,6 +13,25 @@ IMPORTANT:
 Usage (Windows/PowerShell):
   python open/forensic/oracle_hf_probe.py --limit-models 10 --limit-datasets 10
 
+Fetching runs on a bounded thread pool over one pooled session (see hf_client.py);
+rows are still written in target order. `--base-url` points the probe at a local
+stand-in instead of huggingface.co.
+
+Responses are cached under --cache-dir and revalidated with conditional requests;
+when a card is unchanged (304 or same content hash) the previous oracle result is
+reused (row marked "reused_from_prev") instead of re-running the analysis.
+
+Pipeline: fetch stage (threads) -> analysis stage (process pool; each worker builds
+one OmissionOracle) -> single writer in the main process, which emits rows in
+target order through an unbuffered NDJSONLog: each row is a single write that
+reaches the OS before the next one (fsync every --fsync-every rows).
+
+Interrupted runs: `--resume <output.jsonl>` skips targets that already have a
+probe_result row (a torn trailing line is truncated) and appends the rest; the
+output file itself is the checkpoint, and a missing one starts a new run at
+that path. `--shard i/n` keeps only targets whose sha256(target_id) falls in
+shard i of n, so hosts can split one targets file.
+
 Output:
   open/forensic/output/oracle_hf_probe_<UTC>.jsonl
 """
@@ -20,15 +39,16 @@ Output:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
 import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-
-import requests
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 # Ensure we can import PRO modules from local workspace
 REPO_ROOT = Path(__file__).resolve().parents[2]
@@ -38,11 +58,11 @@ if str(PRO_ROOT) not in sys.path:
 
 from croviapro.oracle.omission_oracle import OmissionOracle  # noqa: E402
 
+from hf_client import HF_BASE_URL, HFClient, HTTPCache  # noqa: E402
+from ndjson_log import NDJSONLog  # noqa: E402
 
-HF_TIMEOUT_SECS = 15
-HF_HEADERS = {
-    "User-Agent": "CroviaOracleProbe/1.0 (evidence-first; contact: croviatrust.com)",
-}
+# hf meta["cache"] states for which the previous oracle result is still valid
+UNCHANGED_CACHE_STATES = {"not_modified", "unchanged"}
 
 
 def utc_now_compact() -> str:
@@ -70,33 +90,49 @@ def is_internal_target(target_id: str) -> bool:
     return t.startswith("crovia/") or t.startswith("croviatrust/")
 
 
-def fetch_hf_api(kind: str, target_id: str) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
-    """Fetch HF API JSON.
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse 'i/n' (0 <= i < n)."""
+    try:
+        i, n = (int(x) for x in spec.split("/", 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"--shard must look like i/n, got {spec!r}")
+    if n < 1 or not 0 <= i < n:
+        raise argparse.ArgumentTypeError(f"--shard needs 0 <= i < n, got {spec!r}")
+    return i, n
 
-    Returns:
-      (json_or_none, meta)
-    """
-    if kind == "model":
-        url = f"https://huggingface.co/api/models/{target_id}"
-    elif kind == "dataset":
-        url = f"https://huggingface.co/api/datasets/{target_id}"
-    else:
-        raise ValueError(f"Unsupported kind: {kind}")
 
-    meta: Dict[str, Any] = {"url": url}
+def in_shard(target_id: str, shard: Optional[Tuple[int, int]]) -> bool:
+    if shard is None:
+        return True
+    i, n = shard
+    return int(hashlib.sha256(target_id.encode("utf-8")).hexdigest()[:16], 16) % n == i
 
-    try:
-        r = requests.get(url, headers=HF_HEADERS, timeout=HF_TIMEOUT_SECS)
-        meta["http_status"] = r.status_code
-        meta["fetched_at"] = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-        if r.status_code != 200:
-            meta["error"] = f"HTTP {r.status_code}"
-            return None, meta
-        j = r.json()
-        return j, meta
-    except Exception as e:
-        meta["error"] = f"{type(e).__name__}: {e}"
-        return None, meta
+
+def load_done(path: Path) -> Set[Tuple[str, str]]:
+    """(tipo_target, target_id) pairs already probed in an output file.
+
+    A trailing line cut off by a crash is truncated away so appends stay valid.
+    A missing file means nothing is done yet (first run of a resumable job).
+    """
+    done: Set[Tuple[str, str]] = set()
+    good_end = 0
+    if not path.exists():
+        return done
+    with path.open("rb") as f:
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                row = json.loads(raw)
+            except ValueError:
+                break
+            good_end += len(raw)
+            if row.get("type") == "probe_result":
+                done.add((row.get("tipo_target"), row.get("target_id")))
+    if good_end < path.stat().st_size:
+        with path.open("r+b") as f:
+            f.truncate(good_end)
+    return done
 
 
 def oracle_result_to_dict(result) -> Dict[str, Any]:
@@ -114,6 +150,103 @@ def oracle_result_to_dict(result) -> Dict[str, Any]:
     return out
 
 
+def analyze_row(
+    oracle, kind: str, tid: str, api_json: Optional[Dict[str, Any]], meta: Dict[str, Any]
+) -> Dict[str, Any]:
+    row: Dict[str, Any] = {
+        "type": "probe_result",
+        "target_id": tid,
+        "tipo_target": kind,
+        "hf": meta,
+    }
+    if api_json is not None:
+        try:
+            if kind == "model":
+                result = oracle.analyze_model(api_json, generate_evidence=True)
+            else:
+                result = oracle.analyze_dataset(api_json, generate_evidence=True)
+            row["oracle"] = oracle_result_to_dict(result)
+        except Exception as e:
+            row["oracle_error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+# -------------------------
+# Analysis stage (process pool)
+# -------------------------
+_WORKER_ORACLE = None
+
+
+def _init_analysis_worker() -> None:
+    global _WORKER_ORACLE
+    _WORKER_ORACLE = OmissionOracle()
+
+
+def _analyze_in_worker(
+    kind: str, tid: str, api_json: Dict[str, Any], meta: Dict[str, Any]
+) -> Dict[str, Any]:
+    return analyze_row(_WORKER_ORACLE, kind, tid, api_json, meta)
+
+
+def reused_row(
+    client: HFClient, kind: str, tid: str, meta: Dict[str, Any], reanalyze: bool = False
+) -> Optional[Dict[str, Any]]:
+    """Row built from the cached oracle result, if the card is unchanged."""
+    cache = client.cache
+    if not cache or reanalyze or meta.get("cache") not in UNCHANGED_CACHE_STATES:
+        return None
+    prev = cache.extra(meta["url"], "probe")
+    if prev is None:
+        return None
+    return {
+        "type": "probe_result",
+        "target_id": tid,
+        "tipo_target": kind,
+        "hf": meta,
+        **prev,
+        "reused_from_prev": True,
+    }
+
+
+def run_pipeline(
+    client: HFClient, items: List[Tuple[str, str]], writer, *, pool: Optional[ProcessPoolExecutor] = None,
+    oracle=None, reanalyze: bool = False, fetch_workers: int = 8, window: int = 4,
+) -> int:
+    """Fetch, analyze and write one probe_result row per item, in item order.
+
+    Analysis goes to `pool` when given (else `oracle` inline); at most `window`
+    rows wait behind the head row, which is written as soon as it is ready so
+    analysis overlaps with the remaining fetches. Returns the rows written.
+    """
+    cache = client.cache
+    pending: deque = deque()
+    written = 0
+
+    def flush(limit: int) -> None:
+        nonlocal written
+        while pending and (
+            len(pending) > limit or not isinstance(pending[0], Future) or pending[0].done()
+        ):
+            item = pending.popleft()
+            row = item.result() if isinstance(item, Future) else item
+            writer.write(row)
+            written += 1
+            if cache and "reused_from_prev" not in row and ("oracle" in row or "oracle_error" in row):
+                cache.attach(row["hf"]["url"], "probe", {
+                    k: row[k] for k in ("oracle", "oracle_error") if k in row
+                })
+
+    for kind, tid, api_json, meta in client.fetch_many(items, workers=fetch_workers):
+        row = reused_row(client, kind, tid, meta, reanalyze)
+        if row is None and api_json is not None and pool is not None:
+            pending.append(pool.submit(_analyze_in_worker, kind, tid, api_json, meta))
+        else:
+            pending.append(row or analyze_row(oracle, kind, tid, api_json, meta))
+        flush(limit=window)
+    flush(limit=0)
+    return written
+
+
 def main() -> int:
     p = argparse.ArgumentParser()
     p.add_argument(
@@ -124,6 +257,20 @@ def main() -> int:
     p.add_argument("--limit-datasets", type=int, default=10)
     p.add_argument("--out-dir", default=str(REPO_ROOT / "open" / "forensic" / "output"))
     p.add_argument("--include-internal", action="store_true")
+    p.add_argument("--base-url", default=HF_BASE_URL, help="HF endpoint (local stand-in for tests)")
+    p.add_argument("--workers", type=int, default=8, help="Concurrent fetches")
+    p.add_argument("--rate", type=float, default=8.0, help="Max requests/second per host")
+    p.add_argument("--retries", type=int, default=4, help="Retries on 429/5xx/connection errors")
+    p.add_argument("--cache-dir", default=str(REPO_ROOT / ".cache" / "hf_http"))
+    p.add_argument("--no-cache", action="store_true", help="Always download full responses")
+    p.add_argument("--reanalyze", action="store_true", help="Run the oracle even on unchanged cards")
+    p.add_argument(
+        "--analysis-workers", type=int, default=os.cpu_count() or 1,
+        help="Oracle worker processes (0 = analyze inline in the main process)",
+    )
+    p.add_argument("--resume", default=None, help="Existing output JSONL to complete instead of starting over")
+    p.add_argument("--fsync-every", type=int, default=64, help="Rows between fsyncs of the output (0 = on close)")
+    p.add_argument("--shard", type=parse_shard, default=None, help="Process only shard i of n (e.g. 0/4)")
     args = p.parse_args()
 
     targets_path = Path(args.targets_file)
@@ -140,6 +287,8 @@ def main() -> int:
             continue
         if not args.include_internal and is_internal_target(tid):
             continue
+        if not in_shard(tid, args.shard):
+            continue
 
         if ttype == "model" and len(models) < args.limit_models:
             models.append(tid)
@@ -149,52 +298,57 @@ def main() -> int:
         if len(models) >= args.limit_models and len(datasets) >= args.limit_datasets:
             break
 
-    oracle = OmissionOracle()
-
-    out_dir = Path(args.out_dir)
-    out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / f"oracle_hf_probe_{utc_now_compact()}.jsonl"
+    cache = None if args.no_cache else HTTPCache(Path(args.cache_dir))
+    client = HFClient(
+        args.base_url, rate_per_host=args.rate, max_retries=args.retries,
+        pool_size=args.workers, cache=cache,
+    )
 
     run_meta = {
         "generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
         "targets_file": str(targets_path),
         "sample": {"models": len(models), "datasets": len(datasets)},
     }
+    if args.shard:
+        run_meta["shard"] = "{}/{}".format(*args.shard)
+
+    items = [("model", tid) for tid in models] + [("dataset", tid) for tid in datasets]
+
+    if args.resume:
+        out_path = Path(args.resume)
+        started = out_path.exists()
+        done = load_done(out_path)
+        items = [(k, t) for k, t in items if (k, t) not in done]
+        if started:
+            head = {"type": "run_resume", "resumed_at": run_meta["generated_at"], "skipped": len(done)}
+        else:
+            head = {"type": "run_meta", **run_meta}
+        print(f"[CROVIA] resume: {len(done)} done, {len(items)} remaining")
+    else:
+        out_dir = Path(args.out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        out_path = out_dir / f"oracle_hf_probe_{utc_now_compact()}.jsonl"
+        head = {"type": "run_meta", **run_meta}
+
+    oracle = None
+    pool = None
+    if args.analysis_workers > 0:
+        pool = ProcessPoolExecutor(max_workers=args.analysis_workers, initializer=_init_analysis_worker)
+    else:
+        oracle = OmissionOracle()
 
-    with out_path.open("w", encoding="utf-8") as f:
-        f.write(json.dumps({"type": "run_meta", **run_meta}, ensure_ascii=False) + "\n")
-
-        for tid in models:
-            api_json, meta = fetch_hf_api("model", tid)
-            row: Dict[str, Any] = {
-                "type": "probe_result",
-                "target_id": tid,
-                "tipo_target": "model",
-                "hf": meta,
-            }
-            if api_json is not None:
-                try:
-                    result = oracle.analyze_model(api_json, generate_evidence=True)
-                    row["oracle"] = oracle_result_to_dict(result)
-                except Exception as e:
-                    row["oracle_error"] = f"{type(e).__name__}: {e}"
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
-
-        for tid in datasets:
-            api_json, meta = fetch_hf_api("dataset", tid)
-            row = {
-                "type": "probe_result",
-                "target_id": tid,
-                "tipo_target": "dataset",
-                "hf": meta,
-            }
-            if api_json is not None:
-                try:
-                    result = oracle.analyze_dataset(api_json, generate_evidence=True)
-                    row["oracle"] = oracle_result_to_dict(result)
-                except Exception as e:
-                    row["oracle_error"] = f"{type(e).__name__}: {e}"
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    # a run file is never rotated: --resume treats it as the checkpoint, so rows go
+    # out unbuffered (one write per row) and a crash loses at most the row in flight
+    writer = NDJSONLog(out_path, fsync_every=args.fsync_every, buffer_bytes=0)
+    try:
+        writer.write(head)
+        run_pipeline(client, items, writer, pool=pool, oracle=oracle,
+                     reanalyze=args.reanalyze, fetch_workers=args.workers,
+                     window=4 * max(1, args.analysis_workers))
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.shutdown()
 
     print(f"[CROVIA] wrote: {out_path}")
     print(f"[CROVIA] sample: models={len(models)} datasets={len(datasets)}")
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""On-disk index over snapshots/global_ranking.json for single-model lookups.
+
+global_ranking.json is one large document (~6.9k models); tools that need one
+model's rank / score / gaps should not json.load it every time. This module
+parses it once into a binary file and memory-maps that file on reopen:
+
+  header   magic "CRVRIDX1", slot count, record count, source size + mtime_ns
+  slots    open-addressing hash table: (blake2b-64(model_id), record offset)
+  records  rank u32 | score f64 | len-prefixed severity, model_id, gaps (utf-8)
+
+lookup() hashes the id, probes linearly from its slot (load factor <= 0.5)
+and decodes a single record; nothing else is read. The index is rebuilt when
+the ranking's size or mtime no longer match the header.
+
+Usage:
+  python open/forensic/ranking_index.py build
+  python open/forensic/ranking_index.py get meta-llama/Llama-3.3-70B-Instruct
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+RANKING_JSON = REPO_ROOT / "snapshots" / "global_ranking.json"
+INDEX_DIR = REPO_ROOT / ".cache" / "ranking_index"
+
+MAGIC = b"CRVRIDX1"
+HEADER = struct.Struct("<8sIIQq")   # magic, n_slots, n_records, src_size, src_mtime_ns
+SLOT = struct.Struct("<QQ")         # key hash, record offset (0 = empty)
+RECORD = struct.Struct("<IdBHH")    # rank, score, len(severity), len(model_id), len(gaps)
+GAP_SEP = "\x1f"
+
+
+def key_hash(model_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(model_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def source_signature(ranking: Path):
+    st = Path(ranking).stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def default_index_path(ranking: Path) -> Path:
+    tag = hashlib.sha256(str(Path(ranking).resolve()).encode("utf-8")).hexdigest()[:16]
+    return INDEX_DIR / f"global_ranking.{tag}.idx"
+
+
+def build_index(ranking: Path, index_path: Path) -> int:
+    """Parse the ranking once and write the index atomically. Returns record count."""
+    size, mtime_ns = source_signature(ranking)
+    with open(ranking, "r", encoding="utf-8") as f:
+        models = json.load(f).get("model_ranking", [])
+
+    records: List[Tuple[str, bytes]] = []
+    seen = set()
+    for m in models:
+        model_id = m.get("model_id")
+        if not model_id or model_id in seen:
+            continue
+        seen.add(model_id)
+        sev = (m.get("severity") or "").encode("utf-8")
+        mid = model_id.encode("utf-8")
+        gaps = GAP_SEP.join(m.get("top_gaps") or []).encode("utf-8")
+        records.append((model_id, RECORD.pack(int(m.get("rank") or 0), float(m.get("score") or 0.0),
+                                              len(sev), len(mid), len(gaps)) + sev + mid + gaps))
+
+    n_slots = 1
+    while n_slots < 2 * max(1, len(records)):
+        n_slots *= 2
+    slots = bytearray(n_slots * SLOT.size)
+    offset = HEADER.size + len(slots)
+    for model_id, rec in records:
+        h = key_hash(model_id)
+        i = h & (n_slots - 1)
+        while SLOT.unpack_from(slots, i * SLOT.size)[1]:
+            i = (i + 1) & (n_slots - 1)
+        SLOT.pack_into(slots, i * SLOT.size, h, offset)
+        offset += len(rec)
+
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    # a private temp file per builder: concurrent builds never write into each other
+    fd, tmp = tempfile.mkstemp(dir=index_path.parent, prefix=index_path.name + ".", suffix=".tmp")
+    try:
+        os.fchmod(fd, 0o644)   # mkstemp creates 0600; the index is read by other services
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, n_slots, len(records), size, mtime_ns))
+            f.write(slots)
+            for _, rec in records:
+                f.write(rec)
+        os.replace(tmp, index_path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return len(records)
+
+
+class RankingIndex:
+    """Read-only, memory-mapped view of a built index."""
+
+    def __init__(self, index_path: Path):
+        self.path = Path(index_path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.n_slots, self.n_records, self.src_size, self.src_mtime_ns = HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"not a ranking index: {self.path}")
+
+    @classmethod
+    def for_ranking(cls, ranking: Path = RANKING_JSON, index_path: Optional[Path] = None) -> "RankingIndex":
+        """Open the index for ranking, (re)building it if missing or stale."""
+        index_path = Path(index_path) if index_path else default_index_path(ranking)
+        if index_path.exists():
+            idx = cls(index_path)
+            if (idx.src_size, idx.src_mtime_ns) == source_signature(ranking):
+                return idx
+            idx.close()
+        build_index(Path(ranking), index_path)
+        return cls(index_path)
+
+    def _record(self, offset: int) -> Dict[str, Any]:
+        rank, score, sev_len, mid_len, gaps_len = RECORD.unpack_from(self._mm, offset)
+        p = offset + RECORD.size
+        sev = self._mm[p:p + sev_len].decode("utf-8")
+        p += sev_len
+        model_id = self._mm[p:p + mid_len].decode("utf-8")
+        p += mid_len
+        gaps = self._mm[p:p + gaps_len].decode("utf-8")
+        return {
+            "model_id": model_id,
+            "rank": rank,
+            "score": score,
+            "severity": sev,
+            "violations": gaps.split(GAP_SEP) if gaps else [],
+        }
+
+    def _id_at(self, offset: int) -> bytes:
+        _, _, sev_len, mid_len, _ = RECORD.unpack_from(self._mm, offset)
+        p = offset + RECORD.size + sev_len
+        return self._mm[p:p + mid_len]
+
+    def lookup(self, model_id: str) -> Optional[Dict[str, Any]]:
+        """rank / score / severity / violations (top_gaps) for model_id, or None."""
+        h = key_hash(model_id)
+        want = model_id.encode("utf-8")
+        mask = self.n_slots - 1
+        i = h & mask
+        while True:
+            slot_h, offset = SLOT.unpack_from(self._mm, HEADER.size + i * SLOT.size)
+            if not offset:
+                return None
+            if slot_h == h and self._id_at(offset) == want:
+                return self._record(offset)
+            i = (i + 1) & mask
+
+    def __contains__(self, model_id: str) -> bool:
+        return self.lookup(model_id) is not None
+
+    def __len__(self) -> int:
+        return self.n_records
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Records in ranking order."""
+        offset = HEADER.size + self.n_slots * SLOT.size
+        for _ in range(self.n_records):
+            _, _, sev_len, mid_len, gaps_len = RECORD.unpack_from(self._mm, offset)
+            yield self._record(offset)
+            offset += RECORD.size + sev_len + mid_len + gaps_len
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "RankingIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Build / query the global ranking index")
+    ap.add_argument("--ranking", default=str(RANKING_JSON))
+    ap.add_argument("--index", default=None, help="Index file (default: under .cache/ranking_index/)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("build", help="(Re)build the index")
+    g = sub.add_parser("get", help="Print one model's ranking record")
+    g.add_argument("model_id")
+    args = ap.parse_args()
+
+    ranking = Path(args.ranking)
+    index_path = Path(args.index) if args.index else default_index_path(ranking)
+    if args.cmd == "build":
+        n = build_index(ranking, index_path)
+        print(f"[CROVIA] ranking index: {n} models -> {index_path}")
+        return 0
+
+    with RankingIndex.for_ranking(ranking, index_path) as idx:
+        rec = idx.lookup(args.model_id)
+    if rec is None:
+        print(f"[CROVIA] not ranked: {args.model_id}")
+        return 1
+    print(json.dumps(rec, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+statement_timeline.py — point-in-time and range queries over statement events.
+
+open/temporal/statement_timeline_30d.jsonl is a rolling, time-ordered log of
+per-target statement events (license, declared_datasets,
+training_section_presence, readme_access + card/readme hashes). Each event
+states what its target declared from its observed_at until the target's next
+event, i.e. a half-open validity interval [observed_at, next) — open-ended for
+the latest one.
+
+The index kept here:
+
+  events      append-only, sorted by start; per event the statement fields
+              that differ from the same target's previous event
+  by_target   target_id -> event ids in time order         (bisect: state_at)
+  changes     field -> event ids where that field changed  (bisect: changed)
+  tree        the start-sorted events read as an implicit balanced BST
+              (node = midpoint of its range) augmented with the subtree's
+              max end                                     (valid_at, overlapping)
+
+Point lookups are O(log k) for a target with k events; stabbing and range
+queries are O(log n + hits). On first build, each target's entry in
+statement_timeline_index.json (older than the 30d window) is indexed as a
+baseline event at its last_observed_at, so queries before a target's first
+30d event still answer, with the fields that index carries.
+
+refresh() is incremental: the 30d file is time-ordered, so only rows at or
+after the stored watermark are read into the index; each touched target's
+previous interval is closed and the new ones appended, with no re-sort.
+Events that roll out of the 30d window stay queryable. The index is kept at
+.cache/statement_timeline.json.
+
+CLI:
+  python open/forensic/statement_timeline.py refresh
+  python open/forensic/statement_timeline.py at EMERGE-lab/GPUDrive 2026-05-01T00:00:00Z
+  python open/forensic/statement_timeline.py changed license 2026-04-20 2026-05-10
+  python open/forensic/statement_timeline.py valid 2026-05-01T00:00:00Z --tipo model
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+TIMELINE = REPO_ROOT / "open" / "temporal" / "statement_timeline_30d.jsonl"
+BASELINE = REPO_ROOT / "open" / "temporal" / "statement_timeline_index.json"
+CACHE = REPO_ROOT / ".cache" / "statement_timeline.json"
+
+OPEN = 1 << 62   # end of a still-valid interval
+BASELINE_FIELDS = ("license", "readme_access", "training_section_presence", "declared_datasets_count")
+
+
+def to_us(ts: str) -> int:
+    """ISO-8601 (date or datetime, Z or offset) -> UTC epoch microseconds."""
+    dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1_000_000)
+
+
+class StatementTimeline:
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.max_end: List[int] = []
+        self.by_target: Dict[str, List[int]] = {}
+        self.changes: Dict[str, List[int]] = {}
+        self.source: Optional[List[Any]] = None
+        self.watermark: Optional[str] = None
+
+    # ---------
+    # build
+    # ---------
+
+    def _append(self, row: Dict[str, Any], statements: Dict[str, Any], origin: str) -> None:
+        tid = row["target_id"]
+        start = to_us(row["observed_at"])
+        if self.starts and start < self.starts[-1]:
+            raise ValueError(f"event out of order: {tid} @ {row['observed_at']}")
+        i = len(self.events)
+        ids = self.by_target.setdefault(tid, [])
+        changed: List[str] = []
+        if ids:
+            prev = ids[-1]
+            self.ends[prev] = start
+            before = self.events[prev]["statements"]
+            changed = [f for f in statements if f in before and before[f] != statements[f]]
+        hashes = row.get("hashes") or {}
+        self.events.append({
+            "target_id": tid,
+            "tipo_target": row.get("tipo_target"),
+            "observed_at": row["observed_at"],
+            "ddf_hash": row.get("ddf_hash"),
+            "card_hash": hashes.get("card_hash"),
+            "readme_hash": hashes.get("readme_hash"),
+            "statements": statements,
+            "changed": changed,
+            "origin": origin,
+        })
+        self.starts.append(start)
+        self.ends.append(OPEN)
+        ids.append(i)
+        for f in changed:
+            self.changes.setdefault(f, []).append(i)
+
+    def _fix_max_end(self, lo: int = 0, hi: Optional[int] = None) -> int:
+        """Recompute the BST augmentation over [lo, hi); returns the range max."""
+        if hi is None:
+            self.max_end = [0] * len(self.starts)
+            hi = len(self.starts)
+        if lo >= hi:
+            return 0
+        mid = (lo + hi) // 2
+        m = max(self.ends[mid], self._fix_max_end(lo, mid), self._fix_max_end(mid + 1, hi))
+        self.max_end[mid] = m
+        return m
+
+    def load_baseline(self, path: Path = BASELINE, before: Optional[str] = None) -> int:
+        """Seed an empty timeline from the statement index (entries older than `before` only)."""
+        if self.events or not Path(path).exists():
+            return 0
+        with open(path, "r", encoding="utf-8") as f:
+            targets = json.load(f).get("targets", [])
+        cutoff = to_us(before) if before else OPEN
+        rows = sorted((t for t in targets if t.get("last_observed_at") and to_us(t["last_observed_at"]) < cutoff),
+                      key=lambda t: to_us(t["last_observed_at"]))
+        for t in rows:
+            self._append({"target_id": t["target_id"], "tipo_target": t.get("tipo_target"),
+                          "observed_at": t["last_observed_at"], "ddf_hash": t.get("ddf_hash")},
+                         {f: t.get(f) for f in BASELINE_FIELDS}, "index")
+        self._fix_max_end()
+        return len(rows)
+
+    def refresh(self, path: Path = TIMELINE) -> int:
+        """Index events at/after the watermark; returns how many were added."""
+        st = os.stat(path)
+        sig = [str(Path(path).resolve()), st.st_size, st.st_mtime_ns]
+        if sig == self.source:
+            return 0
+        wm = to_us(self.watermark) if self.watermark else None
+        # rows sharing the watermark instant may already be indexed
+        at_wm, i = set(), len(self.events) - 1
+        while wm is not None and i >= 0 and self.starts[i] == wm:
+            at_wm.add((self.events[i]["target_id"], self.events[i]["observed_at"]))
+            i -= 1
+        added = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                t = to_us(row["observed_at"])
+                if wm is not None and (t < wm or (t == wm and (row["target_id"], row["observed_at"]) in at_wm)):
+                    continue
+                self._append(row, dict(row.get("statements") or {}), "timeline")
+                self.watermark = row["observed_at"]
+                added += 1
+        if added:
+            self._fix_max_end()
+        self.source = sig
+        return added
+
+    # ---------
+    # persistence
+    # ---------
+
+    def save(self, path: Path = CACHE) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"schema": "crovia.statement_timeline_cache.v1", "source": self.source,
+                       "watermark": self.watermark, "events": self.events, "starts": self.starts,
+                       "ends": self.ends, "max_end": self.max_end, "by_target": self.by_target,
+                       "changes": self.changes}, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path = CACHE) -> "StatementTimeline":
+        tl = cls()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return tl
+        for k in ("source", "watermark", "events", "starts", "ends", "max_end", "by_target", "changes"):
+            setattr(tl, k, data[k])
+        return tl
+
+    # ---------
+    # queries
+    # ---------
+
+    def _neighbour(self, i: int, step: int) -> int:
+        seq = self.by_target[self.events[i]["target_id"]]
+        return seq[bisect_left(seq, i) + step]
+
+    def _view(self, i: int) -> Dict[str, Any]:
+        e = dict(self.events[i])
+        e["valid_until"] = None if self.ends[i] == OPEN else self.events[self._neighbour(i, 1)]["observed_at"]
+        return e
+
+    def state_at(self, target_id: str, when: str) -> Optional[Dict[str, Any]]:
+        """The event in force for target_id at `when` (None before its first one)."""
+        ids = self.by_target.get(target_id)
+        if not ids:
+            return None
+        t = to_us(when)
+        k = bisect_right(ids, t, key=lambda i: self.starts[i])
+        return self._view(ids[k - 1]) if k else None
+
+    def history(self, target_id: str, since: Optional[str] = None, until: Optional[str] = None):
+        ids = self.by_target.get(target_id, [])
+        lo = bisect_left(ids, to_us(since), key=lambda i: self.starts[i]) if since else 0
+        hi = bisect_left(ids, to_us(until), key=lambda i: self.starts[i]) if until else len(ids)
+        return [self._view(i) for i in ids[lo:hi]]
+
+    def _overlap(self, a: int, b: int) -> Iterator[int]:
+        """Event ids whose [start, end) intersects [a, b]."""
+        stack = [(0, len(self.starts))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self.max_end[mid] <= a:
+                continue
+            stack.append((lo, mid))
+            if self.starts[mid] <= b:
+                if self.ends[mid] > a:
+                    yield mid
+                stack.append((mid + 1, hi))
+
+    def valid_at(self, when: str, tipo_target: Optional[str] = None) -> List[Dict[str, Any]]:
+        """One event per target: what every target stated at `when`."""
+        t = to_us(when)
+        ids = sorted(self._overlap(t, t))
+        return [self._view(i) for i in ids if tipo_target is None or self.events[i]["tipo_target"] == tipo_target]
+
+    def overlapping(self, since: str, until: str) -> List[Dict[str, Any]]:
+        """Every statement valid at some point in [since, until]."""
+        return [self._view(i) for i in sorted(self._overlap(to_us(since), to_us(until)))]
+
+    def changed(self, field: str, since: str, until: str) -> List[Dict[str, Any]]:
+        """Targets whose `field` changed in [since, until), with before/after values."""
+        ids = self.changes.get(field, [])
+        lo = bisect_left(ids, to_us(since), key=lambda i: self.starts[i])
+        hi = bisect_left(ids, to_us(until), key=lambda i: self.starts[i])
+        out = []
+        for i in ids[lo:hi]:
+            e = self.events[i]
+            prev = self.events[self._neighbour(i, -1)]
+            out.append({"target_id": e["target_id"], "tipo_target": e["tipo_target"], "observed_at": e["observed_at"],
+                        "field": field, "before": prev["statements"].get(field), "after": e["statements"][field]})
+        return out
+
+
+def open_timeline(cache: Path = CACHE, timeline: Path = TIMELINE, baseline: Optional[Path] = BASELINE) -> StatementTimeline:
+    """Load the persisted index, pull in new timeline rows and save if anything changed."""
+    tl = StatementTimeline.load(cache)
+    seeded = 0
+    if not tl.events and baseline is not None:
+        with open(timeline, "r", encoding="utf-8") as f:
+            first = next((json.loads(line) for line in f if line.strip()), None)
+        seeded = tl.load_baseline(baseline, first["observed_at"] if first else None)
+    source = tl.source
+    if tl.refresh(timeline) or seeded or tl.source != source:
+        tl.save(cache)
+    return tl
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Point-in-time / range queries over the statement timeline")
+    ap.add_argument("--cache", default=str(CACHE))
+    ap.add_argument("--timeline", default=str(TIMELINE))
+    ap.add_argument("--no-baseline", action="store_true", help="Do not seed from statement_timeline_index.json")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("refresh", help="Index new timeline rows")
+    a = sub.add_parser("at", help="What a target stated at a time")
+    a.add_argument("target_id")
+    a.add_argument("when")
+    h = sub.add_parser("history", help="A target's events")
+    h.add_argument("target_id")
+    c = sub.add_parser("changed", help="Targets whose field changed in [since, until)")
+    c.add_argument("field")
+    c.add_argument("since")
+    c.add_argument("until")
+    v = sub.add_parser("valid", help="Every target's statements at a time")
+    v.add_argument("when")
+    v.add_argument("--tipo", default=None)
+    args = ap.parse_args()
+
+    tl = open_timeline(Path(args.cache), Path(args.timeline), None if args.no_baseline else BASELINE)
+    if args.cmd == "refresh":
+        print(f"[CROVIA] statement timeline: {len(tl.events)} events, {len(tl.by_target)} targets, "
+              f"watermark {tl.watermark}")
+        return 0
+    if args.cmd == "at":
+        e = tl.state_at(args.target_id, args.when)
+        if e is None:
+            print(f"[CROVIA] no statement for {args.target_id} at {args.when}", file=sys.stderr)
+            return 1
+        print(json.dumps(e, indent=2, ensure_ascii=False))
+        return 0
+    rows = (tl.history(args.target_id) if args.cmd == "history"
+            else tl.changed(args.field, args.since, args.until) if args.cmd == "changed"
+            else tl.valid_at(args.when, args.tipo))
+    for r in rows:
+        print(json.dumps(r, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
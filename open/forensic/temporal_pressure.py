@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+temporal_pressure.py — sliding-window temporal pressure per project_key.
+
+Per key, over the last WINDOW_DAYS UTC days:
+- observations   = probes: presence signals (open/signal/presence_latest.jsonl)
+                   and absence receipts (open/forensic/absence_receipts_7d.jsonl),
+                   one per (project_key, timestamp) — a RED probe appears in both
+- silence_days   = silent probes: verdict RED, or known only from a receipt
+- pressure_score = silence_days / observations
+- coverage_level = LOW/MEDIUM/HIGH on the number of keys observed in the
+                   window (same thresholds as ledger_status.py)
+
+Incremental like ledger_status.py: inputs are read from the byte offset
+consumed last time, and a rewritten input (rolling export) only contributes
+rows newer than its previous high-water timestamp. Each key keeps a ring
+buffer of WINDOW_DAYS daily [day, observations, silences, probe timestamps]
+slots plus running totals, and an index day -> keys with counts that day.
+A sync therefore costs O(new events + keys with counts on the days leaving
+the window); only those keys' output rows are recomputed before the file is
+written. The window ends at --now or the newest event, whichever is later.
+"""
+import argparse
+import json
+from datetime import datetime, timezone, date
+from pathlib import Path
+
+from ledger_status import ABSENCE, PRESENCE, read_new
+
+OUT = Path("open/temporal/temporal_pressure_30d.jsonl")
+STATE = Path(".cache/temporal_pressure_state.json")
+
+WINDOW_DAYS = 30
+
+
+def day_of(ts: str) -> int:
+    if ts.endswith(("Z", "+00:00")):
+        return date.fromisoformat(ts[:10]).toordinal()
+    return datetime.fromisoformat(ts).astimezone(timezone.utc).date().toordinal()
+
+
+def coverage_level(n: int) -> str:
+    return "LOW" if n < 25 else "MEDIUM" if n < 100 else "HIGH"
+
+
+def _expire(state: dict, new_head: int, touched: set) -> None:
+    """Advance the window head, dropping days that leave it."""
+    head = state.get("head")
+    state["head"] = new_head
+    if head is None or new_head <= head:
+        return
+    by_day = state["by_day"]
+    for d in range(head - WINDOW_DAYS + 1, new_head - WINDOW_DAYS + 1):
+        for key in by_day.pop(str(d), []):
+            k = state["keys"].get(key)
+            if k is None:
+                continue
+            slot = k["slots"].pop(str(d % WINDOW_DAYS), None)
+            if slot and slot[0] == d:
+                k["obs"] -= slot[1]
+                k["sil"] -= slot[2]
+            touched.add(key)
+
+
+def _add(state: dict, key: str, ts: str, silent: bool, touched: set) -> None:
+    d = day_of(ts)
+    if d <= state["head"] - WINDOW_DAYS:
+        return  # already outside the window
+    k = state["keys"].setdefault(key, {"slots": {}, "obs": 0, "sil": 0, "last_ts": None})
+    slot = k["slots"].get(str(d % WINDOW_DAYS))
+    if slot is None or slot[0] != d:
+        if slot:  # stale day sharing the ring slot
+            k["obs"] -= slot[1]
+            k["sil"] -= slot[2]
+        slot = k["slots"][str(d % WINDOW_DAYS)] = [d, 0, 0, []]
+        state["by_day"].setdefault(str(d), []).append(key)
+    if ts in slot[3]:
+        return  # same probe already seen through the other input
+    slot[3].append(ts)
+    slot[1] += 1
+    slot[2] += int(silent)
+    k["obs"] += 1
+    k["sil"] += int(silent)
+    if k["last_ts"] is None or ts > k["last_ts"]:
+        k["last_ts"] = ts
+    touched.add(key)
+
+
+def _fresh(path: Path, st: dict, ts_field: str):
+    """New rows of one input; after a rewrite only rows past the old high-water mark."""
+    rows = list(read_new(path, st))
+    floor = st.get("hwm") if st.pop("rescan") else None
+    rows = [o for o in rows if floor is None or o[ts_field] > floor]
+    if rows:
+        st["hwm"] = max([o[ts_field] for o in rows] + ([st["hwm"]] if st.get("hwm") else []))
+    return rows
+
+
+def sync(state: dict, now: datetime, presence: Path = PRESENCE, absence: Path = ABSENCE) -> set:
+    """Fold new events into state; returns the keys whose row must be recomputed."""
+    state.setdefault("keys", {})
+    state.setdefault("by_day", {})
+    state.setdefault("rows", {})
+    touched = set()
+
+    pres = _fresh(presence, state.setdefault("presence", {}), "ts")
+    absn = _fresh(absence, state.setdefault("absence", {}), "observed_at")
+
+    head = max([now.astimezone(timezone.utc).date().toordinal()]
+               + [day_of(o["ts"]) for o in pres] + [day_of(o["observed_at"]) for o in absn])
+    if state.get("head") is None:
+        state["head"] = head
+    _expire(state, max(head, state["head"]), touched)
+
+    for o in pres:
+        _add(state, o["project_key"], o["ts"], o.get("verdict") != "GREEN", touched)
+    for o in absn:
+        _add(state, o["project_key"], o["observed_at"], True, touched)
+    return touched
+
+
+def emit(state: dict, touched: set) -> list:
+    """Recompute rows for touched keys only; returns every live row, first-seen order."""
+    rows = state["rows"]
+    for key in touched:
+        k = state["keys"].get(key)
+        if not k or k["obs"] <= 0:
+            rows.pop(key, None)
+            if k and k["sil"] <= 0:
+                state["keys"].pop(key)
+            continue
+        rows[key] = {
+            "schema": "crovia.open.temporal_pressure.v1",
+            "project_key": key,
+            "window_days": WINDOW_DAYS,
+            "observations": k["obs"],
+            "silence_days": k["sil"],
+            "coverage_level": None,
+            "pressure_score": round(k["sil"] / k["obs"], 4),
+            "last_ts": k["last_ts"],
+        }
+    level = coverage_level(len(rows))
+    out = []
+    for row in rows.values():
+        row["coverage_level"] = level
+        out.append(row)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Incremental 30d temporal pressure per project_key")
+    ap.add_argument("--now", default=None, help="Window end (ISO-8601, default: current time)")
+    ap.add_argument("--out", default=str(OUT))
+    ap.add_argument("--state", default=str(STATE))
+    args = ap.parse_args()
+
+    now = datetime.fromisoformat(args.now.replace("Z", "+00:00")) if args.now else datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    state_path, out_path = Path(args.state), Path(args.out)
+
+    state = {}
+    if state_path.exists():
+        with state_path.open("r", encoding="utf-8") as f:
+            state = json.load(f)
+
+    touched = sync(state, now)
+    rows = emit(state, touched)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+    tmp.replace(out_path)
+
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = state_path.with_name(state_path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(state, f)
+    tmp.replace(state_path)
+
+    print(f"[CROVIA] temporal pressure: {len(touched)} keys updated, {len(rows)} in window")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Minimal test for batch badge rendering."""
+import json, tempfile
+from pathlib import Path
+
+import badge_generator as bg
+
+
+def test_compiled_templates_match_format():
+    kw = dict(width=200, width_inner=198, score=83, score_bg="#94A3B8", badge="SILVER",
+              badge_color="#94A3B8", viol_x=175, violations="NEC#9 NEC#10")
+    assert bg._RENDER_FULL(**kw) == bg.SVG_TEMPLATE.format(**kw)
+    assert bg._RENDER_COMPACT(score=5, badge_color="#EF4444") == bg.SVG_COMPACT.format(score=5, badge_color="#EF4444")
+    print("[OK] compiled templates")
+
+
+def test_generate_all_writes_every_model_in_order():
+    models = [(f"org/m{i}", ["NEC#1"] if i % 2 else [], 50 + i) for i in range(300)]
+    with tempfile.TemporaryDirectory() as d:
+        badges, cards = Path(d) / "badges", Path(d) / "cards"
+        assert bg.generate_all(models, workers=4, badges_dir=badges, cards_dir=cards)["count"] == 300
+
+        index = json.loads((badges / "index.json").read_text())
+        assert index["count"] == 300
+        assert [e["model_id"] for e in index["badges"]] == [m for m, _, _ in models]
+        assert len(list(badges.glob("*.svg"))) == 600 and len(list(cards.glob("*.json"))) == 300
+        assert not list(badges.glob("*.tmp")) and not list(cards.glob("*.tmp"))
+        card = json.loads((cards / "org__m7.json").read_text())
+        assert card["shadow_score"] == 57 and card["violations"] == ["NEC#1"]
+    print("[OK] batch generation")
+
+
+def test_unchanged_models_are_not_rewritten():
+    models = [(f"org/m{i}", ["NEC#1"], 70) for i in range(10)]
+    with tempfile.TemporaryDirectory() as d:
+        badges, cards = Path(d) / "badges", Path(d) / "cards"
+        run = lambda ms, **kw: bg.generate_all(ms, workers=2, badges_dir=badges, cards_dir=cards, **kw)
+        assert run(models)["written"] == 10
+        card_before = (cards / "org__m3.json").read_text()
+        index_before = (badges / "index.json").read_text()
+
+        assert run(models)["written"] == 0
+        assert (badges / "index.json").read_text() == index_before   # no timestamp churn
+
+        models[3] = ("org/m3", ["NEC#1", "NEC#2"], 70)
+        (badges / "org__m5_compact.svg").unlink()
+        assert run(models)["written"] == 2                          # changed + missing file
+        assert (cards / "org__m3.json").read_text() != card_before
+        assert run(models, force=True)["written"] == 10
+
+        manifest = json.loads((badges / "manifest.json").read_text())
+        (badges / "manifest.json").write_text(json.dumps({**manifest, "template_version": "old"}))
+        assert run(models)["written"] == 10                         # other template version: stale
+    print("[OK] skip unchanged")
+
+
+if __name__ == "__main__":
+    test_compiled_templates_match_format()
+    test_generate_all_writes_every_model_in_order()
+    test_unchanged_models_are_not_rewritten()
+    print("\n[OK] All tests passed")
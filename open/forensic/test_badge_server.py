@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Minimal test for the on-demand badge server (offline)."""
+import json, os, tempfile, threading
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from badge_server import BadgeServer
+
+
+def write_ranking(path, score):
+    models = [{"model_id": "org/model", "score": score, "top_gaps": ["NEC#9"], "rank": 1}]
+    path.write_text(json.dumps({"model_ranking": models}))
+
+
+def get(url, etag=None):
+    req = Request(url, headers={"If-None-Match": etag} if etag else {})
+    try:
+        with urlopen(req, timeout=5) as r:
+            return r.status, r.headers.get("ETag"), r.read()
+    except HTTPError as e:
+        return e.code, e.headers.get("ETag"), e.read()
+
+
+def test_render_revalidate_and_hot_reload():
+    with tempfile.TemporaryDirectory() as d:
+        ranking = Path(d) / "global_ranking.json"
+        write_ranking(ranking, 91.6)
+        srv = BadgeServer(("127.0.0.1", 0), ranking, ttl=60, cache_size=8, reload_secs=0,
+                          index_path=Path(d) / "ranking.idx")
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{srv.server_address[1]}"
+        try:
+            status, etag, body = get(f"{base}/badge/org/model.svg")
+            assert status == 200 and b">92<" in body and b"GOLD" in body
+            assert get(f"{base}/badge/org/model.svg", etag)[0] == 304
+            status, compact_etag, body = get(f"{base}/badge/org/model.svg?style=compact")
+            assert status == 200 and compact_etag != etag and b'width="120"' in body
+            status, _, body = get(f"{base}/card/org/model.json")
+            assert status == 200 and json.loads(body)["shadow_score"] == 92
+            assert get(f"{base}/badge/org/unknown.svg")[0] == 404
+
+            write_ranking(ranking, 61.0)
+            st = ranking.stat()
+            os.utime(ranking, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            status, new_etag, body = get(f"{base}/badge/org/model.svg", etag)
+            assert status == 200 and new_etag != etag and b"BRONZE" in body
+        finally:
+            srv.shutdown()
+            srv.server_close()
+    print("[OK] badge server")
+
+
+if __name__ == "__main__":
+    test_render_revalidate_and_hot_reload()
+    print("\n[OK] All tests passed")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Minimal test for CEP capsule bulk verification."""
+import hashlib, json, os, tempfile
+from pathlib import Path
+
+import cep_verify as cv
+
+
+def _write(path: Path, data: bytes) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+def _setup(d: Path):
+    root, caps = d / "core", d / "caps"
+    payouts = _write(root / "data" / "payouts.ndjson", b'{"p": 1}\n')
+    receipts = _write(root / "data" / "receipts.ndjson", b'{"r": 1}\n')
+    bundle = _write(root / "bundles" / "trust_bundle.json", b'{"b": 1}\n')
+    caps.mkdir()
+    (caps / "CEP-A.json").write_text(json.dumps({
+        "schema": "crovia_cep_capsule.v1", "fingerprint": "CEP-A",
+        "evidence": {"receipts": {"path": "data/receipts.ndjson", "sha256": receipts},
+                     "payouts": {"path": "data/payouts.ndjson", "sha256": payouts}},
+    }))
+    for name in ("CEP-B", "CEP-C"):
+        (caps / f"{name}.json").write_text(json.dumps({"crovia_evidence": {
+            "protocol": "CEP.v1", "trust_bundle": {"sha256": bundle},
+            "receipts": {"sha256": receipts}, "payouts": {"sha256": payouts},
+        }}))
+    return root, caps
+
+
+def test_shared_artifacts_hashed_once_and_table():
+    with tempfile.TemporaryDirectory() as d:
+        root, caps = _setup(Path(d))
+        out = cv.verify(cv.discover_capsules(caps), [root], Path(d) / "state.json", threads=4)
+        assert [r["ok"] for r in out["results"]] == [True, True, True]
+        assert out["stats"]["files_hashed"] == 3 and out["stats"]["unique_artifacts"] == 3
+        table = cv.format_table(out["results"])
+        assert "CEP-B" in table and "FAIL" not in table
+    print("[OK] dedupe + table")
+
+
+def test_incremental_rechecks_only_affected_capsules():
+    with tempfile.TemporaryDirectory() as d:
+        root, caps = _setup(Path(d))
+        state = Path(d) / "state.json"
+        run = lambda: cv.verify(cv.discover_capsules(caps), [root], state, incremental=True)
+        run()
+
+        again = run()
+        assert again["stats"]["files_hashed"] == 0 and again["stats"]["rechecked"] == 0
+        assert all(r["cached"] and r["ok"] for r in again["results"])
+
+        # tamper with the trust bundle: only the CEP.v1 capsules cite it
+        (root / "bundles" / "trust_bundle.json").write_bytes(b'{"b": 2}\n')
+        out = run()
+        assert out["stats"]["files_hashed"] == 1 and out["stats"]["rechecked"] == 2
+        res = {r["capsule"]: r for r in out["results"]}
+        assert res["CEP-A"]["cached"] and res["CEP-A"]["ok"]
+        assert not res["CEP-B"]["ok"]
+        assert [c["status"] for c in res["CEP-B"]["checks"]] == ["MISSING", "OK", "OK"]
+
+        # a path reference that no longer matches is a mismatch, not a miss
+        (root / "data" / "receipts.ndjson").write_bytes(b"tampered\n")
+        os.utime(root / "data" / "receipts.ndjson", ns=(1, 1))
+        res = {r["capsule"]: r for r in run()["results"]}
+        assert res["CEP-A"]["checks"][0]["status"] == "MISMATCH" and not res["CEP-A"]["cached"]
+    print("[OK] incremental")
+
+
+if __name__ == "__main__":
+    test_shared_artifacts_hashed_once_and_table()
+    test_incremental_rechecks_only_affected_capsules()
+    print("\n[OK] All tests passed")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Minimal test for hash-first DDF drift detection."""
+import copy, json, tempfile
+from pathlib import Path
+
+import ddf_drift as dd
+
+EVENTS = Path(__file__).resolve().parents[1] / "drift" / "ddf_drift_events_30d.jsonl"
+
+
+def _snap(tid, ddf, tags, downloads, license="mit", access="ok"):
+    return {"schema": "crovia.open.ddf_snapshot.v3", "target_id": tid, "tipo_target": "model",
+            "observed_at": "2026-05-17T07:00:00Z",
+            "sources": {"hf_api": {"http_status": 200}, "hf_readme": {"http_status": 200}},
+            "extracted": {"license": license, "tags_count": len(tags), "tags_sample": tags, "readme_access": access},
+            "popularity": {"downloads": downloads, "likes": 1},
+            "hashes": {"card_hash": "c" * 64, "readme_hash": None, "ddf_hash": ddf}}
+
+
+def test_hash_gate_and_field_diff():
+    det = dd.DriftDetector()
+    assert det.detect([_snap("org/a", "h1", ["x", "y"], 10), _snap("org/b", "h1", [], 5)]) == [None, None]
+    # same hash: no diff even though fields differ (the hash is authoritative)
+    assert det.observe(_snap("org/a", "h1", ["z"], 99)) is None
+
+    ev = det.observe(_snap("org/a", "h2", ["y", "z"], 15, license="apache-2.0", access="forbidden"))
+    assert ev["prev_ddf_hash"] == "h1" and ev["new_ddf_hash"] == "h2"
+    assert ev["changes"] == {
+        "tags": {"before_count": 2, "after_count": 2, "added": ["z"], "removed": ["x"]},
+        "downloads": {"before": 10, "after": 15, "delta": 5},
+        "license": {"before": "mit", "after": "apache-2.0"},
+        "readme_access": {"before": "OK", "after": "FORBIDDEN"},
+    }
+    assert ev["coverage"] == {"readme_access": "FORBIDDEN"} and ev["quality"]["data_quality_ok"] is False
+
+    with EVENTS.open() as f:
+        published = json.loads(f.readline())
+    assert list(ev) == list(published)
+    print("[OK] hash gate + field diff")
+
+
+def test_batch_pool_duplicates_and_state_roundtrip():
+    base = [_snap(f"org/m{i}", f"h{i}", ["t"], i) for i in range(40)]
+    det = dd.DriftDetector()
+    det.detect(base)
+
+    batch = [_snap(f"org/m{i}", f"h{i}" if i % 2 else f"n{i}", ["t", "u"], i + 1) for i in range(40)]
+    batch.append(_snap("org/m0", "n0b", ["t"], 7))            # second row for the same target
+    old_min, dd.PARALLEL_MIN = dd.PARALLEL_MIN, 4
+    try:
+        events = det.detect(copy.deepcopy(batch), workers=2)
+    finally:
+        dd.PARALLEL_MIN = old_min
+    assert sum(e is not None for e in events) == 21
+    assert events[0]["new_ddf_hash"] == "n0" and events[-1]["prev_ddf_hash"] == "n0"
+    assert events[-1]["changes"]["tags"]["removed"] == ["u"]
+
+    with tempfile.TemporaryDirectory() as d:
+        det.save(Path(d) / "state.json")
+        again = dd.DriftDetector.load(Path(d) / "state.json")
+        assert again.detect(batch[1:40]) == [None] * 39
+        assert again.observe(_snap("org/m2", "n2x", ["t"], 3))["changes"]["tags"]["removed"] == ["u"]
+    print("[OK] batch + state")
+
+
+if __name__ == "__main__":
+    test_hash_gate_and_field_diff()
+    test_batch_pool_duplicates_and_state_roundtrip()
+    print("\n[OK] All tests passed")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Minimal test for the columnar DDF store."""
+import hashlib, tempfile
+from pathlib import Path
+
+import ddf_store as ds
+
+
+def _h(s: str) -> str:
+    return hashlib.sha256(s.encode()).hexdigest()
+
+
+def _snap(tid: str, tipo: str, ts: str, rev: int = 0):
+    return {"schema": "crovia.open.ddf_snapshot.v3", "target_id": tid, "tipo_target": tipo, "observed_at": ts,
+            "sources": {"hf_api": {"http_status": 200}}, "extracted": {"license": "mit"},
+            "hashes": {"card_hash": _h(f"card{tid}{rev}"), "readme_hash": None, "ddf_hash": _h(f"ddf{tid}{rev}")}}
+
+
+def test_append_latest_and_pushdown():
+    rows = [_snap(f"org/m{i}", "model" if i % 3 else "dataset", f"2026-05-{10 + i % 3:02d}T07:00:00Z")
+            for i in range(60)]
+    with tempfile.TemporaryDirectory() as d:
+        store = ds.DDFStore(Path(d))
+        assert store.append("snapshots", rows) == 60
+        assert store.days("snapshots") == ["2026-05-10", "2026-05-11", "2026-05-12"]
+        assert store.append("snapshots", rows) == 0                       # re-sync is idempotent
+
+        assert store.latest("org/m4")["hashes"]["ddf_hash"] == _h("ddforg/m40")
+        assert store.latest("org/nope") is None
+
+        got = list(store.scan("snapshots", tipo_target="model", since="2026-05-11", until="2026-05-12"))
+        want = [r for r in rows if r["tipo_target"] == "model" and r["observed_at"].startswith("2026-05-11")]
+        assert len(want) == 20
+        assert sorted(r["target_id"] for r in got) == sorted(r["target_id"] for r in want)
+        assert [r["target_id"] for r in store.scan("snapshots", ddf_hash=_h("ddforg/m70"))] == ["org/m7"]
+        assert list(store.scan("snapshots", card_hash=_h("absent"))) == []
+
+        # footer stats prune parts before any column block is read
+        part = ds.Part(store.parts("snapshots", "2026-05-10")[0])
+        assert not part.may_match({"space"}, None, None, {})
+        assert not part.may_match(None, "2026-06-01", None, {})
+    print("[OK] append + latest + pushdown")
+
+
+def test_hourly_append_and_compaction_keep_latest_index():
+    with tempfile.TemporaryDirectory() as d:
+        store = ds.DDFStore(Path(d))
+        store.append("snapshots", [_snap("org/a", "model", "2026-05-10T01:00:00Z"),
+                                   _snap("org/b", "model", "2026-05-10T01:00:00Z")])
+        store.append("snapshots", [_snap("org/a", "model", "2026-05-10T02:00:00Z", rev=1),
+                                   _snap("org/b", "model", "2026-05-10T01:00:00Z")])  # b unchanged
+        assert len(store.parts("snapshots", "2026-05-10")) == 2
+        assert store.latest("org/a")["hashes"]["ddf_hash"] == _h("ddforg/a1")
+
+        assert store.compact("snapshots", "2026-05-10")
+        assert len(store.parts("snapshots", "2026-05-10")) == 1
+        fresh = ds.DDFStore(Path(d))                                       # index reloaded from disk
+        assert fresh.latest("org/a")["hashes"]["ddf_hash"] == _h("ddforg/a1")
+        assert fresh.latest("org/b")["observed_at"] == "2026-05-10T01:00:00Z"
+        assert len(list(fresh.scan("snapshots"))) == 3
+    print("[OK] hourly append + compaction")
+
+
+if __name__ == "__main__":
+    test_append_latest_and_pushdown()
+    test_hourly_append_and_compaction_keep_latest_index()
+    print("\n[OK] All tests passed")
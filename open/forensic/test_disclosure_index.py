@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Minimal test for disclosure index partials and the one-pass rebuild."""
+import json, os, shutil, tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import disclosure_index as di
+
+
+def _snap(tid, kind="model", training=False, declared=None, license="mit", access="ok", downloads=None, gated=False):
+    return {"target_id": tid, "tipo_target": kind,
+            "extracted": {"license": license, "declared_datasets": declared,
+                          "has_training_section": training, "readme_access": access},
+            "popularity": {"downloads": downloads}, "access": {"gated": gated}}
+
+
+def _event(tid, ts):
+    return {"target_id": tid, "tipo_target": "model", "observed_at": ts,
+            "prev_ddf_hash": "a", "new_ddf_hash": "b", "changes": {}}
+
+
+def test_published_partials_roundtrip_and_cache():
+    with tempfile.TemporaryDirectory() as d:
+        reports = Path(d) / "reports"
+        shutil.copytree(di.REPORTS, reports)
+        for p in sorted(reports.glob("disclosure_index_*.json")):
+            doc = json.loads(p.read_text())
+            sec = di.sections(di.partial_from_index(doc))
+            assert sec["disclosure_observations"] == doc["disclosure_observations"], p.name
+            assert sec["drift_observations"] == doc["drift_observations"], p.name
+            assert di.fingerprint(doc) == doc["index_fingerprint"]
+
+        cache = di.PartialCache(Path(d) / "partials.json", reports)
+        out = di.trend(cache, "2026-W06", "2026-W07")
+        cache.save()
+        w6, w7 = (json.loads((reports / f"disclosure_index_2026-W0{i}.json").read_text()) for i in (6, 7))
+        n = w6["coverage"]["targets_monitored"] + w7["coverage"]["targets_monitored"]
+        tr = sum(w["disclosure_observations"]["training_section"]["present"] for w in (w6, w7))
+        assert out["range"]["n_weeks"] == 2 and out["range"]["coverage"] == {
+            "target_weeks": n, "model_weeks": w6["coverage"]["models"] + w7["coverage"]["models"],
+            "dataset_weeks": w6["coverage"]["datasets"] + w7["coverage"]["datasets"]}
+        assert out["range"]["disclosure_observations"]["training_section"]["present_pct"] == round(100 * tr / n, 1)
+
+        # cached partials are served without reopening; a touched file is re-read
+        again = di.PartialCache(Path(d) / "partials.json", reports)
+        again.weeks["2026-W06"]["partial"]["targets"] = -1
+        assert again.get("2026-W06")["targets"] == -1 and not again.dirty
+        os.utime(reports / "disclosure_index_2026-W06.json", ns=(1, 1))
+        assert again.get("2026-W06")["targets"] == w6["coverage"]["targets_monitored"] and again.dirty
+    print("[OK] partials + cache")
+
+
+def test_range_drift_is_not_inflated():
+    # three weekly indexes seeing the same 30-day window of 12 events, 4 of them per week
+    week = {**dict.fromkeys(di.COUNTS, 0), "targets": 100, "drift_events_30d": 12, "drift_events_7d": 4,
+            "changed_targets_30d": 5}
+    rng = di.range_sections(di.merge([week] * 3), 3)
+    assert rng["drift_observations"] == {"events": 12, "avg_events_per_week": 4.0}
+    assert rng["coverage"]["target_weeks"] == 300 and "period_days" not in rng["coverage"]
+
+    with tempfile.TemporaryDirectory() as d:
+        published = di.trend(di.PartialCache(Path(d) / "partials.json"), "2026-W06", "2026-W20")
+    drift = published["range"]["drift_observations"]
+    assert drift["events"] == sum(w["drift_observations"]["events_7d"] for w in published["weeks"].values())
+    assert drift["events"] < sum(w["drift_observations"]["events_30d"] for w in published["weeks"].values())
+    print("[OK] range drift")
+
+
+def test_one_pass_rebuild():
+    snaps = [_snap("org/a", training=True, declared=["x", "y"], downloads=50_000),
+             _snap("org/b", downloads=20_000, access="forbidden", gated="manual"),
+             _snap("lab/c", kind="dataset", license=None, access="not_found", downloads=5),
+             _snap("org/d", declared="wiki")]
+    events = [_event("org/a", "2026-05-01T00:00:00Z"), _event("org/a", "2026-05-09T00:00:00Z"),
+              _event("org/b", "2026-05-10T00:00:00Z"), _event("org/z", "2026-03-01T00:00:00Z")]
+    now = datetime(2026, 5, 11, 8, 0, tzinfo=timezone.utc)
+    counts, tops = di.scan(iter(snaps), iter(events), now)
+    doc = di.render(counts, tops, now)
+
+    assert doc["week_id"] == "2026-W20" and doc["coverage"]["models"] == 3
+    assert doc["disclosure_observations"]["declared_datasets"]["with_declaration"] == 2
+    assert doc["disclosure_observations"]["readme_access"] == {"ok": 2, "not_found": 1, "forbidden": 1, "ok_pct": 50.0}
+    assert doc["drift_observations"] == {"events_30d": 3, "events_7d": 2, "targets_with_change_30d": 2,
+                                         "avg_changes_per_changed_target": 1.5}
+    assert doc["top_movers_30d"][0] == {"target_id": "org/a", "change_count": 2}
+    assert [e["observed_at"][:10] for e in doc["recent_changes_7d"]] == ["2026-05-10", "2026-05-09"]
+    pop = doc["popularity_observations"]
+    assert [t["target_id"] for t in pop["top_by_downloads"]] == ["org/a", "org/b", "lab/c"]
+    assert pop["top_by_downloads"][0]["declared_datasets_count"] == 2 and pop["gated_targets"] == 1
+    assert pop["high_download_training_absent"] == [
+        {"target_id": "org/b", "tipo_target": "model", "downloads": 20_000, "readme_access": "FORBIDDEN"}]
+    assert doc["by_organization"][0]["organization"] == "org" and doc["by_organization"][0]["targets_monitored"] == 3
+
+    published = json.loads((di.REPORTS / "disclosure_index_latest.json").read_text())
+    assert list(doc) == list(published) and doc["index_fingerprint"] == di.fingerprint(doc)
+    assert di.partial_from_index(doc) == counts
+    print("[OK] one-pass rebuild")
+
+
+if __name__ == "__main__":
+    test_published_partials_roundtrip_and_cache()
+    test_range_drift_is_not_inflated()
+    test_one_pass_rebuild()
+    print("\n[OK] All tests passed")
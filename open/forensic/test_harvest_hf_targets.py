@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Minimal test for the paged HF harvester against a local fake listing."""
+import json, tempfile, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from harvest_hf_targets import harvest_kind, load_cursor, save_cursor
+from hf_client import HFClient
+from watchlist_store import WatchlistStore
+
+# newest-modified first, like ?sort=lastModified&direction=-1
+LISTING = {
+    "models": [{"id": f"org/m{i}", "lastModified": f"2026-05-{30 - i:02d}T00:00:00.000Z"} for i in range(7)],
+    "datasets": [],
+}
+
+
+class FakeListing(BaseHTTPRequestHandler):
+    def do_GET(self):
+        u = urlsplit(self.path)
+        q = parse_qs(u.query)
+        items = LISTING[u.path.rsplit("/", 1)[-1]]
+        start, limit = int(q.get("cursor", ["0"])[0]), int(q["limit"][0])
+        body = json.dumps(items[start:start + limit]).encode()
+        self.send_response(200)
+        if start + limit < len(items):
+            nxt = f"http://{self.headers['Host']}{u.path}?limit={limit}&cursor={start + limit}"
+            self.send_header("Link", f'<{nxt}>; rel="next"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_paged_harvest_resumes_and_is_incremental():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), FakeListing)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            d = Path(d)
+            client = HFClient(f"http://127.0.0.1:{srv.server_address[1]}", rate_per_host=0)
+            cursor_path = d / "cursor.json"
+
+            def run(max_pages=0):
+                cursor = load_cursor(cursor_path)
+                with WatchlistStore(d / "db.sqlite", d / "watchlist.jsonl", d / "presence.jsonl") as store:
+                    return harvest_kind(
+                        client, store, "model", cursor.setdefault("model", {}),
+                        save=lambda: save_cursor(cursor_path, cursor), page_size=3, max_pages=max_pages,
+                    )
+
+            assert run(max_pages=1) == 3                       # stopped mid-pass
+            assert load_cursor(cursor_path)["model"]["next_url"]
+            assert run() == 4                                  # resumed from cursor
+            assert load_cursor(cursor_path)["model"]["since"] == "2026-05-30T00:00:00.000Z"
+
+            LISTING["models"].insert(0, {"id": "org/new", "lastModified": "2026-06-01T00:00:00.000Z"})
+            assert run() == 1                                  # stops at `since` on page 1
+            hints = [json.loads(l)["project_hint"] for l in (d / "watchlist.jsonl").read_text().splitlines()]
+            assert hints[-1] == "hf:model:org/new" and len(hints) == 8
+    finally:
+        srv.shutdown()
+    print("[OK] paged harvest")
+
+
+if __name__ == "__main__":
+    test_paged_harvest_resumes_and_is_incremental()
+    print("\n[OK] All tests passed")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Minimal test for hf_client against a local HF stand-in."""
+import json, tempfile, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from hf_client import HFClient, HTTPCache
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """Serves /api/{models,datasets}/<id>; ids starting with 'flaky' 429 once,
+    ids starting with 'etag' carry an ETag and answer If-None-Match with 304."""
+    seen = set()
+
+    def do_GET(self):
+        kind, _, tid = self.path[len("/api/"):].partition("/")
+        if tid.startswith("flaky") and self.path not in StandIn.seen:
+            StandIn.seen.add(self.path)
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        if tid.startswith("missing"):
+            self.send_response(404)
+            self.end_headers()
+            return
+        # answer slow ids late so completion order differs from input order
+        if tid.startswith("slow"):
+            time.sleep(0.2)
+        if tid.startswith("etag") and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({"id": tid, "kind": kind}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if tid.startswith("etag"):
+            self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, f"http://127.0.0.1:{srv.server_address[1]}"
+
+
+def test_fetch_many_keeps_order_and_retries():
+    srv, base = serve()
+    try:
+        client = HFClient(base, rate_per_host=0, backoff=0.01)
+        items = [("model", "slow/a"), ("model", "flaky/b"), ("dataset", "missing/c"), ("dataset", "d/e")]
+        out = list(client.fetch_many(items, workers=4))
+    finally:
+        srv.shutdown()
+
+    assert [(k, t) for k, t, _, _ in out] == items
+    _, _, j, meta = out[1]
+    assert j == {"id": "flaky/b", "kind": "models"} and meta["attempts"] == 2
+    _, _, j, meta = out[2]
+    assert j is None and meta["error"] == "HTTP 404"
+    assert out[3][3]["url"] == f"{base}/api/datasets/d/e"
+    print("[OK] ordered fetch with retry")
+
+
+def test_cache_revalidates_and_keeps_extra():
+    srv, base = serve()
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            client = HFClient(base, rate_per_host=0, cache=HTTPCache(d))
+            j1, m1 = client.fetch("model", "etag/a")
+            assert m1["cache"] == "miss" and m1["http_status"] == 200
+            client.cache.attach(m1["url"], "probe", {"oracle": {"score": 1}})
+
+            j2, m2 = client.fetch("model", "etag/a")
+            assert m2["cache"] == "not_modified" and m2["http_status"] == 304
+            assert j2 == j1 and m2["content_sha256"] == m1["content_sha256"]
+            assert client.cache.extra(m2["url"], "probe") == {"oracle": {"score": 1}}
+
+            # no validators: a second 200 with identical bytes is "unchanged"
+            _, m3 = client.fetch("dataset", "plain/b")
+            _, m4 = client.fetch("dataset", "plain/b")
+            assert (m3["cache"], m4["cache"]) == ("miss", "unchanged")
+    finally:
+        srv.shutdown()
+    print("[OK] conditional cache")
+
+
+if __name__ == "__main__":
+    test_fetch_many_keeps_order_and_retries()
+    test_cache_revalidates_and_keeps_extra()
+    print("\n[OK] All tests passed")
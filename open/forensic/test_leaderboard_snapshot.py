@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Minimal test for the weekly leaderboard snapshot generator."""
+import csv, hashlib, json, tempfile
+from pathlib import Path
+
+import leaderboard_snapshot as lb
+
+PUBLISHED = Path(__file__).resolve().parents[2] / "leaderboard" / "2026-W31"
+
+
+def _ledger(path: Path):
+    rows = [
+        {"target_id": "acme/a", "ts": "2026-01-01T10:00:00Z", "axiom_type": "AX.ABS"},
+        {"target_id": "beta/b", "ts": "2026-01-01T09:00:00Z", "axiom_type": "AX.ABS"},   # ties acme/a, later in ledger
+        {"target_id": "acme/c", "ts": "2026-02-01T00:00:00Z", "axiom_type": "AX.ABS"},
+        {"target_id": "acme/a", "ts": "2026-03-01T00:00:00Z", "axiom_type": "AX.PRES"},  # last_seen only
+        {"target_id": "acme/d", "ts": "2026-03-01T00:00:00Z", "axiom_type": "AX.PRES"},  # never absent
+        {"target_id": "no-slash", "ts": "2026-01-01T00:00:00Z", "axiom_type": "AX.ABS"},  # not a real target
+        {"target_id": "gamma/e", "ts": "2026-07-26T00:00:00Z"},
+        {"target_id": "late/f", "ts": "2026-08-01T00:00:00Z", "axiom_type": "AX.ABS"},   # after W31
+    ]
+    with path.open("w", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps(r) + "\n")
+
+
+def test_week_from_ledger():
+    assert lb.week_instant("2026-W31").isoformat() == "2026-07-27T02:13:00+00:00"
+    assert lb.week_range("2026-W52:2027-W01") == ["2026-W52", "2026-W53", "2027-W01"]
+
+    with tempfile.TemporaryDirectory() as d:
+        ledger, out = Path(d) / "ledger.jsonl", Path(d) / "lb"
+        _ledger(ledger)
+        assert lb.generate_week(ledger, "2026-W31", out, k=3) == ("2026-W31", "written")
+        assert lb.generate_week(ledger, "2026-W31", out, k=3) == ("2026-W31", "exists")
+
+        week = out / "2026-W31"
+        snap = json.loads((week / "snapshot.json").read_text())
+        assert list(snap) == list(json.loads((PUBLISHED / "snapshot.json").read_text()))
+        assert snap["n_real_targets"] == 4 and snap["ledger_lines_at_snapshot"] == 7
+        assert snap["total_silence_days"] == 206 + 206 + 176 + 1
+        assert snap["median_silence_days"] == 206 and snap["mean_silence_days"] == 147
+        assert snap["top_silent"] == {"target_id": "acme/a", "first_seen": "2026-01-01T10:00:00Z",
+                                      "last_seen": "2026-03-01T00:00:00Z", "silence_days": 206}
+        for name in ("top_silent.csv", "vendors.csv"):
+            assert snap["sha256"][name] == hashlib.sha256((week / name).read_bytes()).hexdigest()
+
+        top = list(csv.reader((week / "top_silent.csv").open(newline="")))
+        assert [r[1] for r in top[1:]] == ["acme/a", "beta/b", "acme/c"]
+        vendors = list(csv.reader((week / "vendors.csv").open(newline="")))
+        assert vendors[1:] == [["acme", "2", "206", "206"], ["beta", "1", "206", "206"]]
+        assert (week / "README.md").read_text().count("`acme/a` — 206 days, since 2026-01-01") == 1
+    print("[OK] week from ledger")
+
+
+def test_published_format_roundtrip():
+    with (PUBLISHED / "top_silent.csv").open(newline="") as f:
+        rows = list(csv.DictReader(f))
+    top = [{"target_id": r["target_id"], "silence_days": int(r["silence_days"])} for r in rows]
+    vendors = lb.to_csv(["vendor", "n_silent_models_in_top100", "median_silence_days", "max_silence_days"],
+                        lb.vendor_rows(top))
+    assert vendors == (PUBLISHED / "vendors.csv").read_bytes()
+    top_csv = lb.to_csv(list(rows[0]), ([r[k] for k in r] for r in rows))
+    assert top_csv == (PUBLISHED / "top_silent.csv").read_bytes()
+    print("[OK] published format")
+
+
+if __name__ == "__main__":
+    test_week_from_ledger()
+    test_published_format_roundtrip()
+    print("\n[OK] All tests passed")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Minimal test for incremental ledger_status windows."""
+import json, shutil, tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import ledger_status as ls
+
+NOW = datetime(2026, 3, 10, 12, 30, 15, 500000, tzinfo=timezone.utc)
+
+
+def _write(path, times, mode="w"):
+    with path.open(mode, encoding="utf-8") as f:
+        for t in times:
+            f.write(json.dumps({"observed_at": t.isoformat(), "project_key": "k"}) + "\n")
+
+
+def _full_scan(times):
+    return {name: sum(1 for t in times if NOW - t < span) for name, span in ls.WINDOWS.items()}
+
+
+def test_window_edges_are_exact():
+    times = [NOW - timedelta(hours=24),                              # exactly 24h old: out
+             NOW - timedelta(hours=24) + timedelta(microseconds=1),  # just inside
+             NOW - timedelta(hours=24, minutes=30),                  # same hour bucket as the edge: out
+             NOW - timedelta(hours=1, minutes=10),                   # out of 1h, in 24h
+             NOW - timedelta(minutes=59, seconds=59),
+             NOW + timedelta(minutes=5)]                             # clock skew counts, as before
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "absence.jsonl"
+        _write(path, times)
+        st = {}
+        ls.update_absence(st, NOW, path)
+        got = ls.window_counts(st["buckets"], NOW)
+    assert got == _full_scan(times) == {"1h": 2, "24h": 4, "7d": 6, "30d": 6}
+    print("[OK] window edges")
+
+
+def test_append_copy_and_rolling_rewrite():
+    old = [NOW - timedelta(days=9, minutes=7 * i) for i in range(20)]
+    week = sorted(NOW - timedelta(hours=5 * i, seconds=i) for i in range(30))  # the ledger is chronological
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "absence.jsonl"
+        _write(path, old + week[:10])
+        st = {}
+        ls.update_absence(st, NOW, path)
+
+        # appended: only the new rows are parsed
+        _write(path, week[10:20], "a")
+        assert len(list(ls.read_new(path, dict(st)))) == 10
+        ls.update_absence(st, NOW, path)
+        assert ls.window_counts(st["buckets"], NOW) == _full_scan(old + week[:20])
+
+        # same bytes copied over the file (cp -f) plus an append: still incremental
+        copy = Path(d) / "copy.jsonl"
+        shutil.copyfile(path, copy)
+        _write(copy, week[20:25], "a")
+        copy.replace(path)
+        probe = dict(st)
+        assert len(list(ls.read_new(path, probe))) == 5 and probe["rescan"] is False
+        ls.update_absence(st, NOW, path)
+
+        # last consumed row rewritten in place (same size): caught by the tail fingerprint
+        data = path.read_bytes()
+        assert data.endswith(b'"k"}\n')
+        path.write_bytes(data[:-5] + b'"j"}\n')
+        probe = dict(st)
+        list(ls.read_new(path, probe))
+        assert probe["rescan"] is True
+        path.write_bytes(data)
+
+        # rolling export: old rows dropped, new ones added -> rescan, nothing counted twice or lost
+        _write(path, week[10:])
+        probe = dict(st)
+        list(ls.read_new(path, probe))
+        assert probe["rescan"] is True
+        ls.update_absence(st, NOW, path)
+        assert ls.window_counts(st["buckets"], NOW) == _full_scan(old + week)
+    print("[OK] append / copy / rewrite")
+
+
+if __name__ == "__main__":
+    test_window_edges_are_exact()
+    test_append_copy_and_rolling_rewrite()
+    print("\n[OK] All tests passed")
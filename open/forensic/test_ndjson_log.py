@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Minimal test for the rotating NDJSON log."""
+import gzip, json, os, tempfile
+from pathlib import Path
+
+from ndjson_log import NDJSONLog, read_index, read_range
+
+
+def rec(i, day=1):
+    return {"ts": f"2026-01-{day:02d}T00:{i // 60:02d}:{i % 60:02d}+00:00", "i": i}
+
+
+def test_size_rotation_index_and_range_read():
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "log.jsonl"
+        with NDJSONLog(path, max_bytes=2000, block_lines=5) as log:
+            for i in range(100):
+                log.write(rec(i))
+
+        index = read_index(Path(d) / "log.segments.jsonl")
+        assert len(index) > 1 and index[0]["segment"] == "log.000001.jsonl.gz"
+        assert sum(e["lines"] for e in index) + len(path.read_text().splitlines()) == 100
+        # every segment is plain gzip as a whole, and every block decodes on its own
+        seg = Path(d) / index[1]["segment"]
+        assert len(gzip.decompress(seg.read_bytes()).splitlines()) == index[1]["lines"]
+        assert index[1]["blocks"][1]["line"] == 5
+
+        assert [r["i"] for r in read_range(path)] == list(range(100))
+        got = [r["i"] for r in read_range(path, since=rec(37)["ts"], until=rec(61)["ts"])]
+        assert got == list(range(37, 62))
+    print("[OK] size rotation + range read")
+
+
+def test_daily_rotation_and_interrupted_rotation():
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "log.jsonl"
+        with NDJSONLog(path, rotate_daily=True) as log:
+            log.write(rec(0, day=1))
+        with NDJSONLog(path, rotate_daily=True) as log:   # reopened: day comes from the file
+            log.write(rec(1, day=1))
+            log.write(rec(2, day=2))
+        index = read_index(Path(d) / "log.segments.jsonl")
+        assert [(e["first_ts"][:10], e["lines"]) for e in index] == [("2026-01-01", 2)]
+
+        # crash between rename and sealing: next open finishes the rotation
+        os.replace(path, Path(d) / "log.jsonl.rotating")
+        with NDJSONLog(path) as log:
+            log.write(rec(3, day=3))
+        assert [r["i"] for r in read_range(path)] == [0, 1, 2, 3]
+        assert not (Path(d) / "log.jsonl.rotating").exists()
+        assert json.loads(path.read_text())["i"] == 3
+    print("[OK] daily rotation + recovery")
+
+
+def test_since_spanning_block_boundary():
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "log.jsonl"
+        # records 3..7 share one ts; block_lines=5 puts 3-4 and 5-7 in different blocks
+        with NDJSONLog(path, block_lines=5, buffer_bytes=0) as log:
+            for i in range(20):
+                log.write({"ts": rec(3 if 3 <= i <= 7 else i)["ts"], "i": i})
+                if i == 0:   # unbuffered: the row is in the file before close
+                    assert json.loads(path.read_text())["i"] == 0
+            log.rotate()
+        assert read_index(Path(d) / "log.segments.jsonl")[0]["blocks"][1]["line"] == 5
+        assert [r["i"] for r in read_range(path, since=rec(3)["ts"])] == list(range(3, 20))
+        assert [r["i"] for r in read_range(path, since=rec(3)["ts"], until=rec(3)["ts"])] == [3, 4, 5, 6, 7]
+    print("[OK] since across a block boundary")
+
+
+if __name__ == "__main__":
+    test_size_rotation_index_and_range_read()
+    test_daily_rotation_and_interrupted_rotation()
+    test_since_spanning_block_boundary()
+    print("\n[OK] All tests passed")
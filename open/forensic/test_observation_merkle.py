@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Minimal test for the observation Merkle tree and inclusion proofs."""
+import hashlib, json, subprocess, sys, tempfile
+from pathlib import Path
+
+from observation_merkle import MerkleStore, leaf_hash, node_hash, sort_key, verify_proof
+
+
+def reference_root(pairs):
+    level = [leaf_hash(o, r) for o, r in sorted(pairs, key=lambda p: sort_key(p[0]))]
+    while len(level) > 1:
+        level = [node_hash(level[j], level[j + 1]) if j + 1 < len(level) else level[j]
+                 for j in range(0, len(level), 2)]
+    return level[0].hex()
+
+
+def pair(i):
+    return str(i), hashlib.sha256(f"receipt-{i}".encode()).hexdigest()
+
+
+def test_build_append_prove_verify():
+    with tempfile.TemporaryDirectory() as d, MerkleStore(Path(d) / "m.sqlite") as store:
+        pairs = [pair(i) for i in range(1, 1001) if i != 500]
+        assert store.add(reversed(pairs)) == 999
+        assert store.root() == reference_root(pairs)
+
+        more = [pair(i) for i in range(1001, 1096)]           # hourly append, sorts after
+        assert store.add(more + pairs[:3]) == 95              # known ids are no-ops
+        assert store.root() == reference_root(pairs + more)
+
+        late = pair(500)                                      # sorts inside -> rebuild
+        assert store.add([late]) == 1 and store.prove("500")["leaf_index"] == 499
+        everything = pairs + more + [late]
+        assert store.root() == reference_root(everything)
+
+        for oid in ["1", "2", "77", "500", "1000", "1095"]:
+            proof = store.prove(oid)
+            assert verify_proof(proof, store.root()), oid
+        proof = store.prove("77")
+        assert not verify_proof({**proof, "receipt_hash": "0" * 64})
+        assert not verify_proof({**proof, "leaf_index": 78})
+        assert not verify_proof({**proof, "path": proof["path"][:-1]})
+        assert store.prove("nope") is None
+
+        try:
+            store.add([("77", "f" * 64)])
+            raise AssertionError("conflicting receipt accepted")
+        except ValueError:
+            pass
+    print("[OK] merkle build / append / proofs")
+
+
+def test_cli_verify_defaults_to_proof_root():
+    script = Path(__file__).resolve().parent / "observation_merkle.py"
+    with tempfile.TemporaryDirectory() as d:
+        with MerkleStore(Path(d) / "m.sqlite") as store:
+            store.add(pair(i) for i in range(1, 40))
+            proof = store.prove("7")
+        (Path(d) / "ok.json").write_text(json.dumps(proof))
+        (Path(d) / "bad.json").write_text(json.dumps({**proof, "receipt_hash": "0" * 64}))
+        run = lambda *a: subprocess.run([sys.executable, str(script), "verify", *a], capture_output=True, text=True)
+        ok = run(str(Path(d) / "ok.json"))
+        assert ok.returncode == 0 and "VALID" in ok.stdout, ok.stdout
+        assert run(str(Path(d) / "bad.json")).returncode == 1
+        assert run(str(Path(d) / "ok.json"), "--root", "0" * 64).returncode == 1
+    print("[OK] cli verify")
+
+
+if __name__ == "__main__":
+    test_build_append_prove_verify()
+    test_cli_verify_defaults_to_proof_root()
+    print("\n[OK] All tests passed")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Minimal test for the oracle_hf_probe pipeline with a stub oracle and client."""
+import json, sys, tempfile, time, types
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# the PRO engine is not part of the open tree: register a stand-in before import
+if "croviapro.oracle.omission_oracle" not in sys.modules:
+    try:
+        import croviapro.oracle.omission_oracle  # noqa: F401
+    except ImportError:
+        stub = types.ModuleType("croviapro.oracle.omission_oracle")
+        stub.OmissionOracle = object
+        for name in ("croviapro", "croviapro.oracle"):
+            sys.modules[name] = types.ModuleType(name)
+        sys.modules["croviapro.oracle.omission_oracle"] = stub
+
+import oracle_hf_probe as probe
+from ndjson_log import NDJSONLog
+
+
+class StubResult:
+    def __init__(self, tid):
+        self.tid = tid
+
+    def to_dict(self):
+        return {"target": self.tid, "declarations": {}}
+
+
+class StubOracle:
+    """Slow on ids ending in 0 (so pool results complete out of order); fails on 'bad/' ids."""
+
+    def analyze_model(self, api_json, generate_evidence=True):
+        if api_json["id"].startswith("bad/"):
+            raise ValueError("broken card")
+        if api_json["id"].endswith("0"):
+            time.sleep(0.05)
+        return StubResult(api_json["id"])
+
+    analyze_dataset = analyze_model
+
+
+class StubClient:
+    """fetch_many in item order; ids starting with 'gone/' fail to fetch."""
+    cache = None
+
+    def fetch_many(self, items, workers=8):
+        for kind, tid in items:
+            meta = {"url": f"https://hf.test/api/{kind}s/{tid}", "http_status": 200}
+            if tid.startswith("gone/"):
+                yield kind, tid, None, {**meta, "http_status": 404, "error": "HTTP 404"}
+            else:
+                yield kind, tid, {"id": tid}, meta
+
+
+class ListWriter:
+    def __init__(self):
+        self.rows = []
+
+    def write(self, row):
+        self.rows.append(row)
+
+
+def _init_stub_worker():
+    probe._WORKER_ORACLE = StubOracle()
+
+
+ITEMS = [("model", f"org/m{i}") for i in range(12)] + [("model", "gone/x"), ("dataset", "bad/d"),
+                                                         ("dataset", "org/d10"), ("dataset", "gone/y")]
+
+
+def _check(rows):
+    assert [(r["tipo_target"], r["target_id"]) for r in rows] == ITEMS
+    assert all(r["type"] == "probe_result" for r in rows)
+    by_id = {r["target_id"]: r for r in rows}
+    assert by_id["gone/x"]["hf"]["error"] == "HTTP 404" and "oracle" not in by_id["gone/x"]
+    assert by_id["bad/d"]["oracle_error"] == "ValueError: broken card"
+    assert by_id["org/m10"]["oracle"]["target"] == "org/m10"
+
+
+def test_pool_pipeline_keeps_order_one_row_per_target():
+    writer = ListWriter()
+    with ProcessPoolExecutor(max_workers=3, initializer=_init_stub_worker) as pool:
+        n = probe.run_pipeline(StubClient(), ITEMS, writer, pool=pool, window=2)
+    assert n == len(ITEMS)
+    _check(writer.rows)
+    print("[OK] pool pipeline")
+
+
+def test_inline_pipeline():
+    writer = ListWriter()
+    probe.run_pipeline(StubClient(), ITEMS, writer, oracle=StubOracle())
+    _check(writer.rows)
+    print("[OK] inline pipeline")
+
+
+def test_resume_after_torn_line():
+    with tempfile.TemporaryDirectory() as d:
+        out = Path(d) / "run.jsonl"
+        first = ListWriter()
+        probe.run_pipeline(StubClient(), ITEMS[:5], first, oracle=StubOracle())
+        with out.open("w", encoding="utf-8") as f:
+            f.write(json.dumps({"type": "run_meta"}) + "\n")
+            f.writelines(json.dumps(r) + "\n" for r in first.rows)
+            f.write(json.dumps(first.rows[0])[:25])          # crash mid-row
+
+        done = probe.load_done(out)
+        assert done == set(ITEMS[:5]) and out.read_bytes().endswith(b"\n")
+        rest = [it for it in ITEMS if it not in done]
+        with NDJSONLog(out) as log:
+            log.write({"type": "run_resume", "skipped": len(done)})
+            probe.run_pipeline(StubClient(), rest, log, oracle=StubOracle())
+
+        rows = [json.loads(l) for l in out.read_text().splitlines()]
+        results = [(r["tipo_target"], r["target_id"]) for r in rows if r["type"] == "probe_result"]
+        assert results == ITEMS
+    print("[OK] resume")
+
+
+def test_resume_missing_file_starts_fresh():
+    with tempfile.TemporaryDirectory() as d:
+        out = Path(d) / "runs" / "run.jsonl"
+        done = probe.load_done(out)
+        assert done == set() and not out.exists()
+        with NDJSONLog(out) as log:
+            probe.run_pipeline(StubClient(), [it for it in ITEMS if it not in done], log, oracle=StubOracle())
+        assert probe.load_done(out) == set(ITEMS)
+    print("[OK] resume without an output file")
+
+
+def test_shards_partition_targets():
+    ids = [f"org/model-{i}" for i in range(500)]
+    for n in (1, 3, 7):
+        shards = [{t for t in ids if probe.in_shard(t, (i, n))} for i in range(n)]
+        assert sum(len(s) for s in shards) == len(ids) and set().union(*shards) == set(ids)
+        assert all(s for s in shards)
+    assert all(probe.in_shard(t, None) for t in ids)
+    assert probe.parse_shard("2/4") == (2, 4)
+    for bad in ("4/4", "x/2", "1"):
+        try:
+            probe.parse_shard(bad)
+        except probe.argparse.ArgumentTypeError:
+            continue
+        raise AssertionError(bad)
+    print("[OK] shards")
+
+
+if __name__ == "__main__":
+    test_pool_pipeline_keeps_order_one_row_per_target()
+    test_inline_pipeline()
+    test_resume_after_torn_line()
+    test_resume_missing_file_starts_fresh()
+    test_shards_partition_targets()
+    print("\n[OK] All tests passed")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Minimal test for the mmap'ed global ranking index."""
+import json, os, tempfile
+from multiprocessing import Pool
+from pathlib import Path
+
+from ranking_index import RankingIndex, build_index
+
+
+def _build(paths):
+    return build_index(*paths)
+
+
+def test_lookup_iterate_and_rebuild_on_change():
+    with tempfile.TemporaryDirectory() as d:
+        ranking, index_path = Path(d) / "global_ranking.json", Path(d) / "ranking.idx"
+        models = [{"model_id": f"org/m{i}", "score": 50 + i / 10, "severity": "LOW",
+                   "top_gaps": ["NEC#1", "NEC#9"][: i % 3], "rank": i + 1} for i in range(500)]
+        ranking.write_text(json.dumps({"model_ranking": models}))
+
+        with RankingIndex.for_ranking(ranking, index_path) as idx:
+            assert len(idx) == 500 and "org/m499" in idx and "org/nope" not in idx
+            rec = idx.lookup("org/m7")
+            assert rec == {"model_id": "org/m7", "rank": 8, "score": 50.7, "severity": "LOW", "violations": ["NEC#1"]}
+            assert [r["model_id"] for r in idx] == [m["model_id"] for m in models]
+
+        models[7]["score"] = 99.0
+        ranking.write_text(json.dumps({"model_ranking": models}))
+        st = ranking.stat()
+        os.utime(ranking, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        with RankingIndex.for_ranking(ranking, index_path) as idx:   # stale -> rebuilt
+            assert idx.lookup("org/m7")["score"] == 99.0
+    print("[OK] ranking index")
+
+
+def test_concurrent_builders():
+    with tempfile.TemporaryDirectory() as d:
+        ranking, index_path = Path(d) / "global_ranking.json", Path(d) / "ranking.idx"
+        models = [{"model_id": f"org/m{i}", "score": i, "rank": i + 1} for i in range(3000)]
+        ranking.write_text(json.dumps({"model_ranking": models}))
+        with Pool(4) as pool:
+            assert pool.map(_build, [(ranking, index_path)] * 8) == [3000] * 8
+        assert sorted(p.name for p in Path(d).iterdir()) == ["global_ranking.json", "ranking.idx"]
+        with RankingIndex.for_ranking(ranking, index_path) as idx:
+            assert len(idx) == 3000 and idx.lookup("org/m2999")["rank"] == 3000
+    print("[OK] concurrent builders")
+
+
+if __name__ == "__main__":
+    test_lookup_iterate_and_rebuild_on_change()
+    test_concurrent_builders()
+    print("\n[OK] All tests passed")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Minimal test for statement timeline queries."""
+import json, tempfile
+from pathlib import Path
+
+import statement_timeline as st
+
+
+def _row(tid, ts, license, tipo="model"):
+    return {"schema": "crovia.open.statement_timeline_event.v2", "target_id": tid, "tipo_target": tipo,
+            "observed_at": ts, "ddf_hash": f"{tid}{ts}", "hashes": {"card_hash": "c", "readme_hash": None},
+            "statements": {"license": license, "declared_datasets": None,
+                           "training_section_presence": "ABSENT", "readme_access": "OK"},
+            "coverage": {"hf_api_status": 200, "hf_readme_status": 200}}
+
+
+def _write(path: Path, rows):
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows))
+
+
+def test_point_range_and_brute_force_agree():
+    rows = []
+    for day in range(1, 29):
+        for k in range(12):
+            if (day * 7 + k) % 5 == 0:
+                lic = "mit" if (day // 3 + k) % 2 else "apache-2.0"
+                rows.append(_row(f"org/t{k}", f"2026-04-{day:02d}T{k:02d}:00:00Z", lic, "model" if k % 2 else "dataset"))
+    with tempfile.TemporaryDirectory() as d:
+        tl_path = Path(d) / "timeline.jsonl"
+        _write(tl_path, rows)
+        tl = st.open_timeline(Path(d) / "cache.json", tl_path, baseline=None)
+
+        def brute(tid, when):
+            hits = [r for r in rows if r["target_id"] == tid and r["observed_at"] <= when]
+            return hits[-1] if hits else None
+
+        for when in ("2026-04-01T00:00:00Z", "2026-04-10T05:30:00Z", "2026-04-28T23:00:00Z"):
+            for k in range(12):
+                got, want = tl.state_at(f"org/t{k}", when), brute(f"org/t{k}", when)
+                assert (got and got["observed_at"]) == (want and want["observed_at"])
+            valid = {e["target_id"]: e["observed_at"] for e in tl.valid_at(when)}
+            assert valid == {f"org/t{k}": brute(f"org/t{k}", when)["observed_at"]
+                             for k in range(12) if brute(f"org/t{k}", when)}
+        assert all(e["tipo_target"] == "model" for e in tl.valid_at("2026-04-15T00:00:00Z", "model"))
+
+        changes = tl.changed("license", "2026-04-05", "2026-04-20")
+        want = []
+        for k in range(12):
+            seq = [r for r in rows if r["target_id"] == f"org/t{k}"]
+            want += [(b["target_id"], b["observed_at"]) for a, b in zip(seq, seq[1:])
+                     if a["statements"]["license"] != b["statements"]["license"]
+                     and "2026-04-05" <= b["observed_at"] < "2026-04-20"]
+        assert sorted((c["target_id"], c["observed_at"]) for c in changes) == sorted(want) and want
+        assert all(c["before"] != c["after"] for c in changes)
+    print("[OK] point + range queries")
+
+
+def test_incremental_refresh_and_rolled_out_rows():
+    with tempfile.TemporaryDirectory() as d:
+        tl_path, cache = Path(d) / "timeline.jsonl", Path(d) / "cache.json"
+        _write(tl_path, [_row("a", "2026-04-01T00:00:00Z", "mit"), _row("b", "2026-04-02T00:00:00Z", "mit")])
+        st.open_timeline(cache, tl_path, baseline=None)
+
+        # the window rolls forward: the oldest row drops out, new rows arrive
+        _write(tl_path, [_row("b", "2026-04-02T00:00:00Z", "mit"), _row("a", "2026-04-03T00:00:00Z", "apache-2.0"),
+                         _row("c", "2026-04-03T00:00:00Z", None)])
+        tl = st.open_timeline(cache, tl_path, baseline=None)
+        assert len(tl.events) == 4
+        assert tl.state_at("a", "2026-04-02T12:00:00Z")["statements"]["license"] == "mit"
+        assert tl.state_at("a", "2026-04-02T12:00:00Z")["valid_until"] == "2026-04-03T00:00:00Z"
+        assert [c["after"] for c in tl.changed("license", "2026-04-01", "2026-04-30")] == ["apache-2.0"]
+        assert tl.state_at("c", "2026-04-01T00:00:00Z") is None
+        assert st.StatementTimeline.load(cache).refresh(tl_path) == 0
+    print("[OK] incremental refresh")
+
+
+if __name__ == "__main__":
+    test_point_range_and_brute_force_agree()
+    test_incremental_refresh_and_rolled_out_rows()
+    print("\n[OK] All tests passed")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Minimal test for watchlist_store dedup under concurrent writers."""
+import json, tempfile
+from multiprocessing import Pool
+from pathlib import Path
+
+from watchlist_store import WatchlistStore, key_for
+
+
+def _harvest(args):
+    d, worker = args
+    rows = [{"source": "test", "project_hint": f"hf:model:org/m{i}"} for i in range(worker, worker + 50)]
+    with WatchlistStore(Path(d) / "db.sqlite", Path(d) / "watchlist.jsonl", Path(d) / "presence.jsonl") as s:
+        return len(s.add_targets(rows[:25])) + len(s.add_targets(rows[25:]))
+
+
+def test_concurrent_harvesters_do_not_duplicate():
+    with tempfile.TemporaryDirectory() as d:
+        wl = Path(d) / "watchlist.jsonl"
+        wl.write_text(json.dumps({"source": "seed", "project_hint": "hf:model:org/m0"}) + "\n")
+
+        with Pool(4) as pool:
+            added = pool.map(_harvest, [(d, w * 10) for w in range(4)])
+
+        hints = [json.loads(l)["project_hint"] for l in wl.read_text().splitlines()]
+        assert len(hints) == len(set(hints)) == 80, len(hints)
+        assert sum(added) == 79
+
+        # rows appended by another tool are picked up on the next open
+        with wl.open("a") as f:
+            f.write(json.dumps({"source": "manual", "project_hint": "gh:org/repo"}) + "\n")
+        with WatchlistStore(Path(d) / "db.sqlite", wl, Path(d) / "presence.jsonl") as s:
+            assert s.has_hint("gh:org/repo")
+            pending = list(s.targets_without_presence())
+            assert len(pending) == 81
+            s.add_presence([{"project_key": key_for(pending[0]["project_hint"])}])
+            assert len(list(s.targets_without_presence())) == 80
+    print("[OK] concurrent harvesters dedup")
+
+
+def test_presence_probe_log_roundtrips():
+    probes = [{"ts": f"2025-12-{d:02d}T00:00:00+00:00", "project_key": k, "verdict": v}
+              for d, k, v in [(19, "aaaa", "RED"), (19, "bbbb", "GREEN"), (20, "aaaa", "RED"),
+                              (21, "aaaa", "GREEN"), (21, "cccc", "RED")]]
+    with tempfile.TemporaryDirectory() as d:
+        d = Path(d)
+        pres = d / "presence.jsonl"
+        original = "".join(json.dumps(p) + "\n" for p in probes)
+        pres.write_text(original)
+
+        with WatchlistStore(d / "db.sqlite", d / "watchlist.jsonl", pres) as s:
+            assert s.counts() == {"targets": 0, "presence_rows": 5, "presence_keys": 3}
+            assert s.has_key("aaaa") and not s.has_key("dddd")
+            s.export()
+            assert pres.read_text() == original
+            assert s.counts()["presence_rows"] == 5
+
+            assert s.add_presence([{"project_key": "aaaa"}, {"project_key": "dddd"}]) == [{"project_key": "dddd"}]
+
+        with WatchlistStore(d / "db.sqlite", d / "watchlist.jsonl", pres) as s:
+            assert s.counts() == {"targets": 0, "presence_rows": 6, "presence_keys": 4}
+            s.rebuild()
+            s.export()
+        assert pres.read_text() == original + json.dumps({"project_key": "dddd"}) + "\n"
+    print("[OK] presence probe log round-trip")
+
+
+if __name__ == "__main__":
+    test_concurrent_harvesters_do_not_duplicate()
+    test_presence_probe_log_roundtrips()
+    print("\n[OK] All tests passed")
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+watchlist_store.py — indexed store for the canon watchlist + presence signals.
+
+The JSONL files stay the published artefacts:
+  open/canon/targets_watchlist.jsonl   (one row per project_hint)
+  open/signal/presence_latest.jsonl    (probe log: one row per probe, a
+                                        project_key may appear many times)
+
+This module keeps a SQLite index (WAL mode) next to them so producers can
+dedup with indexed lookups instead of re-reading both files on every run:
+- targets:        project_hint PRIMARY KEY, project_key indexed
+- presence_rows:  every presence probe, in file order (rowid)
+- presence_keys:  distinct project_keys with at least one probe
+
+Bridge:
+- On open, rows appended to the JSONL files by other tools are imported from
+  the last known byte offset (a rewritten file is re-imported in full).
+- add_targets() / add_presence() run inside BEGIN IMMEDIATE: the write lock
+  serializes concurrent producers, so JSONL appends never interleave and the
+  same hint is never written twice; add_presence() only appends probes for
+  keys that have none yet.
+- export rewrites presence_latest.jsonl from presence_rows, so every probe
+  (and its per-timestamp history) survives the round trip.
+
+CLI:
+  python open/forensic/watchlist_store.py import   # (re)build index from JSONL
+  python open/forensic/watchlist_store.py export   # rewrite JSONL from index
+  python open/forensic/watchlist_store.py stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from ndjson_log import NDJSONLog
+
+WATCHLIST = Path("open/canon/targets_watchlist.jsonl")
+PRESENCE = Path("open/signal/presence_latest.jsonl")
+DB = Path(".cache/watchlist.sqlite")
+
+# bytes hashed to recognise "same file, appended" vs "file rewritten"
+HEAD_BYTES = 4096
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS targets (
+    project_hint TEXT PRIMARY KEY,
+    project_key  TEXT NOT NULL,
+    row          TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS targets_project_key ON targets(project_key);
+CREATE TABLE IF NOT EXISTS presence_rows (
+    project_key TEXT NOT NULL,
+    row         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS presence_rows_project_key ON presence_rows(project_key);
+CREATE TABLE IF NOT EXISTS presence_keys (
+    project_key TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS files (
+    name   TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    head   TEXT NOT NULL
+);
+"""
+
+
+def key_for(hint: str) -> str:
+    return hashlib.sha256(hint.encode("utf-8")).hexdigest()[:16]
+
+
+def _head(path: Path, n: int) -> str:
+    with path.open("rb") as f:
+        return hashlib.sha256(f.read(n)).hexdigest()
+
+
+class WatchlistStore:
+    def __init__(
+        self,
+        db: Path = DB,
+        watchlist: Path = WATCHLIST,
+        presence: Path = PRESENCE,
+    ):
+        self.watchlist = Path(watchlist)
+        self.presence = Path(presence)
+        Path(db).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db), timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        with self._write():
+            self._sync_all()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------
+    # transactions
+    # ---------
+
+    @contextmanager
+    def _write(self):
+        """Write transaction; BEGIN IMMEDIATE takes the database write lock up front."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # ---------
+    # JSONL bridge
+    # ---------
+
+    def _sync_all(self) -> None:
+        self._sync_file(self.watchlist, self._import_target)
+        self._sync_file(self.presence, self._import_presence, self._clear_presence)
+
+    def _sync_file(self, path: Path, importer, reset=None) -> None:
+        """Import rows appended to path since the last sync (caller holds the lock).
+
+        reset() runs before a full re-import, for tables that keep every row."""
+        if not path.exists():
+            return
+        name = str(path)
+        size = path.stat().st_size
+        rec = self.conn.execute("SELECT offset, head FROM files WHERE name = ?", (name,)).fetchone()
+        offset = 0
+        if rec and size >= rec[0] and _head(path, min(HEAD_BYTES, rec[0])) == rec[1]:
+            offset = rec[0]
+            if offset == size:
+                return
+        if offset == 0 and reset is not None:
+            reset()
+
+        with path.open("rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # partial line being written; pick it up next time
+                offset += len(raw)
+                try:
+                    importer(json.loads(raw))
+                except (ValueError, KeyError, TypeError):
+                    pass
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files(name, offset, head) VALUES (?, ?, ?)",
+            (name, offset, _head(path, min(HEAD_BYTES, offset))),
+        )
+
+    def _import_target(self, row: Dict[str, Any]) -> bool:
+        hint = row["project_hint"]
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO targets(project_hint, project_key, row) VALUES (?, ?, ?)",
+            (hint, key_for(hint), json.dumps(row, ensure_ascii=False)),
+        )
+        return cur.rowcount == 1
+
+    def _import_presence(self, row: Dict[str, Any]) -> bool:
+        """Record one probe; True if it is the key's first."""
+        key = row["project_key"]
+        self.conn.execute(
+            "INSERT INTO presence_rows(project_key, row) VALUES (?, ?)",
+            (key, json.dumps(row, ensure_ascii=False)),
+        )
+        cur = self.conn.execute("INSERT OR IGNORE INTO presence_keys(project_key) VALUES (?)", (key,))
+        return cur.rowcount == 1
+
+    def _clear_presence(self) -> None:
+        self.conn.execute("DELETE FROM presence_rows")
+        self.conn.execute("DELETE FROM presence_keys")
+
+    def _append(self, path: Path, rows: List[Dict[str, Any]], ensure_ascii: bool = False) -> None:
+        if not rows:
+            return
+        # no rotation: the index tracks these files by byte offset; unbuffered so
+        # every row is its own write, as other readers may tail the file
+        with NDJSONLog(path, ensure_ascii=ensure_ascii, buffer_bytes=0) as log:
+            for r in rows:
+                log.write(r)
+
+    # ---------
+    # public API
+    # ---------
+
+    def has_hint(self, hint: str) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM targets WHERE project_hint = ?", (hint,)
+        ).fetchone() is not None
+
+    def has_key(self, project_key: str) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM presence_keys WHERE project_key = ?", (project_key,)
+        ).fetchone() is not None
+
+    def add_targets(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert watchlist rows not yet known; append them to the JSONL. Returns added rows."""
+        with self._write():
+            self._sync_file(self.watchlist, self._import_target)
+            added = [r for r in rows if self._import_target(r)]
+            self._append(self.watchlist, added)
+            self._sync_file(self.watchlist, lambda r: None)
+        return added
+
+    def add_presence(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Append presence rows for project_keys with no probe yet (first per key wins)."""
+        with self._write():
+            self._sync_file(self.presence, self._import_presence, self._clear_presence)
+            added = [r for r in rows if not self.has_key(r["project_key"]) and self._import_presence(r)]
+            self._append(self.presence, added, ensure_ascii=True)
+            self._sync_file(self.presence, lambda r: None)
+        return added
+
+    def iter_targets(self) -> Iterator[Dict[str, Any]]:
+        for (row,) in self.conn.execute("SELECT row FROM targets ORDER BY rowid"):
+            yield json.loads(row)
+
+    def targets_without_presence(self) -> Iterator[Dict[str, Any]]:
+        """Watchlist rows whose project_key has no presence signal yet."""
+        q = (
+            "SELECT t.row FROM targets t LEFT JOIN presence_keys p ON p.project_key = t.project_key "
+            "WHERE p.project_key IS NULL ORDER BY t.rowid"
+        )
+        for (row,) in self.conn.execute(q):
+            yield json.loads(row)
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "targets": self.conn.execute("SELECT COUNT(*) FROM targets").fetchone()[0],
+            "presence_rows": self.conn.execute("SELECT COUNT(*) FROM presence_rows").fetchone()[0],
+            "presence_keys": self.conn.execute("SELECT COUNT(*) FROM presence_keys").fetchone()[0],
+        }
+
+    def rebuild(self) -> None:
+        """Drop the index and re-import both JSONL files."""
+        with self._write():
+            self.conn.execute("DELETE FROM targets")
+            self._clear_presence()
+            self.conn.execute("DELETE FROM files")
+            self._sync_all()
+
+    def export(self, watchlist: Optional[Path] = None, presence: Optional[Path] = None) -> None:
+        """Rewrite the JSONL files from the index (atomic replace)."""
+        with self._write():
+            for table, path, ascii_ in (
+                ("targets", Path(watchlist or self.watchlist), False),
+                ("presence_rows", Path(presence or self.presence), True),
+            ):
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(path.name + ".tmp")
+                with tmp.open("w", encoding="utf-8") as f:
+                    for (row,) in self.conn.execute(f"SELECT row FROM {table} ORDER BY rowid"):
+                        f.write(json.dumps(json.loads(row), ensure_ascii=ascii_) + "\n")
+                os.replace(tmp, path)
+            self.conn.execute("DELETE FROM files")
+            self._sync_all()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="CROVIA watchlist / presence index")
+    ap.add_argument("command", choices=["import", "export", "stats"])
+    ap.add_argument("--db", default=str(DB))
+    ap.add_argument("--watchlist", default=str(WATCHLIST))
+    ap.add_argument("--presence", default=str(PRESENCE))
+    args = ap.parse_args()
+
+    with WatchlistStore(Path(args.db), Path(args.watchlist), Path(args.presence)) as store:
+        if args.command == "import":
+            store.rebuild()
+        elif args.command == "export":
+            store.export()
+        print(f"[CROVIA] watchlist store: {json.dumps(store.counts())}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
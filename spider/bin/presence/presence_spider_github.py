@@ -1,24 +1,46 @@
+import argparse
 import json
 import os
+import threading
 import time
 import hashlib
-import requests
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
 
 # ---------------------------------------------------------------------
 # CROVIA · Presence Spider (GitHub)
 # Passive presence / absence observer
+#
+# Targets: `gh:<owner>/<repo>` project_hints from watchlist JSONL files
+# (canon watchlist + spider/targets/github_seed.jsonl by default).
+# Repos are scanned concurrently over one pooled session; pacing follows
+# GitHub's X-RateLimit-Remaining / X-RateLimit-Reset headers instead of a
+# fixed sleep. --api-base points the spider at a local stand-in for tests.
+#
+# Per repo, the (non-recursive) HEAD tree is fetched first, conditionally on
+# its last ETag. If its SHA matches the cached one, the previous verdict is
+# reused and the recursive tree is not downloaded at all.
+#
+# raw/data logs go through open/forensic/ndjson_log.py: buffered appends,
+# rotated by size / UTC day into indexed gzip segments.
 # ---------------------------------------------------------------------
 
-REPOS = [
-    "croviatrust/crovia-wedge",
-    "croviatrust/crovia-core-engine",
-    "huggingface/transformers",
-    "openai/evals",
-    "mlflow/mlflow",
-    "pytorch/pytorch",
-    "tensorflow/tensorflow",
+SPIDER_ROOT = Path(__file__).resolve().parents[2]
+REPO_ROOT = SPIDER_ROOT.parent
+
+sys.path.insert(0, str(REPO_ROOT / "open" / "forensic"))
+from ndjson_log import NDJSONLog  # noqa: E402
+
+WATCHLISTS = [
+    REPO_ROOT / "open" / "canon" / "targets_watchlist.jsonl",
+    SPIDER_ROOT / "targets" / "github_seed.jsonl",
 ]
+HINT_PREFIX = "gh:"
 
 ARTEFACTS = [
     "EVIDENCE.pointer.json",
@@ -27,10 +49,13 @@ ARTEFACTS = [
     "cep_capsule.v1.json",
     "gaps/gap_index.jsonl",
 ]
+ARTEFACT_SET = frozenset(ARTEFACTS)
 
-OUT_RAW = "raw/presence/github_presence_raw.jsonl"
-OUT_DATA = "data/presence/github_presence_v1.jsonl"
+OUT_RAW = SPIDER_ROOT / "raw/presence/github_presence_raw.jsonl"
+OUT_DATA = SPIDER_ROOT / "data/presence/github_presence_v1.jsonl"
+TREE_CACHE = REPO_ROOT / ".cache" / "presence_github_trees.json"
 
+GITHUB_API = "https://api.github.com"
 HEADERS = {
     "User-Agent": "CroviaPresenceSpider/1.0 (passive; open-data)"
 }
@@ -44,55 +69,236 @@ def project_key(repo: str) -> str:
     # Internal stable key (OPEN plane will be salted later)
     return hashlib.sha256(repo.encode()).hexdigest()[:16]
 
-def fetch_tree(repo: str):
-    url = f"https://api.github.com/repos/{repo}/git/trees/HEAD?recursive=1"
-    r = requests.get(url, headers=HEADERS, timeout=20)
-    if r.status_code != 200:
-        return None, r.status_code
-    return r.json(), 200
+def load_repos(paths):
+    """Ordered, de-duplicated repos from `gh:` hints in watchlist files."""
+    repos, seen = [], set()
+    for path in paths:
+        path = Path(path)
+        if not path.exists():
+            continue
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    hint = json.loads(line).get("project_hint") or ""
+                except ValueError:
+                    continue
+                repo = hint[len(HINT_PREFIX):] if hint.startswith(HINT_PREFIX) else None
+                if repo and repo not in seen:
+                    seen.add(repo)
+                    repos.append(repo)
+    return repos
 
 # ---------------------------------------------------------------------
 
-os.makedirs("raw/presence", exist_ok=True)
-os.makedirs("data/presence", exist_ok=True)
-
-with open(OUT_RAW, "a", encoding="utf-8") as raw_f, open(OUT_DATA, "a", encoding="utf-8") as data_f:
-    for repo in REPOS:
-        print(f"[PRESENCE] scanning {repo}")
-        tree, status = fetch_tree(repo)
-
-        artefacts_found = []
-        verdict = "RED"
-
-        if tree and "tree" in tree:
-            paths = [x.get("path", "") for x in tree["tree"]]
-            for a in ARTEFACTS:
-                if a in paths:
-                    artefacts_found.append(a)
-
-            if artefacts_found:
-                verdict = "GREEN"
-
-        raw_entry = {
-            "schema": "crovia.presence.raw.v1",
-            "ts": now(),
-            "repo": repo,
-            "http_status": status,
-            "artefacts_found": artefacts_found,
-            "verdict": verdict,
-        }
-
-        data_entry = {
-            "schema": "crovia.presence.v1",
-            "ts": raw_entry["ts"],
-            "project_key": project_key(repo),
-            "verdict": verdict,
-            "artefacts": artefacts_found,
-        }
-
-        raw_f.write(json.dumps(raw_entry) + "\n")
-        data_f.write(json.dumps(data_entry) + "\n")
-
-        time.sleep(2)
-
-print("[PRESENCE] scan complete")
+class RateBudget:
+    """Shared view of the GitHub core rate limit.
+
+    Each request takes one unit; when the last known budget is spent the
+    caller waits until X-RateLimit-Reset instead of sleeping blindly.
+    """
+
+    def __init__(self, reserve: int = 0):
+        self.reserve = reserve
+        self.remaining = None
+        self.reset_at = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                if self.remaining is None or self.remaining > self.reserve or time.time() >= self.reset_at:
+                    if self.remaining is not None:
+                        self.remaining -= 1
+                    return
+                wait = self.reset_at - time.time()
+            time.sleep(max(0.0, min(wait, 60.0)) + 0.5)
+
+    def update(self, headers):
+        rem = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if rem is None or reset is None:
+            return
+        with self._lock:
+            self.remaining = int(rem)
+            self.reset_at = float(reset)
+
+    def exhaust(self, headers):
+        """Response said we are limited: block everyone until reset / Retry-After."""
+        with self._lock:
+            self.remaining = 0
+            ra = headers.get("Retry-After")
+            if ra and ra.isdigit():
+                self.reset_at = time.time() + int(ra)
+            elif headers.get("X-RateLimit-Reset"):
+                self.reset_at = float(headers["X-RateLimit-Reset"])
+            else:
+                self.reset_at = time.time() + 60
+
+
+class GitHubClient:
+    def __init__(self, api_base=GITHUB_API, token=None, pool_size=16, max_retries=3):
+        self.api_base = api_base.rstrip("/")
+        self.max_retries = max_retries
+        self.budget = RateBudget()
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, path, headers=None):
+        for attempt in range(self.max_retries + 1):
+            self.budget.acquire()
+            r = self.session.get(f"{self.api_base}{path}", headers=headers, timeout=20)
+            self.budget.update(r.headers)
+            limited = r.status_code == 429 or (
+                r.status_code == 403 and r.headers.get("X-RateLimit-Remaining") == "0"
+            )
+            if limited and attempt < self.max_retries:
+                self.budget.exhaust(r.headers)
+                continue
+            if r.status_code >= 500 and attempt < self.max_retries:
+                time.sleep(2 ** attempt)
+                continue
+            return r
+        return r
+
+    def fetch_head_tree(self, repo: str, etag=None):
+        """Top-level HEAD tree. Returns (tree_sha or None, status, etag)."""
+        r = self.get(f"/repos/{repo}/git/trees/HEAD", headers={"If-None-Match": etag} if etag else None)
+        if r.status_code != 200:
+            return None, r.status_code, etag
+        return r.json().get("sha"), 200, r.headers.get("ETag")
+
+    def fetch_tree(self, repo: str, sha: str = "HEAD"):
+        r = self.get(f"/repos/{repo}/git/trees/{sha}?recursive=1")
+        if r.status_code != 200:
+            return None, r.status_code
+        return r.json(), 200
+
+# ---------------------------------------------------------------------
+
+def match_artefacts(tree: dict):
+    """Declared artefacts present in a recursive tree, in ARTEFACTS order."""
+    present = {p for x in tree.get("tree", ()) if (p := x.get("path")) in ARTEFACT_SET}
+    return [a for a in ARTEFACTS if a in present]
+
+
+def scan_repo(client: GitHubClient, repo: str, prev=None):
+    """Returns (raw_entry, data_entry, cache_entry_or_None)."""
+    prev = prev or {}
+    cache_entry = None
+    reused = False
+    tree_sha = None
+    truncated = False
+    artefacts_found = []
+
+    try:
+        tree_sha, status, etag = client.fetch_head_tree(repo, prev.get("etag"))
+        if status == 304:
+            tree_sha = prev.get("tree_sha")
+        if tree_sha and tree_sha == prev.get("tree_sha"):
+            artefacts_found = list(prev.get("artefacts", []))
+            reused = True
+            cache_entry = {**prev, "etag": etag}
+        elif tree_sha:
+            tree, status = client.fetch_tree(repo, tree_sha)
+            if tree and "tree" in tree:
+                artefacts_found = match_artefacts(tree)
+                truncated = bool(tree.get("truncated"))
+                cache_entry = {"tree_sha": tree_sha, "etag": etag, "artefacts": artefacts_found}
+    except requests.RequestException as e:
+        status = f"{type(e).__name__}"
+
+    verdict = "GREEN" if artefacts_found else "RED"
+
+    raw_entry = {
+        "schema": "crovia.presence.raw.v1",
+        "ts": now(),
+        "repo": repo,
+        "http_status": status,
+        "artefacts_found": artefacts_found,
+        "verdict": verdict,
+    }
+    if tree_sha:
+        raw_entry["tree_sha"] = tree_sha
+    if reused:
+        raw_entry["reused_from_prev"] = True
+    if truncated:
+        raw_entry["tree_truncated"] = True
+
+    data_entry = {
+        "schema": "crovia.presence.v1",
+        "ts": raw_entry["ts"],
+        "project_key": project_key(repo),
+        "verdict": verdict,
+        "artefacts": artefacts_found,
+    }
+    return raw_entry, data_entry, cache_entry
+
+
+def load_tree_cache(path: Path):
+    if path.exists():
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_tree_cache(path: Path, cache):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="CROVIA presence spider (GitHub)")
+    ap.add_argument("--watchlist", action="append", default=None,
+                    help="Watchlist JSONL with gh:<owner>/<repo> hints (repeatable)")
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--api-base", default=GITHUB_API)
+    ap.add_argument("--out-raw", default=str(OUT_RAW))
+    ap.add_argument("--out-data", default=str(OUT_DATA))
+    ap.add_argument("--tree-cache", default=str(TREE_CACHE))
+    ap.add_argument("--full", action="store_true", help="Ignore the tree cache and fetch every tree")
+    ap.add_argument("--rotate-mb", type=float, default=64, help="Rotate logs above this size (0 = off)")
+    ap.add_argument("--no-daily-rotate", action="store_true", help="Do not start a new segment per UTC day")
+    ap.add_argument("--fsync-every", type=int, default=0, help="Records between fsyncs (0 = on close)")
+    args = ap.parse_args()
+
+    cache_path = Path(args.tree_cache)
+    tree_cache = {} if args.full else load_tree_cache(cache_path)
+
+    repos = load_repos(args.watchlist or WATCHLISTS)
+    client = GitHubClient(args.api_base, token=os.environ.get("GITHUB_TOKEN"), pool_size=args.workers)
+
+    log_opts = dict(
+        max_bytes=int(args.rotate_mb * (1 << 20)),
+        rotate_daily=not args.no_daily_rotate,
+        fsync_every=args.fsync_every,
+        ensure_ascii=True,
+    )
+
+    with NDJSONLog(Path(args.out_raw), **log_opts) as raw_log, NDJSONLog(Path(args.out_data), **log_opts) as data_log, \
+            ThreadPoolExecutor(max_workers=max(1, args.workers)) as ex:
+        # map() yields in repo order, so the logs stay deterministic
+        results = ex.map(lambda r: scan_repo(client, r, tree_cache.get(r)), repos)
+        reused = 0
+        for repo, (raw_entry, data_entry, cache_entry) in zip(repos, results):
+            tag = " (unchanged)" if raw_entry.get("reused_from_prev") else ""
+            print(f"[PRESENCE] {repo}: {raw_entry['verdict']} ({raw_entry['http_status']}){tag}")
+            raw_log.write(raw_entry)
+            data_log.write(data_entry)
+            reused += bool(raw_entry.get("reused_from_prev"))
+            if cache_entry:
+                tree_cache[repo] = cache_entry
+
+    save_tree_cache(cache_path, tree_cache)
+    print(f"[PRESENCE] scan complete ({len(repos)} repos, {reused} unchanged)")
+
+
+if __name__ == "__main__":
+    main()
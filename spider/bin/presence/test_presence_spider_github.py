@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Minimal test for the GitHub presence spider against a local API stand-in."""
+import json, subprocess, sys, tempfile, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SCRIPT = Path(__file__).parent / "presence_spider_github.py"
+LIMIT = 6  # requests per 1s window before the stand-in answers 403
+
+
+class StandIn(BaseHTTPRequestHandler):
+    lock = threading.Lock()
+    window = [0.0, 0]  # [reset_at, used]
+    versions = {}      # repo -> bump to change its HEAD tree
+    recursive = []     # repos whose recursive tree was downloaded
+
+    def do_GET(self):
+        with StandIn.lock:
+            t = time.time()
+            if t >= StandIn.window[0]:
+                StandIn.window = [t + 1.0, 0]
+            StandIn.window[1] += 1
+            remaining = LIMIT - StandIn.window[1]
+            reset = StandIn.window[0]
+        headers = {"X-RateLimit-Remaining": str(max(0, remaining)), "X-RateLimit-Reset": f"{reset:.3f}"}
+
+        repo = self.path.split("/repos/", 1)[1].split("/git/", 1)[0]
+        sha = f"{repo}@{StandIn.versions.get(repo, 0)}"
+        if remaining < 0:
+            status, body = 403, {"message": "API rate limit exceeded"}
+        elif repo.endswith("missing"):
+            status, body = 404, {"message": "Not Found"}
+        elif not self.path.endswith("?recursive=1"):
+            headers["ETag"] = f'"{sha}"'
+            if self.headers.get("If-None-Match") == headers["ETag"]:
+                status, body = 304, None
+            else:
+                status, body = 200, {"sha": sha, "tree": [{"path": "README.md"}, {"path": "src"}]}
+        else:
+            StandIn.recursive.append(repo)
+            paths = ["README.md", "src/x.py"] + (["EVIDENCE.json", "gaps/gap_index.jsonl"] if "green" in repo else [])
+            status, body = 200, {"sha": sha, "tree": [{"path": p} for p in paths]}
+
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        if data:
+            self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_spider(d: Path, port: int, watchlist: Path):
+    r = subprocess.run([
+        sys.executable, str(SCRIPT), "--watchlist", str(watchlist), "--workers", "4", "--no-daily-rotate",
+        "--api-base", f"http://127.0.0.1:{port}",
+        "--out-raw", str(d / "raw.jsonl"), "--out-data", str(d / "data.jsonl"),
+        "--tree-cache", str(d / "trees.json"),
+    ], capture_output=True, text=True, timeout=60)
+    assert r.returncode == 0, r.stderr
+    return [json.loads(l) for l in (d / "raw.jsonl").read_text().splitlines()]
+
+
+def test_scan_from_watchlist_respects_rate_limit():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    repos = [f"org/red{i}" for i in range(8)] + ["org/green", "org/missing"]
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            d = Path(d)
+            wl = d / "watchlist.jsonl"
+            wl.write_text("".join(
+                json.dumps({"project_hint": h}) + "\n"
+                for h in ["hf:dataset:x/y"] + [f"gh:{r}" for r in repos] + ["gh:org/red0"]
+            ))
+            raw = run_spider(d, srv.server_address[1], wl)
+            assert [e["repo"] for e in raw] == repos
+            by_repo = {e["repo"]: e for e in raw}
+            assert by_repo["org/green"]["verdict"] == "GREEN"
+            assert by_repo["org/green"]["artefacts_found"] == ["EVIDENCE.json", "gaps/gap_index.jsonl"]
+            assert by_repo["org/missing"]["http_status"] == 404
+            assert all(by_repo[f"org/red{i}"]["http_status"] == 200 for i in range(8))
+
+            # second pass: only the repo whose HEAD tree moved is fetched recursively
+            StandIn.recursive.clear()
+            StandIn.versions["org/red3"] = 1
+            raw = run_spider(d, srv.server_address[1], wl)[len(repos):]
+            assert StandIn.recursive == ["org/red3"]
+            by_repo = {e["repo"]: e for e in raw}
+            assert by_repo["org/green"]["reused_from_prev"] and by_repo["org/green"]["verdict"] == "GREEN"
+            assert by_repo["org/green"]["artefacts_found"] == ["EVIDENCE.json", "gaps/gap_index.jsonl"]
+            assert by_repo["org/red3"]["tree_sha"] == "org/red3@1" and "reused_from_prev" not in by_repo["org/red3"]
+    finally:
+        srv.shutdown()
+    print("[OK] spider scan under rate limit, unchanged trees reused")
+
+
+if __name__ == "__main__":
+    test_scan_from_watchlist_respects_rate_limit()
+    print("\n[OK] All tests passed")